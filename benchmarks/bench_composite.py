@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+# color_composite.composite_grid against a per-pixel Python loop doing the
+# same source-over arithmetic: a translucent palette previewed on many
+# backgrounds at once.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_composite import MODES, composite_grid
+from color_pack import Palette
+
+def python_over(colors, backdrops):
+    out = []
+    for r, g, b, a in colors:
+        alpha = a / 255.0
+        out.append([tuple(round(s * alpha + d * (1.0 - alpha)) for s, d in ((r, br), (g, bg), (b, bb))) + (255,)
+                    for br, bg, bb in backdrops])
+    return out
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark batch alpha compositing.")
+    parser.add_argument("--colors", type=int, default=10000, help="palette size (default: 10000)")
+    parser.add_argument("--backdrops", type=int, default=64, help="background count (default: 64)")
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(0)
+    palette = Palette.from_rgb(rng.integers(0, 256, (args.colors, 4), dtype=np.uint8))
+    backdrops = rng.integers(0, 256, (args.backdrops, 3), dtype=np.uint8)
+    pixels = args.colors * args.backdrops
+    elapsed = timed(lambda: python_over(palette.rgba.tolist(), backdrops.tolist()))
+    print(f"{args.colors} colors x {args.backdrops} backdrops")
+    print(f"  python loop  over      {elapsed * 1e3:8.1f} ms  {pixels / elapsed / 1e6:6.2f} Mpx/s")
+    for mode in MODES:
+        elapsed = timed(lambda: composite_grid(palette, backdrops, mode))
+        print(f"  batch        {mode:9} {elapsed * 1e3:8.1f} ms  {pixels / elapsed / 1e6:6.2f} Mpx/s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+import argparse
+import os
+import resource
+import sys
+import time
+import numpy as np
+
+# Full N x N contrast matrix of a palette with color_contrast, per metric,
+# against a pairwise Python loop on a sample of the pairs.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_contrast import METRICS, contrast, failing_pairs
+from color_pack import Palette
+
+def peak_rss_mb():
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark WCAG/APCA contrast matrices.")
+    parser.add_argument("--colors", type=int, default=5000, help="palette size (default: 5000)")
+    parser.add_argument("--sample", type=int, default=2000, help="pairs timed with the scalar loop (default: 2000)")
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(0)
+    palette = Palette.from_rgb(rng.integers(0, 256, (args.colors, 3), dtype=np.uint8))
+    pairs = args.colors * (args.colors - 1)
+    rgb = palette.rgb.tolist()
+    print(f"{args.colors} colors, {pairs} pairs, peak RSS {peak_rss_mb():.0f} MB")
+    for metric in METRICS:
+        start = time.perf_counter()
+        for i in range(args.sample):
+            contrast(rgb[i % args.colors], rgb[(i * 7 + 1) % args.colors], metric)
+        scalar = (time.perf_counter() - start) / args.sample
+        start = time.perf_counter()
+        failing = sum(len(i) for i, _, _ in failing_pairs(palette, metric=metric))
+        elapsed = time.perf_counter() - start
+        print(f"  {metric}  matrix {elapsed:7.2f} s  {pairs / elapsed / 1e6:7.1f} Mpairs/s  "
+              f"(pairwise calls {1 / scalar / 1e6:6.3f} Mpairs/s)  failing {failing}  peak RSS {peak_rss_mb():.0f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
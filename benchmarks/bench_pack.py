@@ -0,0 +1,58 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+# Memory and speed of color_pack.Palette against a list of (r, g, b) tuples:
+# bytes per color, dedup, and sorting by a converted channel.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_core import ColorConverter
+from color_pack import Palette
+
+def measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, elapsed
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark packed palettes against tuple lists.")
+    parser.add_argument("--colors", type=int, default=1000000, help="palette size (default: 1000000)")
+    parser.add_argument("--distinct", type=int, default=50000, help="distinct colors in the palette (default: 50000)")
+    parser.add_argument("--space", default="lab", help="space to sort by (default: lab)")
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (args.distinct, 3), dtype=np.uint8)
+    rgb = base[rng.integers(0, args.distinct, args.colors)]
+    convert = getattr(ColorConverter, f"rgb_to_{args.space}")
+
+    tuples, tuple_bytes, tuple_build = measure(lambda: [tuple(c) for c in rgb.tolist()])
+    palette, packed_bytes, packed_build = measure(lambda: Palette.from_rgb(rgb))
+    print(f"{args.colors} colors, {args.distinct} distinct")
+    print(f"  memory   tuples {tuple_bytes / args.colors:6.1f} B/color   palette {packed_bytes / args.colors:6.1f} B/color")
+    print(f"  build    tuples {tuple_build * 1e3:8.1f} ms       palette {packed_build * 1e3:8.1f} ms")
+    print(f"  dedup    tuples {timed(lambda: list(dict.fromkeys(tuples))) * 1e3:8.1f} ms       "
+          f"palette {timed(lambda: palette.unique(keep_order=True)) * 1e3:8.1f} ms")
+    # The tuple baseline memoizes conversions per distinct color, which is
+    # the fair comparison for a palette with repeats.
+    def sort_tuples():
+        keys = {}
+        return sorted(tuples, key=lambda c: keys[c] if c in keys else keys.setdefault(c, convert(*c)[0]))
+    print(f"  sort by {args.space}[0]  tuples {timed(sort_tuples) * 1e3:8.1f} ms       "
+          f"palette {timed(lambda: palette.sort(args.space, 0)) * 1e3:8.1f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Palette extraction throughput on a synthetic 50 MP image, written to disk
+# as a PPM so the extractor streams it through a memory map.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_palette import METHODS, STRIPE_ROWS, extract_palette
+
+def write_test_image(path, width, height, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, (12, 3))
+    with open(path, "wb") as f:
+        f.write(f"P6\n{width} {height}\n255\n".encode("ascii"))
+        x = np.arange(width)
+        for start in range(0, height, STRIPE_ROWS):
+            rows = np.arange(start, min(start + STRIPE_ROWS, height))
+            region = ((x[None, :] * 4 // width) + (rows[:, None] * 3 // height) * 4) % len(base)
+            stripe = base[region] + rng.integers(-12, 13, (len(rows), width, 3))
+            f.write(np.clip(stripe, 0, 255).astype(np.uint8).tobytes())
+
+def peak_rss_mb():
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark palette extraction on a large image.")
+    parser.add_argument("--megapixels", type=float, default=50.0, help="image size (default: 50)")
+    parser.add_argument("--colors", type=int, default=8, help="palette size (default: 8)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel run worker count")
+    parser.add_argument("--max-samples", type=int, default=0, help="pixel budget (default: 0 = every pixel)")
+    args = parser.parse_args(argv)
+    width = int((args.megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(args.megapixels * 1e6 / width)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.ppm")
+        write_test_image(path, width, height)
+        pixels = width * height
+        print(f"image: {width}x{height} ({pixels / 1e6:.1f} MP), peak RSS after write {peak_rss_mb():.0f} MB")
+        for method in METHODS:
+            for workers in sorted({1, args.workers}):
+                start = time.perf_counter()
+                rgb, _ = extract_palette(path, args.colors, method, args.max_samples, workers)
+                elapsed = time.perf_counter() - start
+                print(f"{method:10} workers={workers:<2} {elapsed:7.2f} s  {pixels / elapsed / 1e6:7.1f} MP/s  "
+                      f"{len(rgb)} colors  peak RSS {peak_rss_mb():.0f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+# Throughput of color_parse.parse_colors against the scalar
+# ColorConverter.hex_to_rgb, on HEX-only input (the only format the scalar
+# function reads) and on a mix of every supported notation, both as a list
+# of str and as one newline-separated bytes buffer.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_core import ColorConverter
+from color_names import CSS_COLORS
+from color_parse import parse_colors
+
+def hex_values(n, rng):
+    return [f"#{rng.randrange(1 << 24):06X}" for _ in range(n)]
+
+def mixed_values(n, rng):
+    names = list(CSS_COLORS)
+
+    def one():
+        kind = rng.random()
+        r, g, b = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+        if kind < 0.5:
+            return f"#{r:02X}{g:02X}{b:02X}"
+        if kind < 0.6:
+            return f"#{r >> 4:X}{g >> 4:X}{b >> 4:X}"
+        if kind < 0.65:
+            return f"#{r:02x}{g:02x}{b:02x}{rng.randrange(256):02x}"
+        if kind < 0.75:
+            return rng.choice(names)
+        if kind < 0.85:
+            return f"rgb({r}, {g}, {b})"
+        if kind < 0.9:
+            return f"rgba({r} {g} {b} / {rng.random():.2f})"
+        if kind < 0.98:
+            return f"hsl({rng.randrange(360)}, {rng.randrange(101)}%, {rng.randrange(101)}%)"
+        return rng.choice(["", "#12345", "notacolor", "rgb(1,2)"])
+    return [one() for _ in range(n)]
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bulk color string parsing.")
+    parser.add_argument("--rows", type=int, default=1000000, help="strings per data set (default: 1M)")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    print(f"{'case':40} {'Mrows/s':>9} {'speedup':>8}")
+    for dataset, values in (("hex", hex_values(args.rows, rng)), ("mixed", mixed_values(args.rows, rng))):
+        buffer = "\n".join(values).encode("ascii")
+        baseline = None
+        if dataset == "hex":
+            seconds = best_of(lambda: [ColorConverter.hex_to_rgb(v) for v in values], args.repeat)
+            baseline = seconds
+            print(f"{'hex/ColorConverter.hex_to_rgb':40} {len(values) / seconds / 1e6:9.2f} {1.0:8.1f}")
+        for name, data in (("list", values), ("bytes", buffer)):
+            seconds = best_of(lambda: parse_colors(data), args.repeat)
+            speedup = f"{baseline / seconds:8.1f}" if baseline else f"{'':8}"
+            print(f"{dataset + '/parse_colors/' + name:40} {len(values) / seconds / 1e6:9.2f} {speedup}")
+        errors = parse_colors(buffer)[1]
+        print(f"{dataset + ' rows with errors':40} {int((errors != 0).sum()):9}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
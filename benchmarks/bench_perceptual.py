@@ -0,0 +1,46 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+# Throughput of the perceptual conversions in pixels per second, batched over
+# a random RGB image and through the scalar methods for comparison.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_core import ColorConverter
+
+SPACES = ("xyz", "lab", "lch", "oklab")
+
+def rate(func, data, pixels, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return pixels / best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the perceptual color conversions.")
+    parser.add_argument("--pixels", type=int, default=4000000, help="batch size in pixels (default: 4M)")
+    parser.add_argument("--scalar-pixels", type=int, default=20000, help="pixels for the scalar path (default: 20k)")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs (default: 3)")
+    args = parser.parse_args(argv)
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, (args.pixels, 3), dtype=np.uint8)
+    small = rgb[:args.scalar_pixels].tolist()
+    print(f"{'space':8} {'forward px/s':>14} {'inverse px/s':>14} {'scalar px/s':>14}")
+    for space in SPACES:
+        forward = getattr(ColorConverter, f"rgb_to_{space}_array")
+        inverse = getattr(ColorConverter, f"{space}_to_rgb_array")
+        scalar = getattr(ColorConverter, f"rgb_to_{space}")
+        converted = forward(rgb)
+        fwd = rate(forward, rgb, args.pixels, args.repeat)
+        inv = rate(inverse, converted, args.pixels, args.repeat)
+        sc = rate(lambda data: [scalar(*p) for p in data], small, len(small), 1)
+        print(f"{space:8} {fwd:14,.0f} {inv:14,.0f} {sc:14,.0f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import time
+
+# Per-update cost of the color preview: the old stylesheet-based QLabel
+# against the painted ColorSwatch, over consecutive color changes.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QLabel
+from color_gui import ColorSwatch
+
+def colors(n):
+    for i in range(n):
+        yield (i * 7) % 256, (i * 13) % 256, (i * 29) % 256
+
+def bench_stylesheet(n, repaint):
+    label = QLabel()
+    label.setFixedSize(300, 160)
+    label.show()
+    start = time.perf_counter()
+    for r, g, b in colors(n):
+        label.setStyleSheet(f"background-color: rgb({r}, {g}, {b}); border-radius: 24px; border: 5px solid #1a1a1a;")
+        if repaint:
+            label.repaint()
+    return time.perf_counter() - start
+
+def bench_swatch(n, repaint):
+    swatch = ColorSwatch(radius=24, border=5)
+    swatch.setFixedSize(300, 160)
+    swatch.show()
+    start = time.perf_counter()
+    for r, g, b in colors(n):
+        swatch.set_color(r, g, b)
+        if repaint:
+            swatch.repaint()
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare stylesheet and painted preview updates.")
+    parser.add_argument("-n", "--updates", type=int, default=10000, help="consecutive color changes (default: 10000)")
+    parser.add_argument("--repaint", action="store_true", help="force a synchronous repaint after every change")
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    before = bench_stylesheet(args.updates, args.repaint)
+    after = bench_swatch(args.updates, args.repaint)
+    print(f"stylesheet preview: {before / args.updates * 1e6:8.1f} us/update ({before:.3f} s total)")
+    print(f"painted swatch:     {after / args.updates * 1e6:8.1f} us/update ({after:.3f} s total)")
+    print(f"speedup:            {before / after:8.1f}x")
+    app.processEvents()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
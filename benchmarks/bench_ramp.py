@@ -0,0 +1,54 @@
+import argparse
+import os
+import sys
+import time
+
+# Ramp generation with color_ramp in every interpolation space: a cold
+# build, a cached lookup, and a per-entry loop over the scalar
+# ColorConverter round trip for comparison.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_core import ColorConverter
+from color_ramp import SPACES, ramp, ramp_cache
+
+STOPS = ("#000000", "#FF6347", "#FFFFDD", "#00AAFF")
+
+def scalar_ramp(size):
+    # Linear OKLab interpolation entry by entry, as a caller without the
+    # batch generator would write it.
+    labs = [ColorConverter.rgb_to_oklab(*ColorConverter.hex_to_rgb(s)) for s in STOPS]
+    out = []
+    for i in range(size):
+        t = i / (size - 1) * (len(labs) - 1)
+        k = min(int(t), len(labs) - 2)
+        f = t - k
+        lab = [a + (b - a) * f for a, b in zip(labs[k], labs[k + 1])]
+        out.append(ColorConverter.oklab_to_rgb(*lab))
+    return out
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark color ramp generation.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 4096], help="ramp sizes (default: 256 4096)")
+    args = parser.parse_args(argv)
+    for size in args.sizes:
+        print(f"{size} entries, {len(STOPS)} stops   scalar oklab loop {timed(lambda: scalar_ramp(size), 1) * 1e3:8.2f} ms")
+        for space in SPACES:
+            for uniform in (False, True):
+                def cold():
+                    ramp_cache.clear()
+                    ramp(STOPS, size, space, uniform=uniform)
+                cached = timed(lambda: ramp(STOPS, size, space, uniform=uniform))
+                print(f"  {space:6} {'uniform' if uniform else 'linear ':8} cold {timed(cold) * 1e3:7.2f} ms   cached {cached * 1e3:6.3f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
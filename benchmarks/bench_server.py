@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+# Latency and throughput of color_server under a local load generator. The
+# server runs in its own process; every client task reuses connections from
+# a keep-alive ColorClient pool. Each batch delay is measured separately so
+# the cost and benefit of request batching are visible side by side.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_server import ColorClient
+
+PAIRS = [("rgb", "hsv"), ("rgb", "hex"), ("hex", "lab"), ("rgb", "oklab"), ("hsl", "rgb")]
+
+def start_server(batch_delay):
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "color_server.py"), "--port", "0", "--batch-delay", str(batch_delay)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if "listening on" not in line:
+        proc.kill()
+        raise RuntimeError(f"server failed to start: {line!r}")
+    return proc, int(line.rsplit(":", 1)[1])
+
+def random_value(rng, src):
+    r, g, b = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+    if src == "hex":
+        return f"#{r:02X}{g:02X}{b:02X}"
+    if src == "hsl":
+        return [rng.randrange(360), rng.randrange(101), rng.randrange(101)]
+    return [r, g, b]
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100.0 * len(values)))]
+
+async def load(port, requests, concurrency, seed):
+    client = ColorClient(port=port, size=concurrency)
+    rng = random.Random(seed)
+    work = [(src, dst, random_value(rng, src)) for src, dst in (rng.choice(PAIRS) for _ in range(requests))]
+    latencies = []
+
+    async def worker(items):
+        for src, dst, value in items:
+            start = time.perf_counter()
+            await client.convert(src, dst, value)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(work[i::concurrency]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    status, payload = await client.request("GET", "/stats")
+    await client.close()
+    return latencies, elapsed, json.loads(payload), client.opened
+
+async def bulk(port, records, seed):
+    client = ColorClient(port=port, size=1)
+    rng = random.Random(seed)
+    body = "".join(json.dumps(random_value(rng, "rgb")) + "\n" for _ in range(records)).encode("utf-8")
+    start = time.perf_counter()
+    status, payload = await client.request("POST", "/bulk?from=rgb&to=lab", body, "application/x-ndjson")
+    elapsed = time.perf_counter() - start
+    await client.close()
+    if status != 200 or payload.count(b"\n") != records:
+        raise RuntimeError(f"bulk request failed with HTTP {status}")
+    return records / elapsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the local color conversion service.")
+    parser.add_argument("--requests", type=int, default=20000, help="single-color requests per run (default: 20k)")
+    parser.add_argument("--concurrency", type=int, default=64, help="concurrent client tasks and pooled connections (default: 64)")
+    parser.add_argument("--batch-delay", default="0,1,2", help="comma-separated batch delays in ms to compare (default: 0,1,2)")
+    parser.add_argument("--bulk-records", type=int, default=500000, help="records in the NDJSON bulk request (default: 500k)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(f"{'delay ms':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'rec/batch':>10} {'conns':>6}")
+    for delay in (float(d) for d in args.batch_delay.split(",")):
+        proc, port = start_server(delay)
+        try:
+            latencies, elapsed, stats, opened = asyncio.run(load(port, args.requests, args.concurrency, args.seed))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{delay:8g} {len(latencies) / elapsed:10,.0f} {percentile(latencies, 50) * 1000:8.2f} "
+              f"{percentile(latencies, 99) * 1000:8.2f} {stats['records_per_batch']:10.1f} {opened:6}")
+    if args.bulk_records:
+        proc, port = start_server(2)
+        try:
+            rate = asyncio.run(bulk(port, args.bulk_records, args.seed))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"bulk NDJSON rgb->lab: {rate:,.0f} records/s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Startup budget for services that only need the conversion core: importing
+# color_core (or color_converter) must not load Qt or execute NumPy.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_MS = 40.0
+RSS_BUDGET_MB = 4.0
+
+PROBE = """
+import json, resource, sys, time
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+{module}.ColorConverter.hex_to_rgb("#FF8000")
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+scale = 1 if sys.platform == "darwin" else 1024
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "rss_mb": (rss - base) * scale / 2**20,
+    "qt_loaded": any(name.startswith("PyQt6") for name in sys.modules),
+    "numpy_loaded": "numpy._core" in sys.modules or "numpy.core" in sys.modules,
+}}))
+"""
+
+def measure(module, runs):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(out))
+    return {
+        "module": module,
+        "import_ms": statistics.median(s["import_ms"] for s in samples),
+        "rss_mb": statistics.median(s["rss_mb"] for s in samples),
+        "qt_loaded": any(s["qt_loaded"] for s in samples),
+        "numpy_loaded": any(s["numpy_loaded"] for s in samples),
+    }
+
+def check(result):
+    problems = []
+    if result["import_ms"] > IMPORT_BUDGET_MS:
+        problems.append(f"import took {result['import_ms']:.1f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    if result["rss_mb"] > RSS_BUDGET_MB:
+        problems.append(f"RSS grew by {result['rss_mb']:.1f} MB (budget {RSS_BUDGET_MB} MB)")
+    if result["qt_loaded"]:
+        problems.append("PyQt6 was imported")
+    if result["numpy_loaded"]:
+        problems.append("NumPy was executed")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the import-time and RSS budget of the conversion core.")
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters per module (default: 7)")
+    args = parser.parse_args(argv)
+    failed = False
+    for module in ("color_core", "color_converter"):
+        result = measure(module, args.runs)
+        problems = check(result)
+        status = "FAIL" if problems else "ok"
+        print(f"{module:16} {result['import_ms']:7.1f} ms  {result['rss_mb']:5.1f} MB  {status}")
+        for problem in problems:
+            print(f"  - {problem}")
+        failed = failed or bool(problems)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
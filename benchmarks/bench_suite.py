@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import numpy as np
+
+# Conversion and GUI benchmark suite. Every scalar and batch ColorConverter
+# method runs over uniform-random pixels and image pixels at several sizes;
+# the GUI part times the main refresh paths on the offscreen Qt platform.
+# Results are written as JSON, and --baseline flags entries that got slower
+# than a stored run by more than --threshold.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from color_core import ColorConverter
+
+SCALAR_PAIRS = [
+    ("rgb_to_hex", "hex_to_rgb"), ("rgb_to_hsv", "hsv_to_rgb"), ("rgb_to_hsl", "hsl_to_rgb"),
+    ("rgb_to_cmyk", "cmyk_to_rgb"), ("rgb_to_yuv", "yuv_to_rgb"), ("rgb_to_xyz", "xyz_to_rgb"),
+    ("rgb_to_lab", "lab_to_rgb"), ("rgb_to_lch", "lch_to_rgb"), ("rgb_to_oklab", "oklab_to_rgb"),
+]
+BATCH_SPACES = ("hsv", "hsl", "cmyk", "yuv", "xyz", "lab", "lch", "oklab")
+
+def random_pixels(n, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (n, 3), dtype=np.uint8)
+
+def synthetic_image(height=1024, width=1536, seed=0):
+    # Smooth gradients plus sensor-like noise: spatially correlated colors
+    # with far fewer distinct values than uniform noise, like a photograph.
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width] / np.array([height, width]).reshape(2, 1, 1)
+    channels = []
+    for _ in range(3):
+        f = rng.uniform(0.5, 3.0, (3, 2))
+        p = rng.uniform(0, 2 * np.pi, 3)
+        c = sum(np.sin(2 * np.pi * (f[i, 0] * x + f[i, 1] * y) + p[i]) for i in range(3))
+        channels.append(127.5 + 40.0 * c)
+    image = np.stack(channels, axis=-1) + rng.normal(0, 4.0, (height, width, 3))
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+def image_pixels(n, path=None):
+    if path:
+        from color_palette import open_image
+        pixels = np.asarray(open_image(path)[..., :3]).reshape(-1, 3)
+    else:
+        pixels = synthetic_image().reshape(-1, 3)
+    reps = -(-n // len(pixels))
+    return np.tile(pixels, (reps, 1))[:n] if reps > 1 else pixels[:n]
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def entry(value, unit, higher_is_better=True):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+def bench_scalar(pixels, dataset, repeat, results):
+    rgb = [tuple(p) for p in pixels.tolist()]
+    for forward_name, inverse_name in SCALAR_PAIRS:
+        forward = getattr(ColorConverter, forward_name)
+        inverse = getattr(ColorConverter, inverse_name)
+        outputs = [forward(*p) for p in rgb]
+        args = [o if isinstance(o, tuple) else (o,) for o in outputs]
+        for name, func, data in ((forward_name, forward, rgb), (inverse_name, inverse, args)):
+            seconds = best_of(lambda: [func(*a) for a in data], repeat)
+            results[f"scalar/{name}/{dataset}/{len(data)}"] = entry(len(data) / seconds / 1e3, "kops/s")
+
+def bench_batch(pixels, dataset, repeat, results):
+    for space in BATCH_SPACES:
+        forward = getattr(ColorConverter, f"rgb_to_{space}_array")
+        inverse = getattr(ColorConverter, f"{space}_to_rgb_array")
+        converted = forward(pixels)
+        for name, func, data in ((f"rgb_to_{space}_array", forward, pixels), (f"{space}_to_rgb_array", inverse, converted)):
+            seconds = best_of(lambda: func(data), repeat)
+            results[f"batch/{name}/{dataset}/{len(data)}"] = entry(len(data) / seconds / 1e6, "Mpx/s")
+
+def bench_gamut(pixels, dataset, repeat, results):
+    from color_gamut import GamutGrid, press_gamut
+    gamut = press_gamut()
+    grid = GamutGrid(gamut)
+    for name, func in (("check_rgb", gamut.check_rgb), ("map_rgb", gamut.map_rgb),
+                       ("grid_check_rgb", grid.check_rgb), ("grid_map_rgb", grid.map_rgb)):
+        seconds = best_of(lambda: func(pixels), repeat)
+        results[f"gamut/{name}/{dataset}/{len(pixels)}"] = entry(len(pixels) / seconds / 1e6, "Mpx/s")
+
+def latency(func, setup, iterations, app):
+    samples = []
+    for i in range(iterations):
+        setup(i)
+        start = time.perf_counter()
+        func(i)
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+def bench_gui(iterations, results):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    import color_gui
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = color_gui.MainWindow()
+    window.show()
+    app.processEvents()
+    rng = random.Random(0)
+
+    def random_color(i):
+        window.current_r, window.current_g, window.current_b = (rng.randrange(256) for _ in range(3))
+
+    def random_hue(i):
+        window.picker.hue = rng.randrange(360)
+
+    def no_setup(i):
+        pass
+
+    cases = {
+        "update_all_outputs": (lambda i: window.update_all_outputs(), random_color),
+        "update_canvas": (lambda i: window.picker.update_canvas(), random_hue),
+        "show_harmony": (lambda i: window.show_harmony(i % len(color_gui.HARMONY_SCHEMES)), random_color),
+        "change_theme": (lambda i: window.change_theme(i % 5), no_setup),
+    }
+    for name, (func, setup) in cases.items():
+        samples = latency(func, setup, iterations, app)
+        for q in (50, 99):
+            value = samples[min(len(samples) - 1, int(q / 100.0 * len(samples)))] * 1000
+            results[f"gui/{name}/p{q}"] = entry(value, "ms", higher_is_better=False)
+    window.harmony_panel.close()
+    window.close()
+
+def compare(results, baseline, threshold):
+    # Ratio > 1 means faster than the baseline for every kind of entry.
+    regressions = 0
+    print(f"{'benchmark':58} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current["higher_is_better"]:
+            ratio = current["value"] / base["value"]
+        else:
+            ratio = base["value"] / current["value"]
+        flag = ""
+        if ratio < 1.0 - threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{key:58} {base['value']:10.3f} {current['value']:10.3f} {ratio:7.2f}{flag}")
+    print(f"{regressions} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every conversion and the main GUI refresh paths.")
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="batch sizes in pixels (default: 1000,100000,1000000)")
+    parser.add_argument("--scalar-limit", type=int, default=20000, help="max pixels for the scalar methods (default: 20000)")
+    parser.add_argument("--image", help="image for the real-image data set (.ppm/.npy, others need Pillow; default: synthetic photo)")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs (default: 3)")
+    parser.add_argument("--gui-iterations", type=int, default=200, help="samples per GUI benchmark (default: 200)")
+    parser.add_argument("--skip-gui", action="store_true", help="do not run the GUI benchmarks")
+    parser.add_argument("-o", "--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",")]
+    results = {}
+    datasets = {"random": random_pixels, "image": lambda n: image_pixels(n, args.image)}
+    for dataset, make in datasets.items():
+        for n in sizes:
+            pixels = make(n)
+            bench_batch(pixels, dataset, args.repeat, results)
+            bench_gamut(pixels, dataset, args.repeat, results)
+            if n <= args.scalar_limit:
+                bench_scalar(pixels, dataset, args.repeat, results)
+        if all(n > args.scalar_limit for n in sizes):
+            bench_scalar(make(args.scalar_limit), dataset, args.repeat, results)
+    if not args.skip_gui:
+        bench_gui(args.gui_iterations, results)
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(),
+            "numpy": np.__version__, "platform": platform.platform(), "image": args.image or "synthetic",
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        return 1 if compare(results, baseline, args.threshold) else 0
+    for key, e in results.items():
+        print(f"{key:58} {e['value']:12.3f} {e['unit']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import copy
+import threading
+from collections import OrderedDict
+from color_core import ColorConverter
+
+# Opt-in memoization for the scalar ColorConverter methods. cached_converter()
+# returns a ColorConverter subclass whose methods share one bounded LRU, so
+# the plain class keeps its uncached behaviour. Calls on 8-bit RGB are keyed
+# on the method id and the packed 24-bit value; other calls on their argument
+# tuple. The *_array methods are left as they are.
+DEFAULT_SIZE = 4096
+IMMUTABLE = (tuple, str, int, float)
+
+class ConversionCache:
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"cache size must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def get(self, key, compute):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+        # Computed outside the lock so concurrent readers never wait on a
+        # conversion; two threads missing the same key store the same value.
+        value = compute()
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+def _cached_method(method_id, name, func, cache):
+    takes_rgb = name.startswith("rgb_to_") or name == "harmony"
+
+    def method(*args, **kwargs):
+        if kwargs:
+            return func(*args, **kwargs)
+        if takes_rgb and len(args) >= 3 and all(type(c) is int and 0 <= c <= 255 for c in args[:3]):
+            packed = (method_id << 24) | (args[0] << 16) | (args[1] << 8) | args[2]
+            key = packed if len(args) == 3 else (packed,) + args[3:]
+        else:
+            key = (method_id,) + args
+            try:
+                hash(key)
+            except TypeError:
+                return func(*args)
+        value = cache.get(key, lambda: func(*args))
+        # Lists and arrays are copied so callers cannot modify cached results.
+        return value if isinstance(value, IMMUTABLE) else copy.copy(value)
+
+    method.__name__ = name
+    method.__wrapped__ = func
+    return method
+
+def cached_converter(maxsize=DEFAULT_SIZE, base=ColorConverter):
+    cache = ConversionCache(maxsize)
+    names = sorted(name for name, value in vars(base).items()
+                   if isinstance(value, staticmethod) and not name.endswith("_array"))
+    namespace = {"cache": cache}
+    for method_id, name in enumerate(names):
+        namespace[name] = staticmethod(_cached_method(method_id, name, getattr(base, name), cache))
+    return type(f"Cached{base.__name__}", (base,), namespace)
@@ -0,0 +1,206 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from color_core import ColorConverter, PERCEPTUAL_DIGITS
+from color_parse import parse_colors_strict
+
+# Headless bulk converter. Input is read as a stream of records and converted
+# chunk by chunk with the batch kernels, so memory stays constant no matter
+# how large the input is. PyQt6 is never imported here.
+SPACES = {"hex": 1, "rgb": 3, "hsv": 3, "hsl": 3, "cmyk": 4, "yuv": 3, "xyz": 3, "lab": 3, "lch": 3, "oklab": 3}
+# Input from hex accepts any CSS color string, so css names the same space.
+ALIASES = {"css": "hex"}
+FORMATS = ("plain", "csv", "jsonl")
+
+TO_RGB = {
+    "hsv": ColorConverter.hsv_to_rgb_array,
+    "hsl": ColorConverter.hsl_to_rgb_array,
+    "cmyk": ColorConverter.cmyk_to_rgb_array,
+    "yuv": ColorConverter.yuv_to_rgb_array,
+    "xyz": ColorConverter.xyz_to_rgb_array,
+    "lab": ColorConverter.lab_to_rgb_array,
+    "lch": ColorConverter.lch_to_rgb_array,
+    "oklab": ColorConverter.oklab_to_rgb_array,
+}
+FROM_RGB = {
+    "hsv": ColorConverter.rgb_to_hsv_array,
+    "hsl": ColorConverter.rgb_to_hsl_array,
+    "cmyk": ColorConverter.rgb_to_cmyk_array,
+    "yuv": ColorConverter.rgb_to_yuv_array,
+    "xyz": ColorConverter.rgb_to_xyz_array,
+    "lab": ColorConverter.rgb_to_lab_array,
+    "lch": ColorConverter.rgb_to_lch_array,
+    "oklab": ColorConverter.rgb_to_oklab_array,
+}
+
+_lut = None
+
+def read_records(stream, fmt, first_line=1, whole=False):
+    # With whole=True each plain line or CSV row is a single color string,
+    # so the commas inside rgb(0, 255, 0) do not split it.
+    if fmt == "csv":
+        for row in csv.reader(stream):
+            if row and whole:
+                yield [",".join(row).strip()]
+            elif row:
+                yield [field.strip() for field in row]
+    elif fmt == "jsonl":
+        for number, line in enumerate(stream, first_line):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"line {number}: {e}") from None
+            if isinstance(value, str):
+                yield [value]
+            elif isinstance(value, list):
+                yield value
+            else:
+                raise ValueError(f"line {number}: expected a string or a list of numbers, got {line!r}")
+    elif whole:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield [line]
+    else:
+        for line in stream:
+            fields = line.replace(",", " ").split()
+            if fields:
+                yield fields
+
+def chunked(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def parse_chunk(rows, space, offset=0):
+    width = SPACES[space]
+    for i, row in enumerate(rows):
+        if not isinstance(row, (list, tuple)) or len(row) != width:
+            raise ValueError(f"record {offset + i + 1}: expected {width} value(s) for {space}, got {row!r}")
+    if space == "hex":
+        # Any CSS color string is accepted; alpha is dropped.
+        packed = parse_colors_strict([row[0] for row in rows], "record", offset + 1)
+        return np.stack([(packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF], axis=-1).astype(np.uint8)
+    try:
+        values = np.array(rows, dtype=np.float64)
+    except (ValueError, TypeError, OverflowError) as e:
+        raise ValueError(f"records {offset + 1}-{offset + len(rows)}: {e}") from None
+    bad = np.flatnonzero(~np.isfinite(values).all(axis=-1))
+    if len(bad):
+        i = int(bad[0])
+        raise ValueError(f"record {offset + i + 1}: channel values must be finite, got {rows[i]!r}")
+    return values
+
+def to_rgb(values, space):
+    if space in TO_RGB:
+        return TO_RGB[space](values)
+    return values
+
+def from_rgb(rgb, space, use_lut=False):
+    global _lut
+    if space in ("rgb", "hex"):
+        return np.clip(np.round(rgb), 0, 255).astype(np.int64)
+    if space in PERCEPTUAL_DIGITS:
+        return np.round(FROM_RGB[space](rgb), PERCEPTUAL_DIGITS[space]) + 0.0
+    if use_lut:
+        if _lut is None:
+            from color_lut import ColorLUT
+            _lut = ColorLUT()
+        return _lut.convert(space, rgb)
+    return FROM_RGB[space](rgb)
+
+def format_chunk(values, space, fmt):
+    rows = values.tolist()
+    if space == "hex":
+        cells = [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in rows]
+        if fmt == "jsonl":
+            return "".join(json.dumps(cell) + "\n" for cell in cells)
+        return "".join(cell + "\n" for cell in cells)
+    if fmt == "jsonl":
+        return "".join(json.dumps(row) + "\n" for row in rows)
+    sep = "," if fmt == "csv" else " "
+    return "".join(sep.join(map(str, row)) + "\n" for row in rows)
+
+def convert_chunk(rows, src, dst, fmt, offset=0, use_lut=False):
+    rgb = to_rgb(parse_chunk(rows, src, offset), src)
+    return format_chunk(from_rgb(rgb, dst, use_lut), dst, fmt)
+
+def convert_stream(records, src, dst, fmt, workers=1, chunk_size=65536, use_lut=False):
+    # Yields formatted output text per chunk, in input order. With several
+    # workers only a bounded window of chunks is in flight at any time.
+    chunks = chunked(records, chunk_size)
+    if workers <= 1:
+        offset = 0
+        for rows in chunks:
+            yield convert_chunk(rows, src, dst, fmt, offset, use_lut)
+            offset += len(rows)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        offset = 0
+        for rows in chunks:
+            pending.append(pool.submit(convert_chunk, rows, src, dst, fmt, offset, use_lut))
+            offset += len(rows)
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def iter_inputs(paths, fmt, whole=False):
+    for path in paths:
+        if path == "-":
+            yield from read_records(sys.stdin, fmt, whole=whole)
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                yield from read_records(f, fmt, whole=whole)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="color_cli",
+        description="Convert lists of colors between HEX, RGB, HSV, HSL, CMYK, YUV, XYZ, Lab, LCh and OKLab without a GUI."
+    )
+    parser.add_argument("inputs", nargs="*", default=["-"], help="input files ('-' for stdin, the default)")
+    parser.add_argument("--from", dest="src", required=True, choices=list(SPACES) + list(ALIASES), help="input color space")
+    parser.add_argument("--to", dest="dst", required=True, choices=list(SPACES) + list(ALIASES), help="output color space")
+    parser.add_argument("--format", choices=FORMATS, default="plain", help="record format (default: plain)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout, the default)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per core)")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="records per chunk (default: 65536)")
+    parser.add_argument("--lut", action="store_true", help="use the memory-mapped lookup tables for RGB input")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be positive")
+    src, dst = ALIASES.get(args.src, args.src), ALIASES.get(args.dst, args.dst)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        records = iter_inputs(args.inputs, args.format, src == "hex")
+        for text in convert_stream(records, src, dst, args.format, workers, args.chunk_size, args.lut):
+            out.write(text)
+    except (ValueError, OSError) as e:
+        print(f"color_cli: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
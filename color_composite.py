@@ -0,0 +1,58 @@
+import numpy as np
+from color_core import _channels, _stack
+
+# Batch alpha compositing of 8-bit sRGB colors, following the W3C
+# Compositing and Blending formulas: the blend mode mixes the two colors
+# where both are present and source-over places the result on the backdrop.
+# Colors are (..., 4) straight-alpha arrays (a (..., 3) array is opaque),
+# color_pack Colors or Palettes; everything broadcasts like NumPy, so one
+# call composites a palette onto any number of backgrounds.
+MODES = ("over", "multiply", "screen")
+
+def _array(colors):
+    return np.asarray(getattr(colors, "rgba", colors))
+
+def _rgba(colors):
+    arr = _array(colors)
+    if arr.ndim and arr.shape[-1] == 3:
+        arr = np.concatenate([arr, np.full(arr.shape[:-1] + (1,), 255, dtype=arr.dtype)], axis=-1)
+    return tuple(np.clip(c, 0, 255) / 255.0 for c in _channels(arr, 4))
+
+def _blend(mode, cb, cs):
+    if mode == "over":
+        return cs
+    if mode == "multiply":
+        return cb * cs
+    if mode == "screen":
+        return cb + cs - cb * cs
+    raise ValueError(f"unknown blend mode: {mode}")
+
+def composite(source, backdrop, mode="over"):
+    # Straight-alpha uint8 (..., 4) result of source blended onto backdrop.
+    rs, gs, bs, as_ = _rgba(source)
+    rb, gb, bb, ab = _rgba(backdrop)
+    ao = as_ + ab * (1.0 - as_)
+    safe = np.where(ao == 0, 1.0, ao)
+    out = []
+    for cs, cb in ((rs, rb), (gs, gb), (bs, bb)):
+        mixed = (1.0 - ab) * cs + ab * _blend(mode, cb, cs)
+        out.append(np.where(ao == 0, 0.0, (as_ * mixed + ab * cb * (1.0 - as_)) / safe) * 255)
+    out.append(ao * 255)
+    return _stack(out, np.uint8)
+
+def composite_grid(colors, backdrops, mode="over"):
+    # Every one of N colors on every one of M backdrops, shape (N, M, 4).
+    colors = _array(colors)
+    backdrops = _array(backdrops)
+    colors = colors.reshape(-1, 1, colors.shape[-1])
+    backdrops = backdrops.reshape(1, -1, backdrops.shape[-1])
+    return composite(colors, backdrops, mode)
+
+def premultiply(rgba):
+    r, g, b, a = _rgba(rgba)
+    return _stack((r * a * 255, g * a * 255, b * a * 255, a * 255), np.uint8)
+
+def unpremultiply(rgba):
+    r, g, b, a = _rgba(rgba)
+    safe = np.where(a == 0, 1.0, a)
+    return _stack(tuple(np.where(a == 0, 0.0, np.minimum(c / safe, 1.0) * 255) for c in (r, g, b)) + (a * 255,), np.uint8)
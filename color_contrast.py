@@ -0,0 +1,212 @@
+import argparse
+import sys
+import numpy as np
+from color_composite import composite
+from color_core import ColorConverter
+from color_pack import Color, Palette
+from color_parse import describe, parse_colors
+
+# Text/background contrast: the WCAG 2.x luminance ratio (1 to 21) and the
+# APCA lightness contrast Lc (about -108 to 106, negative for light text on
+# a dark background). Everything broadcasts like color_delta, so a pair, one
+# background against a palette, or an (N, 1) x (1, M) block of the full
+# matrix is one call. Translucent text is composited onto its background
+# first; backgrounds are taken as opaque.
+METRICS = ("wcag", "apca")
+WCAG_LEVELS = (("AAA", 7.0), ("AA", 4.5), ("AA Large", 3.0))
+DEFAULT_MINIMUM = {"wcag": 4.5, "apca": 60.0}
+MATRIX_CHUNK = 1024
+SUGGEST_STEPS = 201
+
+# APCA 0.0.98G-4g constants (sRGB).
+APCA_TRC = 2.4
+APCA_COEFFS = (0.2126729, 0.7151522, 0.0721750)
+APCA_NORM_BG, APCA_NORM_TXT = 0.56, 0.57
+APCA_REV_BG, APCA_REV_TXT = 0.65, 0.62
+APCA_BLACK_THRESHOLD, APCA_BLACK_CLAMP = 0.022, 1.414
+APCA_SCALE = 1.14
+APCA_OFFSET = 0.027
+APCA_DELTA_Y_MIN = 0.0005
+APCA_LOW_CLIP = 0.1
+
+def _rgb(colors):
+    # (..., 3) or (..., 4) array, Color or Palette -> uint8 (..., 4).
+    arr = np.asarray(getattr(colors, "rgba", colors))
+    if arr.ndim == 0 or arr.shape[-1] not in (3, 4):
+        raise ValueError(f"expected an array with a trailing axis of 3 or 4, got shape {arr.shape}")
+    if arr.shape[-1] == 3:
+        arr = np.concatenate([arr, np.full(arr.shape[:-1] + (1,), 255, dtype=arr.dtype)], axis=-1)
+    return np.clip(arr, 0, 255).astype(np.uint8)
+
+def _text_on(text, background):
+    # Opaque text as is, translucent text blended onto the background.
+    text = _rgb(text)
+    background = _rgb(background)
+    if (text[..., 3] == 255).all():
+        return text[..., :3], background[..., :3]
+    background = background.copy()
+    background[..., 3] = 255
+    return composite(text, background)[..., :3], background[..., :3]
+
+def relative_luminance(rgb):
+    # WCAG relative luminance is CIE Y of the sRGB color, scaled to 0-1.
+    return ColorConverter.rgb_to_xyz_array(rgb)[..., 1] / 100.0
+
+def wcag_ratio(lum1, lum2):
+    high = np.maximum(lum1, lum2)
+    low = np.minimum(lum1, lum2)
+    return (high + 0.05) / (low + 0.05)
+
+def apca_luminance(rgb):
+    # APCA's screen luminance: a plain 2.4 power curve with a soft clamp
+    # near black, not the piecewise sRGB transfer function.
+    rgb = np.asarray(rgb, dtype=np.float64) / 255.0
+    y = sum(k * rgb[..., i] ** APCA_TRC for i, k in enumerate(APCA_COEFFS))
+    return np.where(y < APCA_BLACK_THRESHOLD, y + np.maximum(APCA_BLACK_THRESHOLD - y, 0.0) ** APCA_BLACK_CLAMP, y)
+
+def apca_lc(text_y, background_y):
+    # The powers are taken before broadcasting, so an (N, 1) x (1, M) call
+    # raises N + M values instead of N * M.
+    text_y = np.asarray(text_y, dtype=np.float64)
+    background_y = np.asarray(background_y, dtype=np.float64)
+    normal = (background_y ** APCA_NORM_BG - text_y ** APCA_NORM_TXT) * APCA_SCALE
+    reverse = (background_y ** APCA_REV_BG - text_y ** APCA_REV_TXT) * APCA_SCALE
+    lc = np.where(background_y > text_y,
+                  np.where(normal < APCA_LOW_CLIP, 0.0, normal - APCA_OFFSET),
+                  np.where(reverse > -APCA_LOW_CLIP, 0.0, reverse + APCA_OFFSET))
+    return np.where(np.abs(background_y - text_y) < APCA_DELTA_Y_MIN, 0.0, lc) * 100.0
+
+def _luminance(rgb, metric):
+    if metric == "wcag":
+        return relative_luminance(rgb)
+    if metric == "apca":
+        return apca_luminance(rgb)
+    raise ValueError(f"unknown contrast metric: {metric}")
+
+def _score(text_y, background_y, metric):
+    return wcag_ratio(text_y, background_y) if metric == "wcag" else apca_lc(text_y, background_y)
+
+def contrast(text, background, metric="wcag"):
+    text, background = _text_on(text, background)
+    return _score(_luminance(text, metric), _luminance(background, metric), metric)
+
+def passes(values, minimum, metric="wcag"):
+    # APCA polarity only says which side is lighter; thresholds apply to |Lc|.
+    return (np.abs(values) if metric == "apca" else values) >= minimum
+
+def wcag_level(ratio):
+    for level, minimum in WCAG_LEVELS:
+        if ratio >= minimum:
+            return level
+    return None
+
+def iter_contrast_matrix(text, backgrounds=None, metric="wcag", chunk=MATRIX_CHUNK):
+    # Yields (row_start, block) for the N x M matrix of every text color on
+    # every background (the palette against itself by default), chunk rows
+    # at a time. Luminance is computed once per color; only chunks holding
+    # translucent text are composited per background.
+    text = _rgb(text).reshape(-1, 4)
+    backgrounds = text if backgrounds is None else _rgb(backgrounds).reshape(-1, 4)
+    background_y = _luminance(backgrounds[:, :3], metric)
+    text_y = _luminance(text[:, :3], metric)
+    for start in range(0, len(text), chunk):
+        rows = text[start:start + chunk]
+        if (rows[:, 3] == 255).all():
+            yield start, _score(text_y[start:start + chunk, None], background_y[None, :], metric)
+        else:
+            yield start, contrast(rows[:, None, :], backgrounds[None, :, :], metric)
+
+def contrast_matrix(text, backgrounds=None, metric="wcag", chunk=MATRIX_CHUNK, out=None):
+    # `out` may be a preallocated array or np.memmap of shape (N, M); the
+    # default is float32, which is plenty for ratios and Lc.
+    n = len(_rgb(text).reshape(-1, 4))
+    m = n if backgrounds is None else len(_rgb(backgrounds).reshape(-1, 4))
+    if out is None:
+        out = np.empty((n, m), dtype=np.float32)
+    for start, block in iter_contrast_matrix(text, backgrounds, metric, chunk):
+        out[start:start + len(block)] = block
+    return out
+
+def failing_pairs(text, backgrounds=None, minimum=None, metric="wcag", chunk=MATRIX_CHUNK):
+    # Yields (text index, background index, value) arrays per chunk for the
+    # pairs below minimum, without holding the matrix. When a palette is
+    # checked against itself the diagonal is skipped.
+    minimum = DEFAULT_MINIMUM[metric] if minimum is None else minimum
+    for start, block in iter_contrast_matrix(text, backgrounds, metric, chunk):
+        fail = ~passes(block, minimum, metric)
+        if backgrounds is None:
+            rows = np.arange(len(block))
+            fail[rows, rows + start] = False
+        i, j = np.nonzero(fail)
+        yield i + start, j, block[i, j]
+
+def suggest(text, background, minimum=None, metric="wcag", steps=SUGGEST_STEPS):
+    # Nearest passing replacement for the text color: CIELAB lightness is
+    # searched with hue and chroma kept (chroma clips at the gamut edge),
+    # and the passing candidate closest in L* wins. Broadcasts over pairs;
+    # returns (colors, values, found), where colors keep the text alpha and
+    # rows with no passing lightness keep the original color.
+    minimum = DEFAULT_MINIMUM[metric] if minimum is None else minimum
+    text, background = np.broadcast_arrays(_rgb(text), _rgb(background))
+    lch = ColorConverter.rgb_to_lch_array(text[..., :3])
+    lightness = np.linspace(0.0, 100.0, steps)
+    grid = np.broadcast_to(lch[..., None, :], lch.shape[:-1] + (steps, 3)).copy()
+    grid[..., 0] = lightness
+    candidates = np.concatenate([ColorConverter.lch_to_rgb_array(grid),
+                                 np.broadcast_to(text[..., None, 3:], grid.shape[:-1] + (1,))], axis=-1)
+    values = contrast(candidates, background[..., None, :], metric)
+    distance = np.where(passes(values, minimum, metric), np.abs(lightness - lch[..., None, 0]), np.inf)
+    best = np.argmin(distance, axis=-1)[..., None]
+    found = np.isfinite(np.take_along_axis(distance, best, axis=-1)[..., 0])
+    colors = np.take_along_axis(candidates, best[..., None], axis=-2)[..., 0, :]
+    values = np.take_along_axis(values, best, axis=-1)[..., 0]
+    colors = np.where(found[..., None], colors, text)
+    values = np.where(found, values, contrast(text, background, metric))
+    return colors, values, found
+
+def read_colors(path):
+    # One CSS color per line ('-' for stdin).
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    with stream:
+        lines = [line for line in stream.read().splitlines() if line.strip()]
+    packed, errors = parse_colors(lines)
+    bad = np.flatnonzero(errors)
+    if len(bad):
+        raise ValueError(f"{path}: line {bad[0] + 1}: {describe(errors[bad[0]])}: {lines[bad[0]].decode(errors='replace')!r}")
+    return packed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_contrast",
+                                     description="Check text/background pairs of a palette for WCAG 2.x or APCA contrast.")
+    parser.add_argument("colors", help="file with one CSS color per line ('-' for stdin)")
+    parser.add_argument("--backgrounds", help="file of background colors (default: every color against every other)")
+    parser.add_argument("--metric", choices=METRICS, default="wcag", help="wcag ratio or apca Lc (default: wcag)")
+    parser.add_argument("--min", dest="minimum", type=float,
+                        help="passing contrast (default: 4.5 for wcag, 60 for |Lc| with apca)")
+    parser.add_argument("--suggest", action="store_true", help="also print the nearest passing text color")
+    parser.add_argument("--chunk", type=int, default=MATRIX_CHUNK, help=f"text colors per block (default: {MATRIX_CHUNK})")
+    args = parser.parse_args(argv)
+    minimum = DEFAULT_MINIMUM[args.metric] if args.minimum is None else args.minimum
+    try:
+        text = Palette.wrap(read_colors(args.colors))
+        backgrounds = None if args.backgrounds is None else Palette.wrap(read_colors(args.backgrounds))
+    except (ValueError, OSError) as e:
+        print(f"color_contrast: error: {e}", file=sys.stderr)
+        return 2
+    pool = text if backgrounds is None else backgrounds
+    pairs = len(text) * (len(pool) - (backgrounds is None))
+    failing = 0
+    for i, j, values in failing_pairs(text, backgrounds, minimum, args.metric, args.chunk):
+        failing += len(i)
+        if args.suggest and len(i):
+            colors, fixed, found = suggest(text.rgba[i], pool.rgba[j], minimum, args.metric)
+        for k, (row, col, value) in enumerate(zip(i.tolist(), j.tolist(), values.tolist())):
+            line = f"{text[row].hex} on {pool[col].hex}  {value:.2f}"
+            if args.suggest:
+                line += f"  -> {Color(*colors[k].tolist()).hex} {fixed[k]:.2f}" if found[k] else "  -> none"
+            print(line)
+    print(f"pairs={pairs} failing={failing} metric={args.metric} min={minimum:g}")
+    return 1 if failing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,474 @@
+import colorsys
+import functools
+import importlib
+import sys
+
+# NumPy is only needed by the batch methods, so it is loaded on first use;
+# importing this module for the scalar conversions stays cheap.
+class _LazyModule:
+    # Stands in for a module until its first attribute access, which imports
+    # it (ImportError if it is not installed) and rebinds the global alias to
+    # the real module. sys.modules is left alone.
+    def __init__(self, name, alias):
+        self.name = name
+        self.alias = alias
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self.name)
+        globals()[self.alias] = module
+        return getattr(module, attr)
+
+def _lazy_import(name, alias):
+    if name in sys.modules:
+        return sys.modules[name]
+    return _LazyModule(name, alias)
+
+np = _lazy_import("numpy", "np")
+
+ONE_THIRD = 1.0 / 3.0
+ONE_SIXTH = 1.0 / 6.0
+TWO_THIRD = 2.0 / 3.0
+
+# Vectorized mirrors of the colorsys routines. The arithmetic is kept in the
+# same order as colorsys so batch results round exactly like the scalar path.
+def _channels(arr, n=3):
+    arr = np.asarray(arr, dtype=np.float64)
+    if arr.ndim == 0 or arr.shape[-1] != n:
+        raise ValueError(f"expected an array with a trailing axis of {n}, got shape {arr.shape}")
+    return tuple(arr[..., i] for i in range(n))
+
+def _clip_rgb(arr):
+    # color_pack.Color and Palette expose their channels as .rgb.
+    arr = getattr(arr, "rgb", arr)
+    return tuple(np.clip(c, 0, 255) for c in _channels(arr))
+
+def _rgb_args(method):
+    # Lets a scalar rgb_to_* method take one color object in place of r, g, b.
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if len(args) == 1 and not kwargs and hasattr(args[0], "rgb"):
+            args = args[0].rgb
+        return method(*args, **kwargs)
+    return wrapper
+
+def _stack(channels, dtype):
+    return np.stack([np.round(c) for c in channels], axis=-1).astype(dtype)
+
+def _np_hue(r, g, b, maxc, rangec):
+    safe = np.where(rangec == 0, 1.0, rangec)
+    rc = (maxc - r) / safe
+    gc = (maxc - g) / safe
+    bc = (maxc - b) / safe
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.mod(h / 6.0, 1.0)
+    return np.where(rangec == 0, 0.0, h)
+
+def _np_rgb_to_hsv(r, g, b):
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    rangec = maxc - minc
+    s = np.where(rangec == 0, 0.0, rangec / np.where(maxc == 0, 1.0, maxc))
+    return _np_hue(r, g, b, maxc, rangec), s, maxc
+
+def _np_rgb_to_hls(r, g, b):
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    l = sumc / 2.0
+    low = np.where(sumc == 0, 1.0, sumc)
+    high = 2.0 - maxc - minc
+    high = np.where(high == 0, 1.0, high)
+    s = np.where(l <= 0.5, rangec / low, rangec / high)
+    s = np.where(rangec == 0, 0.0, s)
+    return _np_hue(r, g, b, maxc, rangec), l, s
+
+def _np_hsv_to_rgb(h, s, v):
+    h6 = h * 6.0
+    i = np.trunc(h6)
+    f = h6 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = np.mod(i, 6).astype(np.intp)
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    zero = s == 0.0
+    return np.where(zero, v, r), np.where(zero, v, g), np.where(zero, v, b)
+
+def _np_hls_v(m1, m2, hue):
+    hue = np.mod(hue, 1.0)
+    return np.where(hue < ONE_SIXTH, m1 + (m2 - m1) * hue * 6.0,
+           np.where(hue < 0.5, m2,
+           np.where(hue < TWO_THIRD, m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0, m1)))
+
+def _np_hls_to_rgb(h, l, s):
+    m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+    m1 = 2.0 * l - m2
+    zero = s == 0.0
+    return (np.where(zero, l, _np_hls_v(m1, m2, h + ONE_THIRD)),
+            np.where(zero, l, _np_hls_v(m1, m2, h)),
+            np.where(zero, l, _np_hls_v(m1, m2, h - ONE_THIRD)))
+
+# CIE XYZ / CIELAB / LCh use sRGB primaries with the D65 white point
+# (XYZ scaled to Y = 100); OKLab follows Ottosson's published matrices.
+RGB_TO_XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041),
+)
+XYZ_TO_RGB = (
+    (3.2404542, -1.5371385, -0.4985314),
+    (-0.9692660, 1.8760108, 0.0415560),
+    (0.0556434, -0.2040259, 1.0572252),
+)
+D65_WHITE = (95.047, 100.0, 108.883)
+LAB_EPSILON = (6.0 / 29.0) ** 3
+LAB_KAPPA = 3 * (6.0 / 29.0) ** 2
+LCH_ACHROMATIC = 1e-4
+OKLAB_M1 = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+OKLAB_M2 = (
+    (0.2104542553, 0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050, 0.4505937099),
+    (0.0259040371, 0.7827717662, -0.8086757660),
+)
+OKLAB_M2_INV = (
+    (1.0, 0.3963377774, 0.2158037573),
+    (1.0, -0.1055613458, -0.0638541728),
+    (1.0, -0.0894841775, -1.2914855480),
+)
+OKLAB_M1_INV = (
+    (4.0767416621, -3.3077115913, 0.2309699292),
+    (-1.2684380046, 2.6097574011, -0.3413193965),
+    (-0.0041960863, -0.7034186147, 1.7076147010),
+)
+# Decimal places the scalar perceptual methods round to.
+PERCEPTUAL_DIGITS = {"xyz": 2, "lab": 2, "lch": 2, "oklab": 4}
+
+def srgb_to_linear(c):
+    c = np.asarray(c, dtype=np.float64)
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(c):
+    c = np.clip(np.asarray(c, dtype=np.float64), 0.0, 1.0)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * c ** (1 / 2.4) - 0.055)
+
+def _display(values, space):
+    # Adding 0.0 folds the -0.0 left by rounding tiny negatives into 0.0.
+    return tuple(round(c, PERCEPTUAL_DIGITS[space]) + 0.0 for c in values.tolist())
+
+def _mat(m, a, b, c):
+    return (m[0][0]*a + m[0][1]*b + m[0][2]*c,
+            m[1][0]*a + m[1][1]*b + m[1][2]*c,
+            m[2][0]*a + m[2][1]*b + m[2][2]*c)
+
+def _linear_rgb(rgb):
+    r, g, b = _clip_rgb(rgb)
+    return srgb_to_linear(r / 255.0), srgb_to_linear(g / 255.0), srgb_to_linear(b / 255.0)
+
+def _encode_rgb(r, g, b):
+    return _stack((linear_to_srgb(r) * 255, linear_to_srgb(g) * 255, linear_to_srgb(b) * 255), np.uint8)
+
+def _lab_f(t):
+    return np.where(t > LAB_EPSILON, np.cbrt(t), t / LAB_KAPPA + 4.0 / 29.0)
+
+def _lab_f_inv(t):
+    return np.where(t > 6.0 / 29.0, t ** 3, LAB_KAPPA * (t - 4.0 / 29.0))
+
+def _np_xyz_to_lab(x, y, z):
+    fx, fy, fz = _lab_f(x / D65_WHITE[0]), _lab_f(y / D65_WHITE[1]), _lab_f(z / D65_WHITE[2])
+    return 116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)
+
+def _np_lab_to_xyz(l, a, b):
+    fy = (l + 16.0) / 116.0
+    return (D65_WHITE[0] * _lab_f_inv(fy + a / 500.0),
+            D65_WHITE[1] * _lab_f_inv(fy),
+            D65_WHITE[2] * _lab_f_inv(fy - b / 200.0))
+
+def _np_lab_to_lch(l, a, b):
+    # Grays carry ~1e-5 of a/b from the matrix constants; report hue 0 for
+    # them instead of an arbitrary angle.
+    c = np.hypot(a, b)
+    return l, c, np.where(c < LCH_ACHROMATIC, 0.0, np.mod(np.degrees(np.arctan2(b, a)), 360.0))
+
+def _np_lch_to_lab(l, c, h):
+    h = np.radians(h)
+    return l, c * np.cos(h), c * np.sin(h)
+
+HARMONY_SCHEMES = (
+    "complementary", "analogous", "triadic", "tetradic",
+    "split_complementary", "monochrome", "wheel"
+)
+
+class ColorConverter:
+    @staticmethod
+    @_rgb_args
+    def rgb_to_hex(r, g, b, a=None):
+        # With an alpha value the result is #RRGGBBAA.
+        if a is None:
+            return f"#{r:02x}{g:02x}{b:02x}".upper()
+        return f"#{r:02x}{g:02x}{b:02x}{a:02x}".upper()
+
+    @staticmethod
+    def hex_to_rgb(hex_str):
+        return ColorConverter.hex_to_rgba(hex_str)[:3]
+
+    @staticmethod
+    def hex_to_rgba(hex_str):
+        hex_str = hex_str.lstrip('#')
+        if len(hex_str) not in (6, 8):
+            return 0, 0, 0, 255
+        try:
+            rgba = tuple(int(hex_str[i:i+2], 16) for i in range(0, len(hex_str), 2))
+        except:
+            return 0, 0, 0, 255
+        return rgba if len(rgba) == 4 else rgba + (255,)
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_hsv(r, g, b):
+        r, g, b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+        h, s, v = colorsys.rgb_to_hsv(r/255.0, g/255.0, b/255.0)
+        return round(h*360), round(s*100), round(v*100)
+
+    @staticmethod
+    def hsv_to_rgb(h, s, v):
+        h = h % 360
+        s = max(0, min(100, s)) / 100.0
+        v = max(0, min(100, v)) / 100.0
+        r, g, b = colorsys.hsv_to_rgb(h/360.0, s, v)
+        return round(r*255), round(g*255), round(b*255)
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_hsl(r, g, b):
+        r, g, b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+        h, l, s = colorsys.rgb_to_hls(r/255.0, g/255.0, b/255.0)
+        return round(h*360), round(s*100), round(l*100)
+
+    @staticmethod
+    def hsl_to_rgb(h, s, l):
+        h = h % 360
+        s = max(0, min(100, s)) / 100.0
+        l = max(0, min(100, l)) / 100.0
+        r, g, b = colorsys.hls_to_rgb(h/360.0, l, s)
+        return round(r*255), round(g*255), round(b*255)
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_cmyk(r, g, b):
+        r, g, b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+        r_norm, g_norm, b_norm = r/255.0, g/255.0, b/255.0
+        k = 1 - max(r_norm, g_norm, b_norm)
+        if k >= 1:
+            return 0, 0, 0, 100
+        c = (1 - r_norm - k) / (1 - k) * 100
+        m = (1 - g_norm - k) / (1 - k) * 100
+        y = (1 - b_norm - k) / (1 - k) * 100
+        return round(c), round(m), round(y), round(k*100)
+
+    @staticmethod
+    def cmyk_to_rgb(c, m, y, k):
+        c, m, y, k = max(0, min(100, c)), max(0, min(100, m)), max(0, min(100, y)), max(0, min(100, k))
+        c_norm, m_norm, y_norm, k_norm = c/100.0, m/100.0, y/100.0, k/100.0
+        r = 255 * (1 - c_norm) * (1 - k_norm)
+        g = 255 * (1 - m_norm) * (1 - k_norm)
+        b = 255 * (1 - y_norm) * (1 - k_norm)
+        return round(r), round(g), round(b)
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_yuv(r, g, b):
+        r, g, b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+        y = 0.299*r + 0.587*g + 0.114*b
+        u = -0.147*r - 0.289*g + 0.436*b + 128
+        v = 0.615*r - 0.515*g - 0.100*b + 128
+        return round(y), round(u), round(v)
+
+    @staticmethod
+    def yuv_to_rgb(y, u, v):
+        u -= 128
+        v -= 128
+        r = y + 1.140*v
+        g = y - 0.395*u - 0.581*v
+        b = y + 2.032*u
+        return max(0, min(255, round(r))), max(0, min(255, round(g))), max(0, min(255, round(b)))
+
+    # Batch variants: take an (..., 3) array (or (..., 4) for CMYK) such as an
+    # (N, 3) palette or an (H, W, 3) image and return an array of the same
+    # leading shape, rounded and clamped exactly like the scalar methods.
+    @staticmethod
+    def rgb_to_hsv_array(rgb):
+        r, g, b = _clip_rgb(rgb)
+        h, s, v = _np_rgb_to_hsv(r/255.0, g/255.0, b/255.0)
+        return _stack((h*360, s*100, v*100), np.int16)
+
+    @staticmethod
+    def hsv_to_rgb_array(hsv):
+        h, s, v = _channels(hsv)
+        h = np.mod(h, 360)
+        s = np.clip(s, 0, 100) / 100.0
+        v = np.clip(v, 0, 100) / 100.0
+        r, g, b = _np_hsv_to_rgb(h/360.0, s, v)
+        return _stack((r*255, g*255, b*255), np.uint8)
+
+    @staticmethod
+    def rgb_to_hsl_array(rgb):
+        r, g, b = _clip_rgb(rgb)
+        h, l, s = _np_rgb_to_hls(r/255.0, g/255.0, b/255.0)
+        return _stack((h*360, s*100, l*100), np.int16)
+
+    @staticmethod
+    def hsl_to_rgb_array(hsl):
+        h, s, l = _channels(hsl)
+        h = np.mod(h, 360)
+        s = np.clip(s, 0, 100) / 100.0
+        l = np.clip(l, 0, 100) / 100.0
+        r, g, b = _np_hls_to_rgb(h/360.0, l, s)
+        return _stack((r*255, g*255, b*255), np.uint8)
+
+    @staticmethod
+    def rgb_to_cmyk_array(rgb):
+        r, g, b = _clip_rgb(rgb)
+        r_norm, g_norm, b_norm = r/255.0, g/255.0, b/255.0
+        k = 1 - np.maximum(np.maximum(r_norm, g_norm), b_norm)
+        black = k >= 1
+        denom = np.where(black, 1.0, 1 - k)
+        c = np.where(black, 0.0, (1 - r_norm - k) / denom * 100)
+        m = np.where(black, 0.0, (1 - g_norm - k) / denom * 100)
+        y = np.where(black, 0.0, (1 - b_norm - k) / denom * 100)
+        return _stack((c, m, y, np.where(black, 100.0, k*100)), np.int16)
+
+    @staticmethod
+    def cmyk_to_rgb_array(cmyk):
+        c, m, y, k = (np.clip(ch, 0, 100) for ch in _channels(cmyk, 4))
+        c_norm, m_norm, y_norm, k_norm = c/100.0, m/100.0, y/100.0, k/100.0
+        r = 255 * (1 - c_norm) * (1 - k_norm)
+        g = 255 * (1 - m_norm) * (1 - k_norm)
+        b = 255 * (1 - y_norm) * (1 - k_norm)
+        return _stack((r, g, b), np.uint8)
+
+    @staticmethod
+    def rgb_to_yuv_array(rgb):
+        r, g, b = _clip_rgb(rgb)
+        y = 0.299*r + 0.587*g + 0.114*b
+        u = -0.147*r - 0.289*g + 0.436*b + 128
+        v = 0.615*r - 0.515*g - 0.100*b + 128
+        return _stack((y, u, v), np.int16)
+
+    @staticmethod
+    def yuv_to_rgb_array(yuv):
+        y, u, v = _channels(yuv)
+        u = u - 128
+        v = v - 128
+        r = y + 1.140*v
+        g = y - 0.395*u - 0.581*v
+        b = y + 2.032*u
+        return np.clip(_stack((r, g, b), np.int32), 0, 255).astype(np.uint8)
+
+    # Perceptual spaces. The batch methods return unrounded float64 arrays;
+    # the scalar methods run the same kernels and round for display.
+    @staticmethod
+    def rgb_to_xyz_array(rgb):
+        x, y, z = _mat(RGB_TO_XYZ, *_linear_rgb(rgb))
+        return np.stack((x * 100.0, y * 100.0, z * 100.0), axis=-1)
+
+    @staticmethod
+    def xyz_to_rgb_array(xyz):
+        x, y, z = _channels(xyz)
+        return _encode_rgb(*_mat(XYZ_TO_RGB, x / 100.0, y / 100.0, z / 100.0))
+
+    @staticmethod
+    def rgb_to_lab_array(rgb):
+        xyz = ColorConverter.rgb_to_xyz_array(rgb)
+        return np.stack(_np_xyz_to_lab(xyz[..., 0], xyz[..., 1], xyz[..., 2]), axis=-1)
+
+    @staticmethod
+    def lab_to_rgb_array(lab):
+        return ColorConverter.xyz_to_rgb_array(np.stack(_np_lab_to_xyz(*_channels(lab)), axis=-1))
+
+    @staticmethod
+    def rgb_to_lch_array(rgb):
+        lab = ColorConverter.rgb_to_lab_array(rgb)
+        return np.stack(_np_lab_to_lch(lab[..., 0], lab[..., 1], lab[..., 2]), axis=-1)
+
+    @staticmethod
+    def lch_to_rgb_array(lch):
+        return ColorConverter.lab_to_rgb_array(np.stack(_np_lch_to_lab(*_channels(lch)), axis=-1))
+
+    @staticmethod
+    def rgb_to_oklab_array(rgb):
+        l, m, s = _mat(OKLAB_M1, *_linear_rgb(rgb))
+        return np.stack(_mat(OKLAB_M2, np.cbrt(l), np.cbrt(m), np.cbrt(s)), axis=-1)
+
+    @staticmethod
+    def oklab_to_rgb_array(oklab):
+        l, m, s = _mat(OKLAB_M2_INV, *_channels(oklab))
+        return _encode_rgb(*_mat(OKLAB_M1_INV, l ** 3, m ** 3, s ** 3))
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_xyz(r, g, b):
+        return _display(ColorConverter.rgb_to_xyz_array((r, g, b)), "xyz")
+
+    @staticmethod
+    def xyz_to_rgb(x, y, z):
+        return tuple(ColorConverter.xyz_to_rgb_array((x, y, z)).tolist())
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_lab(r, g, b):
+        return _display(ColorConverter.rgb_to_lab_array((r, g, b)), "lab")
+
+    @staticmethod
+    def lab_to_rgb(l, a, b):
+        return tuple(ColorConverter.lab_to_rgb_array((l, a, b)).tolist())
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_lch(r, g, b):
+        return _display(ColorConverter.rgb_to_lch_array((r, g, b)), "lch")
+
+    @staticmethod
+    def lch_to_rgb(l, c, h):
+        return tuple(ColorConverter.lch_to_rgb_array((l, c, h)).tolist())
+
+    @staticmethod
+    @_rgb_args
+    def rgb_to_oklab(r, g, b):
+        return _display(ColorConverter.rgb_to_oklab_array((r, g, b)), "oklab")
+
+    @staticmethod
+    def oklab_to_rgb(l, a, b):
+        return tuple(ColorConverter.oklab_to_rgb_array((l, a, b)).tolist())
+
+    @staticmethod
+    def harmony_hsv(h, s, v, scheme, steps=6):
+        if scheme == "complementary":
+            offsets = (0, 180)
+        elif scheme == "analogous":
+            offsets = (0, 30, -30)
+        elif scheme == "triadic":
+            offsets = (0, 120, 240)
+        elif scheme == "tetradic":
+            offsets = (0, 90, 180, 270)
+        elif scheme == "split_complementary":
+            offsets = (0, 150, 210)
+        elif scheme == "monochrome":
+            return [(h, s, round(100 * (i + 1) / steps)) for i in range(steps)]
+        elif scheme == "wheel":
+            offsets = tuple(360 * i / steps for i in range(steps))
+        else:
+            raise ValueError(f"unknown harmony scheme: {scheme}")
+        return [((h + offset) % 360, s, v) for offset in offsets]
+
+    @staticmethod
+    def harmony(r, g, b, scheme, steps=6):
+        # All swatches of a scheme are converted in a single batch call.
+        h, s, v = ColorConverter.rgb_to_hsv(r, g, b)
+        return ColorConverter.hsv_to_rgb_array(ColorConverter.harmony_hsv(h, s, v, scheme, steps))
@@ -0,0 +1,216 @@
+import argparse
+import csv
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from color_core import ColorConverter
+from color_cli import chunked
+from color_lut import unpack_rgb
+from color_parse import parse_colors_strict
+
+# Color difference (delta-E) in CIELAB. All functions broadcast, so the same
+# call handles one-to-one pairs, one reference against many colors, or an
+# (N, 1, 3) x (1, M, 3) block of a many-to-many matrix.
+METHODS = ("cie76", "cie94", "ciede2000")
+CIE94_WEIGHTS = {
+    "graphic_arts": (1.0, 0.045, 0.015),
+    "textiles": (2.0, 0.048, 0.014),
+}
+MATRIX_CHUNK = 1024
+
+def _split(lab):
+    lab = np.asarray(lab, dtype=np.float64)
+    return lab[..., 0], lab[..., 1], lab[..., 2]
+
+def cie76(lab1, lab2):
+    l1, a1, b1 = _split(lab1)
+    l2, a2, b2 = _split(lab2)
+    return np.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+def cie94(lab1, lab2, application="graphic_arts"):
+    # Not symmetric: lab1 is the reference whose chroma weights the result.
+    kl, k1, k2 = CIE94_WEIGHTS[application]
+    l1, a1, b1 = _split(lab1)
+    l2, a2, b2 = _split(lab2)
+    c1 = np.hypot(a1, b1)
+    c2 = np.hypot(a2, b2)
+    dl = l1 - l2
+    dc = c1 - c2
+    dh2 = np.maximum((a1 - a2) ** 2 + (b1 - b2) ** 2 - dc ** 2, 0.0)
+    sc = 1.0 + k1 * c1
+    sh = 1.0 + k2 * c1
+    return np.sqrt((dl / kl) ** 2 + (dc / sc) ** 2 + dh2 / sh ** 2)
+
+def ciede2000(lab1, lab2, kl=1.0, kc=1.0, kh=1.0):
+    l1, a1, b1 = _split(lab1)
+    l2, a2, b2 = _split(lab2)
+    c_bar = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2.0
+    c_bar7 = c_bar ** 7
+    g = 0.5 * (1.0 - np.sqrt(c_bar7 / (c_bar7 + 25.0 ** 7)))
+    a1p = (1.0 + g) * a1
+    a2p = (1.0 + g) * a2
+    c1p = np.hypot(a1p, b1)
+    c2p = np.hypot(a2p, b2)
+    h1p = np.where((a1p == 0) & (b1 == 0), 0.0, np.mod(np.degrees(np.arctan2(b1, a1p)), 360.0))
+    h2p = np.where((a2p == 0) & (b2 == 0), 0.0, np.mod(np.degrees(np.arctan2(b2, a2p)), 360.0))
+    chroma = c1p * c2p
+    dlp = l2 - l1
+    dcp = c2p - c1p
+    dhp = h2p - h1p
+    dhp = np.where(dhp > 180.0, dhp - 360.0, np.where(dhp < -180.0, dhp + 360.0, dhp))
+    dhp = np.where(chroma == 0, 0.0, dhp)
+    dhp_big = 2.0 * np.sqrt(chroma) * np.sin(np.radians(dhp / 2.0))
+    lp_bar = (l1 + l2) / 2.0
+    cp_bar = (c1p + c2p) / 2.0
+    h_sum = h1p + h2p
+    hp_bar = np.where(
+        chroma == 0, h_sum,
+        np.where(np.abs(h1p - h2p) <= 180.0, h_sum / 2.0,
+                 np.where(h_sum < 360.0, (h_sum + 360.0) / 2.0, (h_sum - 360.0) / 2.0))
+    )
+    t = (1.0 - 0.17 * np.cos(np.radians(hp_bar - 30.0)) + 0.24 * np.cos(np.radians(2.0 * hp_bar))
+         + 0.32 * np.cos(np.radians(3.0 * hp_bar + 6.0)) - 0.20 * np.cos(np.radians(4.0 * hp_bar - 63.0)))
+    d_theta = 30.0 * np.exp(-(((hp_bar - 275.0) / 25.0) ** 2))
+    cp_bar7 = cp_bar ** 7
+    rc = 2.0 * np.sqrt(cp_bar7 / (cp_bar7 + 25.0 ** 7))
+    sl = 1.0 + 0.015 * (lp_bar - 50.0) ** 2 / np.sqrt(20.0 + (lp_bar - 50.0) ** 2)
+    sc = 1.0 + 0.045 * cp_bar
+    sh = 1.0 + 0.015 * cp_bar * t
+    rt = -np.sin(np.radians(2.0 * d_theta)) * rc
+    tl = dlp / (kl * sl)
+    tc = dcp / (kc * sc)
+    th = dhp_big / (kh * sh)
+    return np.sqrt(tl ** 2 + tc ** 2 + th ** 2 + rt * tc * th)
+
+def delta_e_lab(lab1, lab2, method="ciede2000"):
+    if method == "cie76":
+        return cie76(lab1, lab2)
+    if method == "cie94":
+        return cie94(lab1, lab2)
+    if method == "ciede2000":
+        return ciede2000(lab1, lab2)
+    raise ValueError(f"unknown delta-E method: {method}")
+
+def delta_e(rgb1, rgb2, method="ciede2000"):
+    return delta_e_lab(ColorConverter.rgb_to_lab_array(rgb1), ColorConverter.rgb_to_lab_array(rgb2), method)
+
+def _matrix_block(lab_rows, lab_cols, method):
+    return delta_e_lab(lab_rows[:, None, :], lab_cols[None, :, :], method)
+
+def iter_delta_e_matrix(rgb_a, rgb_b, method="ciede2000", chunk=MATRIX_CHUNK, workers=1):
+    # Yields (row_start, block) for the N x M matrix of differences between
+    # the colors of rgb_a and rgb_b, computed chunk rows at a time. At most
+    # 2 * workers blocks are alive, so callers can reduce or write the
+    # result without ever holding the full matrix.
+    lab_a = ColorConverter.rgb_to_lab_array(np.asarray(rgb_a).reshape(-1, 3))
+    lab_b = ColorConverter.rgb_to_lab_array(np.asarray(rgb_b).reshape(-1, 3))
+    starts = range(0, len(lab_a), chunk)
+    if workers <= 1:
+        for start in starts:
+            yield start, _matrix_block(lab_a[start:start + chunk], lab_b, method)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start in starts:
+            pending.append((start, pool.submit(_matrix_block, lab_a[start:start + chunk], lab_b, method)))
+            if len(pending) >= workers * 2:
+                row, future = pending.popleft()
+                yield row, future.result()
+        while pending:
+            row, future = pending.popleft()
+            yield row, future.result()
+
+def delta_e_matrix(rgb_a, rgb_b, method="ciede2000", chunk=MATRIX_CHUNK, workers=1, out=None):
+    # `out` may be a preallocated array or np.memmap of shape (N, M).
+    n = int(np.prod(np.asarray(rgb_a).shape[:-1]))
+    m = int(np.prod(np.asarray(rgb_b).shape[:-1]))
+    if out is None:
+        out = np.empty((n, m), dtype=np.float64)
+    for start, block in iter_delta_e_matrix(rgb_a, rgb_b, method, chunk, workers):
+        out[start:start + len(block)] = block
+    return out
+
+def _pairs_task(rows, method, offset=0):
+    expected = unpack_rgb(parse_colors_strict([a for a, _ in rows], "pair", offset + 1))
+    actual = unpack_rgb(parse_colors_strict([b for _, b in rows], "pair", offset + 1))
+    return delta_e(expected, actual, method)
+
+def iter_pair_deltas(rows, method="ciede2000", chunk=65536, workers=1):
+    chunks = chunked(rows, chunk)
+    offset = 0
+    if workers <= 1:
+        for block in chunks:
+            yield _pairs_task(block, method, offset)
+            offset += len(block)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for block in chunks:
+            pending.append(pool.submit(_pairs_task, block, method, offset))
+            offset += len(block)
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def split_pair(text):
+    # The pair separator is the first comma outside parentheses, so
+    # red,rgb(250, 0, 0) needs no quoting.
+    depth = 0
+    for i, c in enumerate(text):
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "," and depth == 0:
+            return [text[:i].strip(), text[i + 1:].strip()]
+    return [text]
+
+def read_pairs(stream):
+    for row in csv.reader(stream):
+        if not row:
+            continue
+        if len(row) != 2:
+            row = split_pair(",".join(row))
+        if len(row) != 2:
+            raise ValueError(f"expected 'expected,actual' color pairs, got {row!r}")
+        yield row[0], row[1]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_delta", description="Compute CIE76, CIE94 or CIEDE2000 color differences.")
+    parser.add_argument("colors", nargs="*", help="two CSS colors to compare (default: read 'a,b' pairs from --pairs)")
+    parser.add_argument("--pairs", help="CSV file of 'expected,actual' color pairs ('-' for stdin)")
+    parser.add_argument("--method", choices=METHODS, default="ciede2000", help="formula (default: ciede2000)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per core)")
+    parser.add_argument("--threshold", type=float, help="only report the summary and the count above this delta-E")
+    args = parser.parse_args(argv)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    try:
+        if not args.pairs:
+            if len(args.colors) != 2:
+                parser.error("give two colors or --pairs")
+            value = delta_e(*unpack_rgb(parse_colors_strict(args.colors, "color")), args.method)
+            print(f"{float(value):.4f}")
+            return 0
+        stream = sys.stdin if args.pairs == "-" else open(args.pairs, newline="", encoding="utf-8")
+        count, total, worst, above = 0, 0.0, 0.0, 0
+        with stream:
+            for values in iter_pair_deltas(read_pairs(stream), args.method, workers=workers):
+                count += len(values)
+                total += float(values.sum())
+                worst = max(worst, float(values.max()))
+                if args.threshold is not None:
+                    above += int((values > args.threshold).sum())
+                else:
+                    sys.stdout.write("".join(f"{v:.4f}\n" for v in values.tolist()))
+    except (ValueError, OSError) as e:
+        print(f"color_delta: error: {e}", file=sys.stderr)
+        return 1
+    if args.threshold is not None:
+        print(f"pairs={count} mean={total / max(count, 1):.4f} max={worst:.4f} above_{args.threshold:g}={above}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+import argparse
+import csv
+import json
+import sys
+import numpy as np
+from color_core import ColorConverter
+from color_cli import chunked
+from color_delta import ciede2000
+from color_lut import unpack_rgb
+from color_parse import parse_colors_strict
+
+# Gamut checking and mapping for print. A gamut is a closed triangle mesh in
+# CIELAB, star-shaped around its center: either a polytope given by its eight
+# corner colors (paper, C, M, Y, R, G, B, black) or explicit faces, or a
+# boundary built from measured samples with the segment-maxima method. Rays
+# are cast against every triangle at once, so checks and mapping run on whole
+# arrays; GamutGrid samples both over the RGB cube for fast batch lookups.
+METHODS = ("perceptual", "clip")
+CORNERS = ("white", "cyan", "magenta", "yellow", "red", "green", "blue", "black")
+# Cube topology of the corners in CMY order: each face is a quad of corner
+# names, split into two triangles.
+CORNER_FACES = (
+    ("white", "magenta", "red", "yellow"), ("cyan", "blue", "black", "green"),
+    ("white", "cyan", "green", "yellow"), ("magenta", "blue", "black", "red"),
+    ("white", "cyan", "blue", "magenta"), ("yellow", "green", "black", "red"),
+)
+# Solids of a typical coated offset press (approximate; load measured data
+# for real checks).
+PRESS_CORNERS = {
+    "white": (95.0, 0.0, -2.0), "cyan": (55.0, -37.0, -50.0), "magenta": (48.0, 74.0, -3.0),
+    "yellow": (89.0, -5.0, 93.0), "red": (47.0, 68.0, 48.0), "green": (50.0, -65.0, 27.0),
+    "blue": (24.0, 22.0, -46.0), "black": (10.0, 0.0, 0.0),
+}
+# Perceptual mapping leaves colors closer than KNEE of the way to the
+# boundary alone and compresses the rest smoothly into the remaining band.
+KNEE = 0.8
+# Perceptual focal points sit this far from the color's own lightness toward
+# the gamut center: light and dark colors then trade some lightness for
+# chroma (lowest mean CIEDE2000 over random sRGB colors against the press
+# gamut).
+LIGHTNESS_PULL = 0.5
+RAY_BLOCK = 1 << 20
+GRID_CHUNK = 1 << 18
+
+def _unit(v):
+    norm = np.linalg.norm(v, axis=-1, keepdims=True)
+    return v / np.where(norm == 0, 1.0, norm), norm[..., 0]
+
+class Gamut:
+    def __init__(self, vertices, faces, name="gamut"):
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        self.faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+        if len(self.faces) < 4 or self.faces.min() < 0 or self.faces.max() >= len(self.vertices):
+            raise ValueError(f"{name}: a gamut needs at least 4 faces over its vertices")
+        self.name = name
+        v0, v1, v2 = (self.vertices[self.faces[:, i]] for i in range(3))
+        self.v0, self.e1, self.e2 = v0, v1 - v0, v2 - v0
+        self.center = self.vertices.mean(axis=0)
+        # The neutral axis runs from the darkest to the lightest vertex.
+        self.black = self.vertices[self.vertices[:, 0].argmin()]
+        self.white = self.vertices[self.vertices[:, 0].argmax()]
+
+    @classmethod
+    def from_corners(cls, corners, name="polytope"):
+        missing = [c for c in CORNERS if c not in corners]
+        if missing:
+            raise ValueError(f"{name}: missing corner colors: {', '.join(missing)}")
+        vertices = [corners[c] for c in CORNERS]
+        faces = []
+        for quad in CORNER_FACES:
+            a, b, c, d = (CORNERS.index(n) for n in quad)
+            faces += [(a, b, c), (a, c, d)]
+        return cls(vertices, faces, name)
+
+    @classmethod
+    def from_samples(cls, lab, elevations=16, azimuths=32, name="samples"):
+        # Segment maxima: the farthest sample from the centroid in each
+        # (elevation, azimuth) sector gives the boundary radius there.
+        lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+        if len(lab) < 8:
+            raise ValueError(f"{name}: need at least 8 samples, got {len(lab)}")
+        center = lab.mean(axis=0)
+        direction, radius = _unit(lab - center)
+        elevation = np.arcsin(np.clip(direction[:, 0], -1.0, 1.0))
+        azimuth = np.mod(np.arctan2(direction[:, 2], direction[:, 1]), 2 * np.pi)
+        row = np.clip(((elevation + np.pi / 2) / np.pi * elevations).astype(np.int64), 0, elevations - 1)
+        col = np.clip((azimuth / (2 * np.pi) * azimuths).astype(np.int64), 0, azimuths - 1)
+        radii = np.zeros((elevations, azimuths))
+        np.maximum.at(radii, (row, col), radius)
+        # Sectors without samples take the mean of their filled neighbours.
+        while not radii.all():
+            filled = radii > 0
+            padded = np.pad(np.where(filled, radii, 0.0), ((1, 1), (0, 0)))
+            counts = np.pad(filled.astype(np.float64), ((1, 1), (0, 0)))
+            total = padded[:-2] + padded[2:] + np.roll(padded[1:-1], 1, 1) + np.roll(padded[1:-1], -1, 1)
+            n = counts[:-2] + counts[2:] + np.roll(counts[1:-1], 1, 1) + np.roll(counts[1:-1], -1, 1)
+            grow = ~filled & (n > 0)
+            radii[grow] = total[grow] / n[grow]
+        e = (np.arange(elevations) + 0.5) / elevations * np.pi - np.pi / 2
+        h = (np.arange(azimuths) + 0.5) / azimuths * 2 * np.pi
+        e, h = np.meshgrid(e, h, indexing="ij")
+        ring = np.stack([np.sin(e), np.cos(e) * np.cos(h), np.cos(e) * np.sin(h)], axis=-1)
+        vertices = (center + ring * radii[..., None]).reshape(-1, 3)
+        bottom = center + [lab[:, 0].min() - center[0], 0.0, 0.0]
+        top = center + [lab[:, 0].max() - center[0], 0.0, 0.0]
+        vertices = np.vstack([vertices, bottom, top])
+        ids = np.arange(elevations * azimuths).reshape(elevations, azimuths)
+        a, b = ids[:-1], np.roll(ids[:-1], -1, 1)
+        c, d = ids[1:], np.roll(ids[1:], -1, 1)
+        faces = [np.stack([a, b, d], -1), np.stack([a, d, c], -1),
+                 np.stack([np.full(azimuths, len(vertices) - 2), np.roll(ids[0], -1), ids[0]], -1),
+                 np.stack([np.full(azimuths, len(vertices) - 1), ids[-1], np.roll(ids[-1], -1)], -1)]
+        return cls(vertices, np.vstack([f.reshape(-1, 3) for f in faces]), name)
+
+    def boundary(self, origin, direction):
+        # Distance along each unit direction from origin to the first
+        # triangle it crosses (Moller-Trumbore against all faces at once).
+        origin = np.broadcast_to(np.asarray(origin, dtype=np.float64), np.shape(direction)).reshape(-1, 3)
+        direction = np.asarray(direction, dtype=np.float64).reshape(-1, 3)
+        out = np.empty(len(direction))
+        step = max(1, RAY_BLOCK // len(self.faces))
+        for start in range(0, len(direction), step):
+            o = origin[start:start + step, None, :]
+            d = direction[start:start + step, None, :]
+            p = np.cross(d, self.e2)
+            det = (self.e1 * p).sum(-1)
+            inv = 1.0 / np.where(np.abs(det) < 1e-12, np.nan, det)
+            t = o - self.v0
+            u = (t * p).sum(-1) * inv
+            q = np.cross(t, self.e1)
+            v = (d * q).sum(-1) * inv
+            dist = (self.e2 * q).sum(-1) * inv
+            hit = (u >= -1e-9) & (v >= -1e-9) & (u + v <= 1 + 1e-9) & (dist > 1e-9)
+            out[start:start + step] = np.where(hit, dist, np.inf).min(axis=1)
+        return out
+
+    def excess(self, lab):
+        # Distance from the center relative to the boundary in the same
+        # direction, minus one: <= 0 inside, 0.1 means 10% beyond the edge.
+        lab = np.asarray(lab, dtype=np.float64)
+        direction, radius = _unit(lab - self.center)
+        limit = self.boundary(self.center, direction.reshape(-1, 3)).reshape(radius.shape)
+        return radius / limit - 1.0
+
+    def contains(self, lab, tolerance=1e-6):
+        return self.excess(lab) <= tolerance
+
+    def map_lab(self, lab, method="perceptual", knee=KNEE):
+        # Hue-preserving: each color moves toward a focal point on the
+        # neutral axis. Perceptual also compresses lightness into the
+        # gamut's range and compresses smoothly past the knee, so gradations
+        # that leave the gamut stay distinct; clip moves at constant
+        # lightness onto the boundary and leaves in-gamut colors untouched.
+        if method not in METHODS:
+            raise ValueError(f"unknown mapping method: {method}")
+        lab = np.asarray(lab, dtype=np.float64)
+        shape = lab.shape
+        lab = lab.reshape(-1, 3).copy()
+        lo, hi = self.black[0], self.white[0]
+        focus = lab[:, 0]
+        if method == "perceptual":
+            lab[:, 0] = lo + np.clip(lab[:, 0], 0.0, 100.0) / 100.0 * (hi - lo)
+            focus = lab[:, 0] + LIGHTNESS_PULL * (self.center[0] - lab[:, 0])
+        s = np.clip((focus - lo) / (hi - lo), 0.05, 0.95)
+        axis = self.black + s[:, None] * (self.white - self.black)
+        # Gray at the same lightness keeps hue angles exact; where the gray
+        # axis leaves the gamut the medium's own neutral axis is used.
+        focal = np.stack([axis[:, 0], np.zeros(len(axis)), np.zeros(len(axis))], axis=-1)
+        outside = self.excess(focal) > 0
+        focal[outside] = axis[outside]
+        direction, radius = _unit(lab - focal)
+        ratio = radius / self.boundary(focal, direction)
+        if method == "clip":
+            scale = np.minimum(ratio, 1.0)
+        else:
+            scale = np.where(ratio > knee, knee + (1 - knee) * np.tanh((ratio - knee) / (1 - knee)), ratio)
+        safe = np.where(ratio == 0, 1.0, ratio)
+        mapped = focal + (lab - focal) * (scale / safe)[:, None]
+        return mapped.reshape(shape)
+
+    def check_rgb(self, rgb, tolerance=1e-6):
+        return self.contains(ColorConverter.rgb_to_lab_array(rgb), tolerance)
+
+    def map_rgb(self, rgb, method="perceptual"):
+        return ColorConverter.lab_to_rgb_array(self.map_lab(ColorConverter.rgb_to_lab_array(rgb), method))
+
+class GamutGrid:
+    # Excess and mapped CIELAB sampled on a size^3 grid over the RGB cube;
+    # lookups interpolate trilinearly instead of casting rays.
+    def __init__(self, gamut, size=33, method="perceptual"):
+        self.gamut = gamut
+        self.size = size
+        self.method = method
+        axis = np.linspace(0.0, 255.0, size)
+        rgb = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), axis=-1).reshape(-1, 3)
+        lab = ColorConverter.rgb_to_lab_array(rgb)
+        self.excess_flat = gamut.excess(lab)
+        self.mapped_flat = gamut.map_lab(lab, method)
+
+    def lookup(self, rgb):
+        # Returns (excess, mapped lab) for an (..., 3) array of RGB values.
+        rgb = np.asarray(rgb, dtype=np.float64)
+        shape = rgb.shape[:-1]
+        flat = np.clip(rgb.reshape(-1, 3), 0, 255)
+        excess = np.empty(len(flat))
+        mapped = np.empty((len(flat), 3))
+        for start in range(0, len(flat), GRID_CHUNK):
+            pos = flat[start:start + GRID_CHUNK] / 255.0 * (self.size - 1)
+            i = np.minimum(pos.astype(np.int64), self.size - 2)
+            f = pos - i
+            base = (i[:, 0] * self.size + i[:, 1]) * self.size + i[:, 2]
+            e = np.zeros(len(pos))
+            m = np.zeros((len(pos), 3))
+            for corner in range(8):
+                dx, dy, dz = (corner >> 2) & 1, (corner >> 1) & 1, corner & 1
+                w = ((f[:, 0] if dx else 1 - f[:, 0]) * (f[:, 1] if dy else 1 - f[:, 1])
+                     * (f[:, 2] if dz else 1 - f[:, 2]))
+                idx = base + (dx * self.size + dy) * self.size + dz
+                e += w * self.excess_flat[idx]
+                m += w[:, None] * self.mapped_flat[idx]
+            excess[start:start + len(pos)] = e
+            mapped[start:start + len(pos)] = m
+        return excess.reshape(shape), mapped.reshape(shape + (3,))
+
+    def check_rgb(self, rgb, tolerance=1e-6):
+        return self.lookup(rgb)[0] <= tolerance
+
+    def map_rgb(self, rgb):
+        return ColorConverter.lab_to_rgb_array(self.lookup(rgb)[1])
+
+def press_gamut():
+    return Gamut.from_corners(PRESS_CORNERS, "coated offset (approximate)")
+
+def read_samples(stream):
+    # CGATS measurement data (LAB_L/LAB_A/LAB_B fields between BEGIN_DATA
+    # and END_DATA) or CSV with L, a and b columns.
+    text = stream.read()
+    lines = [line.strip() for line in text.splitlines()]
+    if "BEGIN_DATA" in lines:
+        fields = lines[lines.index("BEGIN_DATA_FORMAT") + 1:lines.index("END_DATA_FORMAT")]
+        fields = " ".join(fields).split()
+        rows = [line.split() for line in lines[lines.index("BEGIN_DATA") + 1:lines.index("END_DATA")] if line]
+    else:
+        rows = [row for row in csv.reader(lines) if row and not row[0].startswith("#")]
+        fields, rows = [c.strip() for c in rows[0]], rows[1:]
+    names = [f.upper().replace("LAB_", "") for f in fields]
+    try:
+        cols = [names.index(c) for c in ("L", "A", "B")]
+    except ValueError:
+        raise ValueError(f"no L, a, b columns in {fields!r}") from None
+    return np.array([[float(row[c]) for c in cols] for row in rows], dtype=np.float64)
+
+def load_gamut(path):
+    # .json files describe a polytope, {"corners": {...}} or
+    # {"vertices": [...], "faces": [...]}; anything else is sampled data.
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            name = data.get("name", path)
+            if "corners" in data:
+                return Gamut.from_corners(data["corners"], name)
+            return Gamut(data["vertices"], data["faces"], name)
+        return Gamut.from_samples(read_samples(f), name=path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_gamut", description="Check colors against a print gamut and map them inside.")
+    parser.add_argument("colors", nargs="*", help="CSS colors to check (default: read from stdin)")
+    parser.add_argument("--gamut", help="polytope (.json) or measured samples (CGATS .txt or CSV with L,a,b); "
+                                        "default: approximate coated offset press")
+    parser.add_argument("--method", choices=METHODS, default="perceptual", help="mapping method (default: perceptual)")
+    parser.add_argument("--grid", type=int, default=0, help="look colors up in a precomputed grid of this size (e.g. 33)")
+    parser.add_argument("--out-only", action="store_true", help="only print out-of-gamut colors")
+    parser.add_argument("--chunk-size", type=int, default=65536, help="colors per batch (default: 65536)")
+    args = parser.parse_args(argv)
+    try:
+        gamut = load_gamut(args.gamut) if args.gamut else press_gamut()
+        grid = GamutGrid(gamut, args.grid, args.method) if args.grid else None
+        values = args.colors or (line.strip() for line in sys.stdin if line.strip())
+        count = outside = 0
+        for chunk in chunked(values, args.chunk_size):
+            rgb = unpack_rgb(parse_colors_strict(chunk, "color", count + 1))
+            lab = ColorConverter.rgb_to_lab_array(rgb)
+            if grid is not None:
+                excess, mapped = grid.lookup(rgb)
+            else:
+                excess, mapped = gamut.excess(lab), gamut.map_lab(lab, args.method)
+            mapped_rgb = ColorConverter.lab_to_rgb_array(mapped)
+            delta = ciede2000(lab, mapped)
+            out = excess > 1e-6
+            count += len(chunk)
+            outside += int(out.sum())
+            lines = []
+            for value, o, d, m in zip(chunk, out.tolist(), delta.tolist(), mapped_rgb.tolist()):
+                if o or not args.out_only:
+                    cmyk = ColorConverter.rgb_to_cmyk(*m)
+                    lines.append(f"{value}  {'out' if o else 'in'}  {ColorConverter.rgb_to_hex(*m)}  "
+                                 f"CMYK{cmyk}  ΔE00 {d:.2f}\n")
+            sys.stdout.write("".join(lines))
+    except (ValueError, OSError, KeyError) as e:
+        print(f"color_gamut: error: {e}", file=sys.stderr)
+        return 1
+    print(f"colors={count} out_of_gamut={outside}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
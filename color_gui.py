@@ -0,0 +1,1800 @@
+import os
+import sys
+import time
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QLabel, QLineEdit, QPushButton, QComboBox,
+    QTabWidget, QGroupBox, QSpinBox, QGridLayout, QFrame,
+    QSlider, QFormLayout, QFileDialog, QMessageBox, QStyle, QSizePolicy, QCheckBox
+)
+from PyQt6.QtGui import (
+    QPalette, QColor, QLinearGradient, QBrush, QIcon, QFont, QPixmap,
+    QPainter, QGuiApplication, QShortcut, QKeySequence, QImage, QPainterPath, QPen
+)
+from PyQt6.QtCore import (
+    Qt, pyqtSignal, QPoint, QPointF, QRect, QRectF, QObject, QTimer, QThread, QMutex, QWaitCondition, QEvent
+)
+from collections import OrderedDict
+from color_core import HARMONY_SCHEMES
+from color_cache import cached_converter
+from color_composite import composite_grid
+from color_pack import Color
+from color_parse import parse_color
+from color_probe import ENABLED as PROBES_ENABLED, TRACE_FILE, probe, probe_class, profiler
+from color_ramp import SPACES as RAMP_SPACES, export_ramp, ramp, to_uint8 as ramp_to_uint8
+
+# Every widget converts the same current color, so the GUI shares one cache.
+ColorConverter = probe_class(cached_converter(1024), "ColorConverter")
+# Backdrops the current color is previewed on, light to dark.
+BACKDROPS = ((255, 255, 255), (128, 128, 128), (0, 0, 0))
+
+class TextureCache:
+    # Static gradient images (hue spectrum, saturation/value fields, alpha
+    # checkerboard). None of them depend on the theme, so palette changes and
+    # re-polishing reuse them; each is rendered once per device pixel ratio
+    # and kept in a small LRU.
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.renders = 0
+
+    def get(self, key, width, height, dpr, render):
+        key = key + (width, height, round(dpr, 2))
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.entries.move_to_end(key)
+            return pixmap
+        pixmap = QPixmap(max(1, round(width * dpr)), max(1, round(height * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(QColor(0, 0, 0, 0))
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        render(painter, width, height)
+        painter.end()
+        self.renders += 1
+        self.entries[key] = pixmap
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return pixmap
+
+    def clear(self):
+        self.entries.clear()
+
+    def hue_spectrum(self, dpr=1.0):
+        # One pixel per degree; it only varies along x, so callers stretch it
+        # to any size and resizing never renders it again.
+        def render(painter, w, h):
+            gradient = QLinearGradient(0, 0, w, 0)
+            for hue in range(0, 361, 30):
+                gradient.setColorAt(hue / 360.0, QColor.fromHsv(hue % 360, 255, 255))
+            painter.fillRect(QRectF(0, 0, w, h), QBrush(gradient))
+        return self.get(("hue",), 360, 1, dpr, render)
+
+    def sv_field(self, hue, size, dpr=1.0):
+        # One field per integer hue bucket.
+        hue = int(hue) % 360
+
+        def render(painter, w, h):
+            gradient = QLinearGradient(0, 0, w, 0)
+            gradient.setColorAt(0, QColor("white"))
+            gradient.setColorAt(1, QColor.fromHsv(hue, 255, 255))
+            painter.fillRect(QRectF(0, 0, w, h), QBrush(gradient))
+            gradient2 = QLinearGradient(0, 0, 0, h)
+            gradient2.setColorAt(0, QColor(0, 0, 0, 0))
+            gradient2.setColorAt(1, QColor(0, 0, 0, 255))
+            painter.fillRect(QRectF(0, 0, w, h), QBrush(gradient2))
+        return self.get(("sv", hue), size, size, dpr, render)
+
+    def checkerboard(self, cell=8, dpr=1.0):
+        # A 2x2-cell tile, meant for QBrush so any area can be filled with it.
+        def render(painter, w, h):
+            painter.fillRect(QRectF(0, 0, w, h), QColor(255, 255, 255))
+            painter.fillRect(QRectF(0, 0, cell, cell), QColor(204, 204, 204))
+            painter.fillRect(QRectF(cell, cell, cell, cell), QColor(204, 204, 204))
+        return self.get(("checker",), cell * 2, cell * 2, dpr, render)
+
+textures = TextureCache()
+
+class PickerMarker(QWidget):
+    # Transparent overlay above the picker canvas; moving the marker only
+    # repaints the small rectangles around its old and new position.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.pos_x = None
+        self.pos_y = None
+        self.origin_y = 0
+
+    def marker_rect(self):
+        return QRect(self.pos_x - 13, self.pos_y + self.origin_y - 13, 26, 26)
+
+    def set_position(self, x, y):
+        if (x, y) == (self.pos_x, self.pos_y):
+            return
+        if self.pos_x is not None:
+            self.update(self.marker_rect())
+        self.pos_x, self.pos_y = x, y
+        self.update(self.marker_rect())
+
+    @probe()
+    def paintEvent(self, event):
+        if self.pos_x is None:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        x, y = self.pos_x, self.pos_y + self.origin_y
+        pen = painter.pen()
+        pen.setColor(QColor(255, 255, 255))
+        pen.setWidth(4)
+        painter.setPen(pen)
+        painter.drawEllipse(x - 10, y - 10, 20, 20)
+        pen.setColor(QColor(0, 0, 0))
+        pen.setWidth(2)
+        painter.setPen(pen)
+        painter.drawEllipse(x - 10, y - 10, 20, 20)
+        painter.end()
+
+class ColorSwatch(QWidget):
+    # Rounded color swatch painted directly, so changing its color is a
+    # repaint instead of a stylesheet parse and re-polish.
+    clicked = pyqtSignal()
+
+    def __init__(self, radius=24, border=5, border_color="#1a1a1a", parent=None):
+        super().__init__(parent)
+        self.radius = radius
+        self.border = border
+        self.border_color = QColor(border_color)
+        self.color = QColor(0, 0, 0)
+
+    def set_color(self, r, g, b, a=255):
+        if self.color.getRgb() == (r, g, b, a):
+            return
+        self.color = QColor(r, g, b, a)
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.clicked.emit()
+
+    @probe()
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        pen = painter.pen()
+        pen.setColor(self.border_color)
+        pen.setWidth(self.border)
+        painter.setPen(pen)
+        painter.setBrush(self.color)
+        half = self.border / 2.0
+        rect = QRectF(self.rect()).adjusted(half, half, -half, -half)
+        if self.color.alpha() < 255:
+            painter.save()
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QBrush(textures.checkerboard(8, self.devicePixelRatioF())))
+            painter.drawRoundedRect(rect, self.radius, self.radius)
+            painter.restore()
+        painter.drawRoundedRect(rect, self.radius, self.radius)
+        painter.end()
+
+class HueSlider(QSlider):
+    # Horizontal hue slider painted from the shared spectrum texture, so it
+    # has no stylesheet to re-polish when the theme changes.
+    HANDLE = 12
+
+    def __init__(self, parent=None):
+        super().__init__(Qt.Orientation.Horizontal, parent)
+        self.setMinimumHeight(2 * self.HANDLE + 6)
+        self.setRange(0, 360)
+
+    def groove_rect(self):
+        height = 12
+        return QRect(self.HANDLE, (self.height() - height) // 2, max(1, self.width() - 2 * self.HANDLE), height)
+
+    @probe()
+    def paintEvent(self, event):
+        groove = self.groove_rect()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(groove), 6, 6)
+        painter.save()
+        painter.setClipPath(path)
+        self.paint_groove(painter, QRectF(groove))
+        painter.restore()
+        span = max(1, self.maximum() - self.minimum())
+        x = groove.left() + (self.value() - self.minimum()) * groove.width() / span
+        painter.setPen(QPen(QColor("white"), 3))
+        painter.setBrush(QColor("#0055aa"))
+        painter.drawEllipse(QPointF(x, self.height() / 2.0), self.HANDLE - 2, self.HANDLE - 2)
+        painter.end()
+
+    def paint_groove(self, painter, rect):
+        spectrum = textures.hue_spectrum(self.devicePixelRatioF())
+        painter.drawPixmap(rect, spectrum, QRectF(spectrum.rect()))
+
+    def set_from_position(self, pos):
+        groove = self.groove_rect()
+        self.setValue(QStyle.sliderValueFromPosition(self.minimum(), self.maximum(), pos.x() - groove.left(), groove.width()))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.setSliderDown(True)
+            self.set_from_position(event.position().toPoint())
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.MouseButton.LeftButton:
+            self.set_from_position(event.position().toPoint())
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.setSliderDown(False)
+
+class AlphaSlider(HueSlider):
+    # Opacity 0-255, drawn as the current color fading out over the shared
+    # checkerboard texture.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setRange(0, 255)
+        self.color = QColor(255, 0, 0)
+
+    def set_color(self, r, g, b):
+        if self.color.getRgb()[:3] == (r, g, b):
+            return
+        self.color = QColor(r, g, b)
+        self.update()
+
+    def paint_groove(self, painter, rect):
+        painter.fillRect(rect, QBrush(textures.checkerboard(6, self.devicePixelRatioF())))
+        gradient = QLinearGradient(rect.topLeft(), rect.topRight())
+        clear = QColor(self.color)
+        clear.setAlpha(0)
+        gradient.setColorAt(0, clear)
+        gradient.setColorAt(1, self.color)
+        painter.fillRect(rect, QBrush(gradient))
+
+class ColorPickerWidget(QWidget):
+    colorChanged = pyqtSignal(int, int, int)
+    # Qt 6.6+; before that the texture follows the new ratio on the next
+    # update_canvas, whose key includes it.
+    DPR_CHANGE = getattr(QEvent.Type, "DevicePixelRatioChange", None)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(340, 340)
+        self.hue = 0
+        self.sat = 100
+        self.val = 100
+        self.updating = False  # Flag to prevent recursion
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 12, 12, 12)
+        self.canvas = QLabel()
+        self.canvas.setFixedSize(316, 316)
+        self.canvas.setStyleSheet("border: 4px solid #1a1a1a; border-radius: 20px; background: #f8f8f8;")
+        layout.addWidget(self.canvas)
+        self.marker = PickerMarker(self.canvas)
+        self.field_key = None
+        self.update_canvas()
+
+    @probe()
+    def field_pixmap(self, hue):
+        return textures.sv_field(hue, 316, self.devicePixelRatioF())
+
+    def event(self, event):
+        # Moving to a screen with another scale needs the matching texture.
+        if self.DPR_CHANGE is not None and event.type() == self.DPR_CHANGE:
+            self.field_key = None
+            self.update_canvas()
+        return super().event(event)
+
+    @probe()
+    def update_canvas(self):
+        key = (int(self.hue), self.devicePixelRatioF())
+        if self.field_key != key:
+            self.field_key = key
+            self.canvas.setPixmap(self.field_pixmap(self.hue))
+        rect = self.canvas.contentsRect()
+        self.marker.setGeometry(rect)
+        self.marker.origin_y = (rect.height() - 316) // 2
+        x = int((self.sat / 100.0) * 316)
+        y = int((1 - self.val / 100.0) * 316)
+        self.marker.set_position(x, y)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.pick_color(event.position().toPoint())
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.MouseButton.LeftButton:
+            self.pick_color(event.position().toPoint())
+
+    def pick_color(self, pos):
+        if not (12 <= pos.x() <= 304 and 12 <= pos.y() <= 304):
+            return
+        x = (pos.x() - 12) / 292.0
+        y = (pos.y() - 12) / 292.0
+        s = max(0, min(100, x * 100))
+        v = max(0, min(100, (1 - y) * 100))
+        r, g, b = ColorConverter.hsv_to_rgb(self.hue, s, v)
+        self.sat = s
+        self.val = v
+        self.update_canvas()
+        if not self.updating:
+            self.colorChanged.emit(r, g, b)
+
+    @probe()
+    def set_hsv(self, h, s, v):
+        if self.updating:
+            return
+        self.updating = True
+        self.hue = h % 360
+        self.sat = max(0, min(100, s))
+        self.val = max(0, min(100, v))
+        self.update_canvas()
+        r, g, b = ColorConverter.hsv_to_rgb(self.hue, self.sat, self.val)
+        self.colorChanged.emit(r, g, b)
+        self.updating = False
+
+class LanguageManager:
+    def __init__(self, app):
+        self.app = app
+        self.current_lang = "en"
+        self.translations = {
+            "en": {
+                "title": "Advanced Color Converter Pro",
+                "rgb": "RGB", "hex": "HEX", "hsv": "HSV", "hsl": "HSL", "cmyk": "CMYK", "yuv": "YUV",
+                "language": "Language", "theme": "Theme",
+                "light": "Light", "dark": "Dark", "system": "System", "red": "Red Theme", "blue": "Blue Theme",
+                "red_val": "Red", "green": "Green", "blue": "Blue", "hue": "Hue", "sat": "Saturation",
+                "val": "Value", "lightness": "Lightness", "cyan": "Cyan", "magenta": "Magenta",
+                "yellow": "Yellow", "black": "Black", "luminance": "Luminance", "copy": "Copy",
+                "input": "Input Values", "output": "Converted Outputs", "tools": "Color Tools",
+                "picker": "Color Picker", "harmony": "Color Harmony", "complementary": "Complementary",
+                "analogous": "Analogous", "triadic": "Triadic", "tetradic": "Tetradic",
+                "split_complementary": "Split Complementary", "monochrome": "Monochrome",
+                "wheel": "Hue Wheel", "steps": "Steps",
+                "palette": "Image Palette", "extract": "Extract from Image...",
+                "xyz": "XYZ", "lab": "Lab", "lch": "LCh", "oklab": "OKLab",
+                "nearest": "Nearest Named Color",
+                "difference": "Color Difference", "reference": "Reference", "use_current": "Use Current",
+                "save_trace": "Save Profile Trace",
+                "eyedropper": "Eyedropper", "pick_screen": "Pick from Screen", "load_image": "Load Image...", "average": "Average NxN",
+                "gamut": "Print Gamut", "in_gamut": "In gamut", "out_of_gamut": "Out of gamut", "load_gamut": "Load Gamut...", "alpha": "Alpha", "contrast": "Contrast", "white": "White", "fail": "Fail", "gradient": "Gradient...", "ramp": "Color Ramp", "end_color": "End Color", "uniform": "Even perceptual steps", "export": "Export..."
+            },
+            "fa": {
+                "title": "مبدل پیشرفته رنگ پرو",
+                "rgb": "آرجی‌بی", "hex": "هگز", "hsv": "اچ‌اس‌وی", "hsl": "اچ‌اس‌ال", "cmyk": "سی‌ام‌وای‌کی", "yuv": "وای‌یو‌وی",
+                "language": "زبان", "theme": "تم",
+                "light": "روشن", "dark": "تیره", "system": "سیستم", "red": "تم قرمز", "blue": "تم آبی",
+                "red_val": "قرمز", "green": "سبز", "blue": "آبی", "hue": "رنگ", "sat": "اشباع",
+                "val": "روشنایی", "lightness": "روشنی", "cyan": "فیروزه‌ای", "magenta": "ارغوانی",
+                "yellow": "زرد", "black": "سیاه", "luminance": "روشنایی", "copy": "کپی",
+                "input": "مقادیر ورودی", "output": "خروجی‌های تبدیل شده", "tools": "ابزارهای رنگ",
+                "picker": "انتخابگر رنگ", "harmony": "هارمونی رنگ", "complementary": "مکمل",
+                "analogous": "مشابه", "triadic": "سه‌گانه", "tetradic": "چهارگانه",
+                "split_complementary": "مکمل دوگانه", "monochrome": "تک‌رنگ",
+                "wheel": "چرخه رنگ", "steps": "گام‌ها",
+                "palette": "پالت تصویر", "extract": "استخراج از تصویر...",
+                "xyz": "XYZ", "lab": "Lab", "lch": "LCh", "oklab": "OKLab",
+                "nearest": "نزدیک‌ترین رنگ نام‌دار",
+                "difference": "اختلاف رنگ", "reference": "مرجع", "use_current": "استفاده از رنگ فعلی",
+                "save_trace": "ذخیره ردپای پروفایل",
+                "eyedropper": "قطره‌چکان", "pick_screen": "انتخاب از صفحه", "load_image": "بارگذاری تصویر...", "average": "میانگین NxN",
+                "gamut": "گستره چاپ", "in_gamut": "داخل گستره", "out_of_gamut": "خارج از گستره", "load_gamut": "بارگذاری گستره...", "alpha": "شفافیت", "contrast": "کنتراست", "white": "سفید", "fail": "ناموفق", "gradient": "گرادیان...", "ramp": "طیف رنگ", "end_color": "رنگ پایانی", "uniform": "گام‌های ادراکی یکنواخت", "export": "خروجی..."
+            },
+            "zh": {
+                "title": "高级颜色转换器专业版",
+                "rgb": "红绿蓝", "hex": "十六进制", "hsv": "色相饱和度明度", "hsl": "色相饱和度亮度", "cmyk": "青品黄黑", "yuv": "亮度色度",
+                "language": "语言", "theme": "主题",
+                "light": "明亮", "dark": "暗黑", "system": "系统", "red": "红色主题", "blue": "蓝色主题",
+                "red_val": "红", "green": "绿", "blue": "蓝", "hue": "色相", "sat": "饱和度",
+                "val": "明度", "lightness": "亮度", "cyan": "青", "magenta": "品红",
+                "yellow": "黄", "black": "黑", "luminance": "亮度", "copy": "复制",
+                "input": "输入值", "output": "转换输出", "tools": "颜色工具",
+                "picker": "颜色选择器", "harmony": "颜色和谐", "complementary": "互补色",
+                "analogous": "类似色", "triadic": "三色调", "tetradic": "四色调",
+                "split_complementary": "分裂互补色", "monochrome": "单色",
+                "wheel": "色相环", "steps": "步数",
+                "palette": "图像调色板", "extract": "从图像提取...",
+                "xyz": "XYZ", "lab": "Lab", "lch": "LCh", "oklab": "OKLab",
+                "nearest": "最接近的命名颜色",
+                "difference": "色差", "reference": "参考色", "use_current": "使用当前颜色",
+                "save_trace": "保存性能跟踪",
+                "eyedropper": "取色器", "pick_screen": "从屏幕取色", "load_image": "加载图像...", "average": "NxN 平均",
+                "gamut": "印刷色域", "in_gamut": "在色域内", "out_of_gamut": "超出色域", "load_gamut": "加载色域...", "alpha": "不透明度", "contrast": "对比度", "white": "白色", "fail": "不合格", "gradient": "渐变...", "ramp": "色带", "end_color": "结束颜色", "uniform": "感知均匀步长", "export": "导出..."
+            },
+            "ru": {
+                "title": "Продвинутый конвертер цветов Про",
+                "rgb": "Красный Зеленый Синий", "hex": "HEX", "hsv": "Оттенок Насыщенность Яркость", "hsl": "Оттенок Насыщенность Светлота", "cmyk": "Голубой Пурпурный Желтый Черный", "yuv": "Яркость Цветность",
+                "language": "Язык", "theme": "Тема",
+                "light": "Светлая", "dark": "Темная", "system": "Системная", "red": "Красная тема", "blue": "Синяя тема",
+                "red_val": "Красный", "green": "Зеленый", "blue": "Синий", "hue": "Оттенок", "sat": "Насыщенность",
+                "val": "Яркость", "lightness": "Светлота", "cyan": "Голубой", "magenta": "Пурпурный",
+                "yellow": "Желтый", "black": "Черный", "luminance": "Яркость", "copy": "Копировать",
+                "input": "Входные значения", "output": "Преобразованные выходы", "tools": "Инструменты цвета",
+                "picker": "Пипетка цвета", "harmony": "Гармония цветов", "complementary": "Дополнительный",
+                "analogous": "Аналогичный", "triadic": "Триадный", "tetradic": "Тетрадный",
+                "split_complementary": "Раздельно-дополнительный", "monochrome": "Монохромный",
+                "wheel": "Цветовой круг", "steps": "Шаги",
+                "palette": "Палитра изображения", "extract": "Извлечь из изображения...",
+                "xyz": "XYZ", "lab": "Lab", "lch": "LCh", "oklab": "OKLab",
+                "nearest": "Ближайший именованный цвет",
+                "difference": "Цветовое различие", "reference": "Эталон", "use_current": "Взять текущий",
+                "save_trace": "Сохранить трассировку профиля",
+                "eyedropper": "Пипетка", "pick_screen": "Взять с экрана", "load_image": "Загрузить изображение...", "average": "Усреднение NxN",
+                "gamut": "Печатный охват", "in_gamut": "В охвате", "out_of_gamut": "Вне охвата", "load_gamut": "Загрузить охват...", "alpha": "Непрозрачность", "contrast": "Контраст", "white": "Белый", "fail": "Не проходит", "gradient": "Градиент...", "ramp": "Цветовая шкала", "end_color": "Конечный цвет", "uniform": "Равномерные перцептивные шаги", "export": "Экспорт..."
+            }
+        }
+
+    def tr(self, key):
+        return self.translations.get(self.current_lang, self.translations["en"]).get(key, key)
+
+    def set_language(self, lang):
+        self.current_lang = lang
+        self.app.retranslateUi()
+
+class ThemeManager:
+    @staticmethod
+    def apply_theme(app, theme_name):
+        palette = QPalette()
+        if theme_name == "light":
+            palette.setColor(QPalette.ColorRole.Window, QColor(248, 248, 252))
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(20, 20, 35))
+            palette.setColor(QPalette.ColorRole.Base, QColor(255, 255, 255))
+            palette.setColor(QPalette.ColorRole.Text, QColor(20, 20, 35))
+            palette.setColor(QPalette.ColorRole.Button, QColor(235, 235, 245))
+            palette.setColor(QPalette.ColorRole.ButtonText, QColor(20, 20, 35))
+            palette.setColor(QPalette.ColorRole.Highlight, QColor(0, 122, 255))
+            palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
+        elif theme_name == "dark":
+            palette.setColor(QPalette.ColorRole.Window, QColor(25, 25, 35))
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(240, 240, 245))
+            palette.setColor(QPalette.ColorRole.Base, QColor(38, 38, 50))
+            palette.setColor(QPalette.ColorRole.Text, QColor(240, 240, 245))
+            palette.setColor(QPalette.ColorRole.Button, QColor(52, 52, 70))
+            palette.setColor(QPalette.ColorRole.ButtonText, QColor(240, 240, 245))
+            palette.setColor(QPalette.ColorRole.Highlight, QColor(80, 140, 255))
+            palette.setColor(QPalette.ColorRole.HighlightedText, QColor(255, 255, 255))
+        elif theme_name == "red":
+            palette.setColor(QPalette.ColorRole.Window, QColor(40, 15, 20))
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(255, 170, 170))
+            palette.setColor(QPalette.ColorRole.Base, QColor(60, 25, 30))
+            palette.setColor(QPalette.ColorRole.Text, QColor(255, 170, 170))
+            palette.setColor(QPalette.ColorRole.Button, QColor(80, 35, 40))
+            palette.setColor(QPalette.ColorRole.ButtonText, QColor(255, 190, 190))
+            palette.setColor(QPalette.ColorRole.Highlight, QColor(200, 50, 50))
+        elif theme_name == "blue":
+            palette.setColor(QPalette.ColorRole.Window, QColor(15, 25, 45))
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(180, 210, 255))
+            palette.setColor(QPalette.ColorRole.Base, QColor(25, 35, 65))
+            palette.setColor(QPalette.ColorRole.Text, QColor(180, 210, 255))
+            palette.setColor(QPalette.ColorRole.Button, QColor(35, 45, 85))
+            palette.setColor(QPalette.ColorRole.ButtonText, QColor(200, 220, 255))
+            palette.setColor(QPalette.ColorRole.Highlight, QColor(70, 130, 220))
+        else:
+            palette = app.style().standardPalette()
+        app.setPalette(palette)
+
+class ColorInputWidget(QGroupBox):
+    valueChanged = pyqtSignal(int, int, int)
+
+    def __init__(self, title, lang_manager, parent=None):
+        super().__init__(title, parent)
+        self.lang_manager = lang_manager
+        self.updating = False
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QGridLayout(self)
+        layout.setSpacing(10)
+        self.inputs = []
+        labels = [self.lang_manager.tr("red_val"), self.lang_manager.tr("green"), self.lang_manager.tr("blue")]
+        for i, label in enumerate(labels):
+            lbl = QLabel(label + ":")
+            lbl.setStyleSheet("color: #0055aa; font-weight: bold; font-size: 13px;")
+            spin = QSpinBox()
+            spin.setRange(0, 255)
+            spin.setFixedHeight(42)
+            spin.setStyleSheet("QSpinBox { padding: 10px; font-size: 15px; border-radius: 10px; }")
+            spin.valueChanged.connect(self.on_value_changed)
+            self.inputs.append(spin)
+            layout.addWidget(lbl, 0, i * 2)
+            layout.addWidget(spin, 0, i * 2 + 1)
+        self.copy_btn = QPushButton(self.lang_manager.tr("copy"))
+        self.copy_btn.setFixedHeight(42)
+        self.copy_btn.setStyleSheet("QPushButton { font-weight: bold; }")
+        self.copy_btn.clicked.connect(self.copy_values)
+        layout.addWidget(self.copy_btn, 0, 6, 1, 2)
+
+    def on_value_changed(self):
+        if self.updating:
+            return
+        r = self.inputs[0].value()
+        g = self.inputs[1].value()
+        b = self.inputs[2].value()
+        self.valueChanged.emit(r, g, b)
+
+    def set_values(self, r, g, b):
+        if self.updating:
+            return
+        self.updating = True
+        r, g, b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+        self.inputs[0].blockSignals(True)
+        self.inputs[1].blockSignals(True)
+        self.inputs[2].blockSignals(True)
+        self.inputs[0].setValue(r)
+        self.inputs[1].setValue(g)
+        self.inputs[2].setValue(b)
+        self.inputs[0].blockSignals(False)
+        self.inputs[1].blockSignals(False)
+        self.inputs[2].blockSignals(False)
+        self.updating = False
+
+    def copy_values(self):
+        text = f"RGB({self.inputs[0].value()}, {self.inputs[1].value()}, {self.inputs[2].value()})"
+        QApplication.clipboard().setText(text)
+
+class HarmonyPanel(QWidget):
+    # Non-modal harmony window. Swatch widgets are created once and reused;
+    # while visible it follows the current color of the main window.
+    COLUMNS = 6
+
+    def __init__(self, lang_manager, parent=None):
+        super().__init__(parent, Qt.WindowType.Tool)
+        self.lang_manager = lang_manager
+        self.scheme = HARMONY_SCHEMES[0]
+        self.rgb = (255, 0, 0)
+        self.swatches = []
+        self.setStyleSheet("HarmonyPanel { background: #f5f5f5; }")
+        layout = QVBoxLayout(self)
+        layout.setSpacing(18)
+        layout.setContentsMargins(24, 24, 24, 24)
+
+        controls = QHBoxLayout()
+        self.steps_label = QLabel()
+        self.steps_spin = QSpinBox()
+        self.steps_spin.setRange(2, 12)
+        self.steps_spin.setValue(6)
+        self.steps_spin.valueChanged.connect(self.refresh)
+        controls.addWidget(self.steps_label)
+        controls.addWidget(self.steps_spin)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.swatch_layout = QGridLayout()
+        self.swatch_layout.setSpacing(18)
+        layout.addLayout(self.swatch_layout)
+        layout.addStretch()
+
+    def set_scheme(self, scheme):
+        self.scheme = scheme
+        self.refresh()
+
+    def set_color(self, r, g, b):
+        self.rgb = (r, g, b)
+        if self.isVisible():
+            self.refresh()
+
+    def swatch(self, index):
+        while len(self.swatches) <= index:
+            frame = ColorSwatch(radius=18, border=4, border_color="#333")
+            frame.setFixedSize(110, 110)
+            label = QLabel()
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            label.setStyleSheet("color: white; font-weight: bold; font-size: 12px; background: transparent; border: none;")
+            vbox = QVBoxLayout(frame)
+            vbox.addWidget(label)
+            i = len(self.swatches)
+            self.swatch_layout.addWidget(frame, i // self.COLUMNS, i % self.COLUMNS)
+            self.swatches.append((frame, label))
+        return self.swatches[index]
+
+    @probe()
+    def refresh(self):
+        colors = ColorConverter.harmony(*self.rgb, self.scheme, self.steps_spin.value()).tolist()
+        resized = len(colors) != sum(not frame.isHidden() for frame, _ in self.swatches)
+        for i, (cr, cg, cb) in enumerate(colors):
+            frame, label = self.swatch(i)
+            frame.set_color(cr, cg, cb)
+            text = f"RGB({cr},{cg},{cb})"
+            if label.text() != text:
+                label.setText(text)
+            frame.show()
+        for frame, _ in self.swatches[len(colors):]:
+            frame.hide()
+        if resized:
+            self.adjustSize()
+        self.steps_spin.setEnabled(self.scheme in ("monochrome", "wheel"))
+        self.retranslateUi()
+
+    def retranslateUi(self):
+        self.setWindowTitle(f"{self.lang_manager.tr('harmony')} - {self.lang_manager.tr(self.scheme)}")
+        self.steps_label.setText(self.lang_manager.tr("steps") + ":")
+
+class RampView(QWidget):
+    # The whole ramp is one 1-pixel-high image scaled to the widget, so any
+    # number of stops is a single paint; up to a few hundred entries show
+    # as discrete bands, longer ramps as a smooth gradient.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(480, 64)
+        self.image = QImage()
+
+    def set_colors(self, rgba):
+        self.image = QImage(rgba.tobytes(), len(rgba), 1, 4 * len(rgba), QImage.Format.Format_RGBA8888).copy()
+        self.update()
+
+    @probe()
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, self.image.width() > self.width() // 2)
+        rect = QRectF(self.rect())
+        painter.fillRect(rect, QBrush(textures.checkerboard(8, self.devicePixelRatioF())))
+        if not self.image.isNull():
+            painter.drawImage(rect, self.image, QRectF(self.image.rect()))
+        painter.end()
+
+class RampPanel(QWidget):
+    # Non-modal gradient window from the current color to an end color.
+    # Ramps come from color_ramp's cache, and only the preview image is
+    # replaced when a parameter changes.
+    def __init__(self, lang_manager, parent=None):
+        super().__init__(parent, Qt.WindowType.Tool)
+        self.lang_manager = lang_manager
+        self.start = Color(255, 0, 0)
+        self.colors = None
+        self.setStyleSheet("RampPanel { background: #f5f5f5; }")
+        layout = QVBoxLayout(self)
+        layout.setSpacing(18)
+        layout.setContentsMargins(24, 24, 24, 24)
+
+        controls = QHBoxLayout()
+        self.end_label = QLabel()
+        self.end_input = QLineEdit("#FFFFFF")
+        self.end_input.setMinimumWidth(140)
+        self.end_input.textChanged.connect(self.refresh)
+        self.space_combo = QComboBox()
+        self.space_combo.addItems([self.lang_manager.tr(space) for space in RAMP_SPACES])
+        self.space_combo.setCurrentIndex(RAMP_SPACES.index("oklab"))
+        self.space_combo.currentIndexChanged.connect(self.refresh)
+        self.steps_label = QLabel()
+        self.steps_spin = QSpinBox()
+        self.steps_spin.setRange(2, 4096)
+        self.steps_spin.setValue(256)
+        self.steps_spin.valueChanged.connect(self.refresh)
+        self.uniform_check = QCheckBox()
+        self.uniform_check.toggled.connect(self.refresh)
+        self.export_btn = QPushButton()
+        self.export_btn.clicked.connect(self.export)
+        for widget in (self.end_label, self.end_input, self.space_combo, self.steps_label, self.steps_spin,
+                       self.uniform_check, self.export_btn):
+            controls.addWidget(widget)
+        layout.addLayout(controls)
+
+        self.view = RampView()
+        layout.addWidget(self.view, 1)
+        self.retranslateUi()
+
+    def set_color(self, r, g, b, a=255):
+        self.start = Color(r, g, b, a)
+        if self.isVisible():
+            self.refresh()
+
+    def params(self):
+        return RAMP_SPACES[self.space_combo.currentIndex()], self.steps_spin.value(), self.uniform_check.isChecked()
+
+    @probe()
+    def refresh(self):
+        end = parse_color(self.end_input.text())
+        if end is None:
+            return
+        space, size, uniform = self.params()
+        self.colors = ramp((self.start, Color(*end)), size, space, uniform=uniform)
+        self.view.set_colors(ramp_to_uint8(self.colors))
+
+    def export(self):
+        if self.colors is None:
+            return
+        path, selected = QFileDialog.getSaveFileName(
+            self, self.lang_manager.tr("export"), "ramp.cube",
+            "Cube LUT (*.cube);;CSV (*.csv);;JSON (*.json)"
+        )
+        if not path:
+            return
+        fmt = None if os.path.splitext(path)[1] else selected.split("*.")[1].rstrip(")")
+        space, _, uniform = self.params()
+        try:
+            export_ramp(path, self.colors, fmt, space=space, stops=[self.start.hex, self.end_input.text()], uniform=uniform)
+        except (ValueError, OSError) as e:
+            QMessageBox.warning(self, self.lang_manager.tr("ramp"), str(e))
+
+    def retranslateUi(self):
+        self.setWindowTitle(self.lang_manager.tr("ramp"))
+        self.end_label.setText(self.lang_manager.tr("end_color") + ":")
+        self.steps_label.setText(self.lang_manager.tr("steps") + ":")
+        self.uniform_check.setText(self.lang_manager.tr("uniform"))
+        self.export_btn.setText(self.lang_manager.tr("export"))
+        for i, space in enumerate(RAMP_SPACES):
+            self.space_combo.setItemText(i, self.lang_manager.tr(space))
+
+class PaletteWorker(QThread):
+    paletteReady = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, count=8, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.count = count
+
+    def run(self):
+        import color_palette
+        try:
+            rgb, fractions = color_palette.extract_palette(self.path, self.count)
+        except (ValueError, OSError) as e:
+            self.failed.emit(str(e))
+            return
+        self.paletteReady.emit(color_palette.describe_palette(rgb, fractions))
+
+class PalettePanel(QWidget):
+    # Lists the swatches of an extracted palette in every supported color
+    # space; clicking a swatch makes it the current color.
+    colorSelected = pyqtSignal(int, int, int)
+
+    def __init__(self, lang_manager, parent=None):
+        super().__init__(parent, Qt.WindowType.Tool)
+        self.lang_manager = lang_manager
+        self.rows = []
+        self.setStyleSheet("PalettePanel { background: #f5f5f5; }")
+        self.row_layout = QGridLayout(self)
+        self.row_layout.setSpacing(12)
+        self.row_layout.setContentsMargins(24, 24, 24, 24)
+        self.retranslateUi()
+
+    def row(self, index):
+        while len(self.rows) <= index:
+            frame = ColorSwatch(radius=10, border=3, border_color="#333")
+            frame.setFixedSize(56, 56)
+            frame.clicked.connect(lambda f=frame: self.colorSelected.emit(f.color.red(), f.color.green(), f.color.blue()))
+            label = QLabel()
+            label.setStyleSheet("font-size: 13px;")
+            label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            i = len(self.rows)
+            self.row_layout.addWidget(frame, i, 0)
+            self.row_layout.addWidget(label, i, 1)
+            self.rows.append((frame, label))
+        return self.rows[index]
+
+    def set_palette(self, swatches):
+        for i, s in enumerate(swatches):
+            frame, label = self.row(i)
+            frame.set_color(*s["rgb"])
+            label.setText(
+                f"{s['hex']}  {s['fraction'] * 100:.1f}%\n"
+                f"RGB{tuple(s['rgb'])}  HSV{tuple(s['hsv'])}  HSL{tuple(s['hsl'])}  "
+                f"CMYK{tuple(s['cmyk'])}  YUV{tuple(s['yuv'])}"
+            )
+            frame.show()
+            label.show()
+        for frame, label in self.rows[len(swatches):]:
+            frame.hide()
+            label.hide()
+        self.adjustSize()
+
+    def retranslateUi(self):
+        self.setWindowTitle(self.lang_manager.tr("palette"))
+
+class ImageSource:
+    # Samples a loaded image; also stands in for the screen in tests. QImage
+    # is safe to read from any thread, so regions are grabbed by the sampler.
+    thread_safe = True
+
+    def __init__(self, image):
+        self.image = image.convertToFormat(QImage.Format.Format_RGB32)
+
+    def region(self, x, y, size):
+        # Clipped to the image, so edge averages only see real pixels.
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.image.width(), x + size), min(self.image.height(), y + size)
+        return x0, y0, self.image.copy(x0, y0, max(0, x1 - x0), max(0, y1 - y0))
+
+class ScreenSource:
+    # QScreen.grabWindow returns a QPixmap, which belongs to the GUI thread:
+    # the panel grabs the (small) region and hands the image to the sampler.
+    thread_safe = False
+
+    def region(self, x, y, size):
+        screen = QGuiApplication.screenAt(QPoint(x + size // 2, y + size // 2)) or QGuiApplication.primaryScreen()
+        geometry = screen.geometry()
+        image = screen.grabWindow(0, x - geometry.x(), y - geometry.y(), size, size).toImage()
+        if image.width() != size or image.height() != size:
+            image = image.scaled(size, size)
+        return x, y, image.convertToFormat(QImage.Format.Format_RGB32)
+
+class RegionCache:
+    # Keeps one grabbed square around the cursor and reuses it while the
+    # cursor (plus the loupe margin) stays inside; screen regions also expire
+    # after `ttl` seconds because the screen keeps changing. A different
+    # source always grabs again, so a job still queued for the previous
+    # image cannot leave its pixels behind.
+    def __init__(self, size, margin, ttl=None):
+        self.size = size
+        self.margin = margin
+        self.ttl = ttl
+        self.source = None
+        self.request = None
+        self.origin = None
+        self.image = None
+        self.stamp = 0.0
+        self.grabs = 0
+
+    def get(self, source, x, y):
+        if self.request is not None and source is self.source:
+            # Tested against the requested square: a region clipped at the
+            # edge of an image stays valid for cursors near that edge.
+            rx, ry = self.request
+            inside = (rx + self.margin <= x < rx + self.size - self.margin
+                      and ry + self.margin <= y < ry + self.size - self.margin)
+            fresh = self.ttl is None or time.monotonic() - self.stamp < self.ttl
+            if inside and fresh:
+                return self.origin[0], self.origin[1], self.image
+        self.request = (x - self.size // 2, y - self.size // 2)
+        ox, oy, self.image = source.region(*self.request, self.size)
+        self.source = source
+        self.origin = (ox, oy)
+        self.stamp = time.monotonic()
+        self.grabs += 1
+        return ox, oy, self.image
+
+class EyedropperSampler(QThread):
+    # Averages an NxN area under the cursor and renders the magnifier loupe
+    # off the GUI thread. Only the newest cursor position is kept, so a fast
+    # moving cursor never builds up a backlog.
+    sampled = pyqtSignal(int, int, int, QImage, bool)
+    REGION = 64
+    LOUPE_PIXELS = 15
+    LOUPE_ZOOM = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mutex = QMutex()
+        self.wake = QWaitCondition()
+        self.pending = None
+        self.stopping = False
+        self.average = 1
+        self.cache = RegionCache(self.REGION, self.LOUPE_PIXELS // 2)
+
+    def submit(self, source, x, y, region=None, pick=False):
+        self.mutex.lock()
+        self.pending = (source, x, y, region, pick)
+        self.wake.wakeOne()
+        self.mutex.unlock()
+        if not self.isRunning():
+            self.start()
+
+    def stop(self):
+        self.mutex.lock()
+        self.stopping = True
+        self.wake.wakeOne()
+        self.mutex.unlock()
+        self.wait()
+
+    def run(self):
+        while True:
+            self.mutex.lock()
+            while self.pending is None and not self.stopping:
+                self.wake.wait(self.mutex)
+            job, self.pending = self.pending, None
+            stopping = self.stopping
+            self.mutex.unlock()
+            if stopping:
+                return
+            source, x, y, region, pick = job
+            if region is None:
+                region = self.cache.get(source, x, y)
+            r, g, b = self.average_color(region, x, y, self.average)
+            self.sampled.emit(r, g, b, self.loupe(region, x, y, self.average), pick)
+
+    @staticmethod
+    def pixels(image):
+        import numpy as np
+        bits = image.constBits()
+        bits.setsize(image.sizeInBytes())
+        rows = np.frombuffer(bits, dtype=np.uint8).reshape(image.height(), image.bytesPerLine() // 4, 4)
+        return rows[:, :image.width(), 2::-1]
+
+    @classmethod
+    def average_color(cls, region, x, y, n):
+        ox, oy, image = region
+        cx, cy = x - ox, y - oy
+        area = cls.pixels(image)[max(0, cy - n // 2):cy + n // 2 + 1, max(0, cx - n // 2):cx + n // 2 + 1]
+        if area.size == 0:
+            return 0, 0, 0
+        r, g, b = (round(float(v)) for v in area.reshape(-1, 3).mean(axis=0))
+        return r, g, b
+
+    @classmethod
+    def loupe(cls, region, x, y, n):
+        ox, oy, image = region
+        span, zoom = cls.LOUPE_PIXELS, cls.LOUPE_ZOOM
+        view = image.copy(x - ox - span // 2, y - oy - span // 2, span, span).scaled(
+            span * zoom, span * zoom, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.FastTransformation)
+        painter = QPainter(view)
+        painter.setPen(QColor(255, 255, 255, 200))
+        corner = (span // 2 - n // 2) * zoom
+        painter.drawRect(corner, corner, n * zoom - 1, n * zoom - 1)
+        painter.setPen(QColor(0, 0, 0, 200))
+        painter.drawRect(corner - 1, corner - 1, n * zoom + 1, n * zoom + 1)
+        painter.end()
+        return view
+
+class ImageView(QLabel):
+    # Shows a loaded image scaled to fit and reports cursor positions in
+    # image coordinates.
+    hovered = pyqtSignal(int, int)
+    picked = pyqtSignal(int, int)
+    MAX_SIZE = 480
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.scale = 1.0
+
+    def set_image(self, image):
+        self.scale = min(1.0, self.MAX_SIZE / max(image.width(), image.height(), 1))
+        pixmap = QPixmap.fromImage(image)
+        if self.scale < 1.0:
+            pixmap = pixmap.scaled(round(image.width() * self.scale), round(image.height() * self.scale),
+                                   Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.setPixmap(pixmap)
+        self.setFixedSize(pixmap.size())
+
+    def image_pos(self, event):
+        pos = event.position()
+        return int(pos.x() / self.scale), int(pos.y() / self.scale)
+
+    def mouseMoveEvent(self, event):
+        self.hovered.emit(*self.image_pos(event))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.picked.emit(*self.image_pos(event))
+
+class EyedropperPanel(QWidget):
+    # Picks colors from the screen or from a loaded image, averaging an
+    # NxN area. While picking from the screen the panel grabs the mouse:
+    # a click takes the color under the cursor, Escape cancels.
+    colorSelected = pyqtSignal(int, int, int)
+    SCREEN_TTL = 0.25
+
+    def __init__(self, lang_manager, parent=None):
+        super().__init__(parent, Qt.WindowType.Tool)
+        self.lang_manager = lang_manager
+        self.source = None
+        self.picking = False
+        self.screen_cache = RegionCache(EyedropperSampler.REGION, EyedropperSampler.LOUPE_PIXELS // 2, self.SCREEN_TTL)
+        self.sampler = EyedropperSampler(self)
+        self.sampler.sampled.connect(self.on_sampled)
+        QApplication.instance().aboutToQuit.connect(self.sampler.stop)
+        self.setStyleSheet("EyedropperPanel { background: #f5f5f5; }")
+        layout = QVBoxLayout(self)
+        layout.setSpacing(14)
+        layout.setContentsMargins(24, 24, 24, 24)
+
+        top = QHBoxLayout()
+        size = EyedropperSampler.LOUPE_PIXELS * EyedropperSampler.LOUPE_ZOOM
+        self.loupe_label = QLabel()
+        self.loupe_label.setFixedSize(size, size)
+        self.loupe_label.setStyleSheet("background: #222; border: 2px solid #333;")
+        top.addWidget(self.loupe_label)
+        info = QVBoxLayout()
+        self.swatch = ColorSwatch(radius=10, border=3, border_color="#333")
+        self.swatch.setFixedSize(120, 56)
+        self.value_label = QLabel()
+        self.value_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        self.value_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        average = QHBoxLayout()
+        self.average_label = QLabel()
+        self.average_spin = QSpinBox()
+        self.average_spin.setRange(1, 15)
+        self.average_spin.setSingleStep(2)
+        self.average_spin.valueChanged.connect(self.set_average)
+        average.addWidget(self.average_label)
+        average.addWidget(self.average_spin)
+        info.addWidget(self.swatch)
+        info.addWidget(self.value_label)
+        info.addLayout(average)
+        info.addStretch()
+        top.addLayout(info)
+        layout.addLayout(top)
+
+        buttons = QHBoxLayout()
+        self.screen_btn = QPushButton()
+        self.screen_btn.clicked.connect(self.pick_screen)
+        self.image_btn = QPushButton()
+        self.image_btn.clicked.connect(self.load_image)
+        buttons.addWidget(self.screen_btn)
+        buttons.addWidget(self.image_btn)
+        layout.addLayout(buttons)
+
+        self.image_view = ImageView()
+        self.image_view.hovered.connect(lambda x, y: self.track(x, y))
+        self.image_view.picked.connect(lambda x, y: self.track(x, y, pick=True))
+        self.image_view.hide()
+        layout.addWidget(self.image_view, 0, Qt.AlignmentFlag.AlignCenter)
+        self.retranslateUi()
+
+    def set_average(self, n):
+        # Even sizes have no center pixel; round up to the next odd size.
+        self.sampler.average = n | 1
+
+    def set_source(self, source):
+        # The region caches notice the new source themselves; the sampler's
+        # cache is only touched from its own thread.
+        self.source = source
+
+    def set_image(self, image):
+        self.set_source(ImageSource(image))
+        self.image_view.set_image(image)
+        self.image_view.show()
+        self.adjustSize()
+
+    def track(self, x, y, pick=False):
+        if self.source is None:
+            return
+        region = None if self.source.thread_safe else self.screen_cache.get(self.source, x, y)
+        self.sampler.submit(self.source, x, y, region, pick)
+
+    def on_sampled(self, r, g, b, loupe, pick):
+        self.loupe_label.setPixmap(QPixmap.fromImage(loupe))
+        self.swatch.set_color(r, g, b)
+        text = f"{ColorConverter.rgb_to_hex(r, g, b)}\nRGB({r}, {g}, {b})"
+        if self.value_label.text() != text:
+            self.value_label.setText(text)
+        if pick:
+            self.colorSelected.emit(r, g, b)
+
+    def load_image(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, self.lang_manager.tr("load_image"), "", "Images (*.png *.jpg *.jpeg *.bmp *.gif *.ppm *.tif *.tiff)"
+        )
+        if not path:
+            return
+        image = QImage(path)
+        if image.isNull():
+            QMessageBox.warning(self, self.lang_manager.tr("eyedropper"), path)
+            return
+        self.set_image(image)
+
+    def pick_screen(self):
+        self.set_source(ScreenSource())
+        self.picking = True
+        self.setMouseTracking(True)
+        self.grabMouse(Qt.CursorShape.CrossCursor)
+        self.grabKeyboard()
+
+    def stop_picking(self):
+        self.picking = False
+        self.releaseMouse()
+        self.releaseKeyboard()
+
+    def mouseMoveEvent(self, event):
+        if self.picking:
+            pos = event.globalPosition().toPoint()
+            self.track(pos.x(), pos.y())
+        super().mouseMoveEvent(event)
+
+    def mousePressEvent(self, event):
+        if self.picking:
+            pos = event.globalPosition().toPoint()
+            self.stop_picking()
+            if event.button() == Qt.MouseButton.LeftButton:
+                self.track(pos.x(), pos.y(), pick=True)
+            return
+        super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        if self.picking and event.key() == Qt.Key.Key_Escape:
+            self.stop_picking()
+            return
+        super().keyPressEvent(event)
+
+    def retranslateUi(self):
+        self.setWindowTitle(self.lang_manager.tr("eyedropper"))
+        self.screen_btn.setText(self.lang_manager.tr("pick_screen"))
+        self.image_btn.setText(self.lang_manager.tr("load_image"))
+        self.average_label.setText(self.lang_manager.tr("average") + ":")
+
+class UpdateScheduler(QObject):
+    # Collapses bursts of color changes into at most one refresh per display
+    # frame. The counters report how much work was coalesced or skipped.
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.flush)
+        self.last_refresh = 0.0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.requests = 0
+        self.refreshes = 0
+        self.coalesced = 0
+        self.skipped = 0
+
+    def frame_interval(self):
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return 1.0 / (rate if rate > 0 else 60.0)
+
+    def request(self):
+        self.requests += 1
+        if self.timer.isActive():
+            self.coalesced += 1
+            return
+        wait = self.frame_interval() - (time.monotonic() - self.last_refresh)
+        self.timer.start(max(0, int(wait * 1000)))
+
+    def flush(self):
+        self.timer.stop()
+        self.refreshes += 1
+        self.last_refresh = time.monotonic()
+        self.callback()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "refreshes": self.refreshes,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+        }
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.lang_manager = LanguageManager(self)
+        self.current_r, self.current_g, self.current_b = 255, 0, 0
+        self.current_a = 255
+        self.preview_rgb = None
+        self.updating = False  # Global update flag
+        self.scheduler = UpdateScheduler(self.refresh, self)
+        self.setup_ui()
+        self.apply_initial_theme()
+        self.set_rtl_if_needed()
+        self.update_all_outputs()
+        self.update_preview()
+        if PROBES_ENABLED:
+            self.setup_probes()
+
+    def setup_probes(self):
+        # Only reached with COLOR_PROBES set: a status bar summary of every
+        # refresh and F12 to save the collected trace.
+        self.probe_label = QLabel()
+        self.statusBar().addPermanentWidget(self.probe_label, 1)
+        self.scheduler.callback = self.profiled_refresh
+        QShortcut(QKeySequence("F12"), self, self.save_trace)
+
+    def profiled_refresh(self):
+        start = time.perf_counter_ns()
+        self.refresh()
+        summary = profiler.end_interaction(time.perf_counter_ns() - start)
+        self.probe_label.setText(
+            f"frame {summary['frame_ms']:.2f} ms  |  {summary['calls']} probe calls  |  "
+            f"slowest {summary['slowest']} {summary['slowest_ms']:.2f} ms"
+        )
+
+    def save_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, self.lang_manager.tr("save_trace"), "color-trace.json", "JSON (*.json)")
+        if path:
+            profiler.dump(path)
+
+    def setup_ui(self):
+        self.setWindowTitle(self.lang_manager.tr("title"))
+        self.setMinimumSize(1500, 950)
+        self.setWindowIcon(QIcon.fromTheme("color-management"))
+        self.setStyleSheet("QMainWindow { background: transparent; }")
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QHBoxLayout(central_widget)
+        main_layout.setSpacing(28)
+        main_layout.setContentsMargins(28, 28, 28, 28)
+
+        # Left Panel
+        left_panel = QFrame()
+        left_panel.setFrameShape(QFrame.Shape.StyledPanel)
+        left_panel.setMinimumWidth(460)
+        left_panel.setStyleSheet("QFrame { border-radius: 20px; background: rgba(255,255,255,0.8); }")
+        left_layout = QVBoxLayout(left_panel)
+        left_layout.setSpacing(18)
+
+        # Controls
+        controls_layout = QHBoxLayout()
+        controls_layout.setSpacing(14)
+
+        lang_combo = QComboBox()
+        lang_combo.addItems(["English", "فارسی", "中文", "Русский"])
+        lang_combo.setCurrentIndex(0)
+        lang_combo.currentIndexChanged.connect(self.change_language)
+        lang_combo.setStyleSheet("QComboBox { padding: 10px; border-radius: 12px; font-size: 14px; }")
+        controls_layout.addWidget(QLabel(self.lang_manager.tr("language")))
+        controls_layout.addWidget(lang_combo)
+
+        theme_combo = QComboBox()
+        theme_combo.addItems([
+            self.lang_manager.tr("light"), self.lang_manager.tr("dark"),
+            self.lang_manager.tr("system"), self.lang_manager.tr("red"), self.lang_manager.tr("blue")
+        ])
+        theme_combo.currentIndexChanged.connect(self.change_theme)
+        theme_combo.setStyleSheet("QComboBox { padding: 10px; border-radius: 12px; font-size: 14px; }")
+        controls_layout.addWidget(QLabel(self.lang_manager.tr("theme")))
+        controls_layout.addWidget(theme_combo)
+
+        left_layout.addLayout(controls_layout)
+
+        # Color Preview
+        self.color_preview = ColorSwatch(radius=24, border=5)
+        self.color_preview.setFixedHeight(160)
+        self.color_preview.set_color(255, 0, 0)
+        preview_text = QLabel("RGB(255, 0, 0)")
+        preview_text.setStyleSheet("color: white; font-size: 20px; font-weight: bold; background: transparent; border: none;")
+        preview_layout = QVBoxLayout(self.color_preview)
+        preview_layout.addWidget(preview_text)
+        self.preview_text = preview_text
+        left_layout.addWidget(self.color_preview)
+
+        # The current color composited onto light, mid and dark backdrops
+        backdrop_layout = QHBoxLayout()
+        backdrop_layout.setSpacing(10)
+        self.backdrop_swatches = []
+        for _ in BACKDROPS:
+            swatch = ColorSwatch(radius=8, border=2)
+            swatch.setFixedHeight(28)
+            backdrop_layout.addWidget(swatch)
+            self.backdrop_swatches.append(swatch)
+        left_layout.addLayout(backdrop_layout)
+
+        # Input
+        input_tabs = QTabWidget()
+        input_tabs.setDocumentMode(True)
+        input_tabs.setStyleSheet("QTabWidget::pane { border: 0; } QTabBar::tab { padding: 14px; border-radius: 12px; }")
+
+        rgb_tab = QWidget()
+        rgb_layout = QVBoxLayout(rgb_tab)
+        rgb_layout.setSpacing(14)
+        self.rgb_input = ColorInputWidget(self.lang_manager.tr("rgb"), self.lang_manager)
+        self.rgb_input.valueChanged.connect(self.on_rgb_changed)
+        rgb_layout.addWidget(self.rgb_input)
+
+        hex_layout = QHBoxLayout()
+        hex_layout.setSpacing(10)
+        self.hex_input = QLineEdit("#FF0000")
+        self.hex_input.setFixedHeight(42)
+        self.hex_input.setStyleSheet("QLineEdit { padding: 10px; font-size: 15px; border-radius: 12px; }")
+        self.hex_input.textChanged.connect(self.on_hex_changed)
+        hex_layout.addWidget(QLabel(self.lang_manager.tr("hex") + ":"))
+        hex_layout.addWidget(self.hex_input)
+        rgb_layout.addLayout(hex_layout)
+
+        input_tabs.addTab(rgb_tab, self.lang_manager.tr("input"))
+        left_layout.addWidget(input_tabs)
+
+        # Color Difference
+        difference_group = QGroupBox(self.lang_manager.tr("difference"))
+        difference_group.setStyleSheet("QGroupBox { font-weight: bold; font-size: 15px; }")
+        difference_layout = QVBoxLayout(difference_group)
+        reference_layout = QHBoxLayout()
+        reference_layout.setSpacing(10)
+        self.reference_swatch = ColorSwatch(radius=8, border=2)
+        self.reference_swatch.setFixedSize(42, 42)
+        self.reference_input = QLineEdit("#FFFFFF")
+        self.reference_input.setFixedHeight(42)
+        self.reference_input.setStyleSheet("QLineEdit { padding: 10px; font-size: 15px; border-radius: 12px; }")
+        self.reference_input.textChanged.connect(self.on_reference_changed)
+        use_current_btn = QPushButton(self.lang_manager.tr("use_current"))
+        use_current_btn.setFixedHeight(42)
+        use_current_btn.clicked.connect(lambda: self.reference_input.setText(
+            ColorConverter.rgb_to_hex(self.current_r, self.current_g, self.current_b)))
+        reference_layout.addWidget(QLabel(self.lang_manager.tr("reference") + ":"))
+        reference_layout.addWidget(self.reference_swatch)
+        reference_layout.addWidget(self.reference_input, 1)
+        reference_layout.addWidget(use_current_btn)
+        difference_layout.addLayout(reference_layout)
+        delta_layout = QFormLayout()
+        self.delta_labels = {}
+        for method, label in [("ciede2000", "ΔE00"), ("cie94", "ΔE94"), ("cie76", "ΔE76")]:
+            val_label = QLabel("0")
+            val_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+            delta_layout.addRow(label + ":", val_label)
+            self.delta_labels[method] = val_label
+        difference_layout.addLayout(delta_layout)
+        self.reference_lab = None
+        self.set_reference(255, 255, 255)
+        left_layout.addWidget(difference_group)
+
+        # Right Panel
+        right_panel = QFrame()
+        right_panel.setFrameShape(QFrame.Shape.StyledPanel)
+        right_panel.setStyleSheet("QFrame { border-radius: 20px; background: rgba(255,255,255,0.8); }")
+        right_layout = QVBoxLayout(right_panel)
+        right_layout.setSpacing(18)
+
+        # Output
+        output_group = QGroupBox(self.lang_manager.tr("output"))
+        output_group.setStyleSheet("QGroupBox { font-weight: bold; font-size: 15px; }")
+        output_layout = QVBoxLayout(output_group)
+
+        output_tabs = QTabWidget()
+        output_tabs.setDocumentMode(True)
+
+        # HSV
+        hsv_tab = QWidget()
+        hsv_layout = QFormLayout(hsv_tab)
+        self.hsv_labels = []
+        for label in [self.lang_manager.tr("hue"), self.lang_manager.tr("sat"), self.lang_manager.tr("val")]:
+            val_label = QLabel("0")
+            val_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+            hsv_layout.addRow(label + ":", val_label)
+            self.hsv_labels.append(val_label)
+        output_tabs.addTab(hsv_tab, self.lang_manager.tr("hsv"))
+
+        # HSL
+        hsl_tab = QWidget()
+        hsl_layout = QFormLayout(hsl_tab)
+        self.hsl_labels = []
+        for label in [self.lang_manager.tr("hue"), self.lang_manager.tr("sat"), self.lang_manager.tr("lightness")]:
+            val_label = QLabel("0")
+            val_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+            hsl_layout.addRow(label + ":", val_label)
+            self.hsl_labels.append(val_label)
+        output_tabs.addTab(hsl_tab, self.lang_manager.tr("hsl"))
+
+        # CMYK
+        cmyk_tab = QWidget()
+        cmyk_layout = QFormLayout(cmyk_tab)
+        self.cmyk_labels = []
+        for label in [self.lang_manager.tr("cyan"), self.lang_manager.tr("magenta"), self.lang_manager.tr("yellow"), self.lang_manager.tr("black")]:
+            val_label = QLabel("0")
+            val_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+            cmyk_layout.addRow(label + ":", val_label)
+            self.cmyk_labels.append(val_label)
+        output_tabs.addTab(cmyk_tab, self.lang_manager.tr("cmyk"))
+
+        # YUV
+        yuv_tab = QWidget()
+        yuv_layout = QFormLayout(yuv_tab)
+        self.yuv_labels = []
+        for label in [self.lang_manager.tr("luminance"), "U", "V"]:
+            val_label = QLabel("0")
+            val_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+            yuv_layout.addRow(label + ":", val_label)
+            self.yuv_labels.append(val_label)
+        output_tabs.addTab(yuv_tab, self.lang_manager.tr("yuv"))
+
+        # Perceptual spaces
+        self.perceptual_labels = {}
+        for space, names in [("xyz", ["X", "Y", "Z"]), ("lab", ["L*", "a*", "b*"]),
+                             ("lch", ["L*", "C*", "h°"]), ("oklab", ["L", "a", "b"])]:
+            tab = QWidget()
+            tab_layout = QFormLayout(tab)
+            labels = []
+            for label in names:
+                val_label = QLabel("0")
+                val_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+                tab_layout.addRow(label + ":", val_label)
+                labels.append(val_label)
+            self.perceptual_labels[space] = labels
+            output_tabs.addTab(tab, self.lang_manager.tr(space))
+
+        output_layout.addWidget(output_tabs)
+
+        nearest_layout = QHBoxLayout()
+        nearest_layout.addWidget(QLabel(self.lang_manager.tr("nearest") + ":"))
+        self.nearest_label = QLabel()
+        self.nearest_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+        nearest_layout.addWidget(self.nearest_label, 1)
+        output_layout.addLayout(nearest_layout)
+        self.name_index = None
+
+        gamut_layout = QHBoxLayout()
+        gamut_layout.addWidget(QLabel(self.lang_manager.tr("gamut") + ":"))
+        self.gamut_swatch = ColorSwatch(radius=6, border=2, border_color="#333")
+        self.gamut_swatch.setFixedSize(28, 28)
+        gamut_layout.addWidget(self.gamut_swatch)
+        # The text width changes with every color; ignoring its size hint
+        # keeps those changes from relayouting the whole window.
+        self.gamut_label = QLabel()
+        self.gamut_label.setTextFormat(Qt.TextFormat.RichText)
+        self.gamut_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
+        self.gamut_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+        gamut_layout.addWidget(self.gamut_label, 1)
+        load_gamut_btn = QPushButton(self.lang_manager.tr("load_gamut"))
+        load_gamut_btn.clicked.connect(self.load_gamut)
+        gamut_layout.addWidget(load_gamut_btn)
+        output_layout.addLayout(gamut_layout)
+        self.gamut = None
+
+        contrast_layout = QHBoxLayout()
+        contrast_layout.addWidget(QLabel(self.lang_manager.tr("contrast") + ":"))
+        self.contrast_label = QLabel()
+        self.contrast_label.setTextFormat(Qt.TextFormat.RichText)
+        self.contrast_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
+        self.contrast_label.setStyleSheet("font-weight: bold; color: #0055aa; font-size: 15px;")
+        contrast_layout.addWidget(self.contrast_label, 1)
+        output_layout.addLayout(contrast_layout)
+        right_layout.addWidget(output_group)
+
+        # Color Picker
+        picker_group = QGroupBox(self.lang_manager.tr("picker"))
+        picker_group.setStyleSheet("QGroupBox { font-weight: bold; font-size: 15px; }")
+        picker_layout = QVBoxLayout(picker_group)
+        self.picker = ColorPickerWidget()
+        self.picker.colorChanged.connect(self.on_color_picked)
+        picker_layout.addWidget(self.picker)
+
+        hue_slider = HueSlider()
+        hue_slider.setValue(0)
+        hue_slider.valueChanged.connect(self.on_hue_changed)
+        picker_layout.addWidget(QLabel(self.lang_manager.tr("hue")))
+        picker_layout.addWidget(hue_slider)
+        self.hue_slider = hue_slider
+
+        self.alpha_slider = AlphaSlider()
+        self.alpha_slider.setValue(255)
+        self.alpha_slider.valueChanged.connect(self.on_alpha_changed)
+        picker_layout.addWidget(QLabel(self.lang_manager.tr("alpha")))
+        picker_layout.addWidget(self.alpha_slider)
+
+        eyedropper_btn = QPushButton(self.lang_manager.tr("eyedropper"))
+        eyedropper_btn.clicked.connect(self.show_eyedropper)
+        picker_layout.addWidget(eyedropper_btn)
+        self.eyedropper_panel = EyedropperPanel(self.lang_manager, self)
+        self.eyedropper_panel.colorSelected.connect(self.on_color_picked)
+
+        right_layout.addWidget(picker_group)
+
+        # Harmony
+        harmony_group = QGroupBox(self.lang_manager.tr("harmony"))
+        harmony_group.setStyleSheet("QGroupBox { font-weight: bold; font-size: 15px; }")
+        harmony_layout = QGridLayout(harmony_group)
+        harmony_layout.setSpacing(10)
+
+        harmonies = [self.lang_manager.tr(scheme) for scheme in HARMONY_SCHEMES]
+        for i, name in enumerate(harmonies):
+            btn = QPushButton(name)
+            btn.setFixedHeight(48)
+            btn.setStyleSheet("QPushButton { font-weight: bold; font-size: 14px; }")
+            btn.clicked.connect(lambda checked, idx=i: self.show_harmony(idx))
+            harmony_layout.addWidget(btn, i // 2, i % 2)
+
+        right_layout.addWidget(harmony_group)
+        self.harmony_panel = HarmonyPanel(self.lang_manager, self)
+
+        # Image palette
+        palette_group = QGroupBox(self.lang_manager.tr("palette"))
+        palette_group.setStyleSheet("QGroupBox { font-weight: bold; font-size: 15px; }")
+        palette_layout = QHBoxLayout(palette_group)
+        self.extract_btn = QPushButton(self.lang_manager.tr("extract"))
+        self.extract_btn.setFixedHeight(48)
+        self.extract_btn.setStyleSheet("QPushButton { font-weight: bold; font-size: 14px; }")
+        self.extract_btn.clicked.connect(self.extract_palette)
+        palette_layout.addWidget(self.extract_btn)
+        ramp_btn = QPushButton(self.lang_manager.tr("gradient"))
+        ramp_btn.setFixedHeight(48)
+        ramp_btn.setStyleSheet("QPushButton { font-weight: bold; font-size: 14px; }")
+        ramp_btn.clicked.connect(self.show_ramp)
+        palette_layout.addWidget(ramp_btn)
+        right_layout.addWidget(palette_group)
+        self.ramp_panel = RampPanel(self.lang_manager, self)
+        self.palette_panel = PalettePanel(self.lang_manager, self)
+        self.palette_panel.colorSelected.connect(self.on_color_picked)
+        self.palette_worker = None
+
+        main_layout.addWidget(left_panel, 1)
+        main_layout.addWidget(right_panel, 1)
+
+    def apply_initial_theme(self):
+        ThemeManager.apply_theme(QApplication.instance(), "light")
+
+    def change_language(self, index):
+        langs = ["en", "fa", "zh", "ru"]
+        self.lang_manager.set_language(langs[index])
+        self.retranslateUi()
+        self.set_rtl_if_needed()
+
+    def set_rtl_if_needed(self):
+        if self.lang_manager.current_lang == "fa":
+            self.setLayoutDirection(Qt.LayoutDirection.RightToLeft)
+            QApplication.instance().setLayoutDirection(Qt.LayoutDirection.RightToLeft)
+        else:
+            self.setLayoutDirection(Qt.LayoutDirection.LeftToRight)
+            QApplication.instance().setLayoutDirection(Qt.LayoutDirection.LeftToRight)
+
+    @probe()
+    def change_theme(self, index):
+        themes = ["light", "dark", "system", "red", "blue"]
+        ThemeManager.apply_theme(QApplication.instance(), themes[index])
+
+    @property
+    def current_color(self):
+        return Color(self.current_r, self.current_g, self.current_b, self.current_a)
+
+    @current_color.setter
+    def current_color(self, color):
+        self.current_r, self.current_g, self.current_b, self.current_a = color.rgba
+        self.scheduler.request()
+
+    @probe()
+    def on_rgb_changed(self, r, g, b):
+        if self.updating:
+            return
+        self.current_r, self.current_g, self.current_b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+        self.scheduler.request()
+
+    @probe()
+    def on_hex_changed(self, text):
+        if self.updating:
+            return
+        # Any CSS color is accepted: #RGB, #RRGGBB(AA), rgb(), hsl() or a name.
+        color = parse_color(text)
+        if color is not None:
+            self.current_r, self.current_g, self.current_b, self.current_a = color
+            self.scheduler.request()
+
+    @probe()
+    def on_color_picked(self, r, g, b):
+        if self.updating:
+            return
+        self.current_r, self.current_g, self.current_b = max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+        self.scheduler.request()
+
+    @probe()
+    def on_alpha_changed(self, a):
+        if self.updating:
+            return
+        self.current_a = a
+        self.scheduler.request()
+
+    @probe()
+    def on_hue_changed(self, h):
+        if self.updating:
+            return
+        hsv = ColorConverter.rgb_to_hsv(self.current_r, self.current_g, self.current_b)
+        self.picker.set_hsv(h, hsv[1], hsv[2])
+
+    @probe()
+    def refresh(self):
+        self.rgb_input.set_values(self.current_r, self.current_g, self.current_b)
+        self.update_preview()
+        self.update_all_outputs()
+        self.harmony_panel.set_color(self.current_r, self.current_g, self.current_b)
+        self.ramp_panel.set_color(self.current_r, self.current_g, self.current_b, self.current_a)
+
+    def set_text(self, widget, text):
+        if widget.text() == text:
+            self.scheduler.skipped += 1
+            return
+        widget.setText(text)
+
+    @probe()
+    def update_preview(self):
+        rgba = (self.current_r, self.current_g, self.current_b, self.current_a)
+        if self.preview_rgb == rgba:
+            self.scheduler.skipped += 1
+            return
+        self.preview_rgb = rgba
+        self.color_preview.set_color(*rgba)
+        if self.current_a == 255:
+            text = f"RGB({self.current_r}, {self.current_g}, {self.current_b})"
+        else:
+            text = f"RGBA({self.current_r}, {self.current_g}, {self.current_b}, {self.current_a})"
+        self.preview_text.setText(f"{text}\n{self.hex_text()}")
+        for swatch, color in zip(self.backdrop_swatches, composite_grid(rgba, BACKDROPS)[0].tolist()):
+            swatch.set_color(*color)
+        self.alpha_slider.set_color(self.current_r, self.current_g, self.current_b)
+
+    def hex_text(self):
+        # #RRGGBB for opaque colors, #RRGGBBAA otherwise.
+        alpha = None if self.current_a == 255 else self.current_a
+        return ColorConverter.rgb_to_hex(self.current_r, self.current_g, self.current_b, alpha)
+
+    @probe()
+    def update_all_outputs(self):
+        if self.updating:
+            return
+        self.updating = True
+
+        r, g, b = self.current_r, self.current_g, self.current_b
+        hex_val = self.hex_text()
+        h, s, v = ColorConverter.rgb_to_hsv(r, g, b)
+        h2, s2, l = ColorConverter.rgb_to_hsl(r, g, b)
+        c, m, y, k = ColorConverter.rgb_to_cmyk(r, g, b)
+        y_val, u, v_val = ColorConverter.rgb_to_yuv(r, g, b)
+
+        # Text that already names the current color is left as typed, so
+        # "#FFF" is not rewritten while "#FFF000" is still being entered.
+        color = parse_color(self.hex_input.text())
+        if color != (r, g, b, self.current_a):
+            self.set_text(self.hex_input, hex_val)
+
+        for i, val in enumerate([h, s, v]):
+            self.set_text(self.hsv_labels[i], str(val))
+        for i, val in enumerate([h2, s2, l]):
+            self.set_text(self.hsl_labels[i], str(val))
+        for i, val in enumerate([c, m, y, k]):
+            self.set_text(self.cmyk_labels[i], str(val))
+        for i, val in enumerate([y_val, u, v_val]):
+            self.set_text(self.yuv_labels[i], str(val))
+        for space, convert in [("xyz", ColorConverter.rgb_to_xyz), ("lab", ColorConverter.rgb_to_lab),
+                               ("lch", ColorConverter.rgb_to_lch), ("oklab", ColorConverter.rgb_to_oklab)]:
+            for i, val in enumerate(convert(r, g, b)):
+                self.set_text(self.perceptual_labels[space][i], str(val))
+        if self.name_index is None:
+            from color_match import NearestColorIndex, css_palette
+            self.name_index = NearestColorIndex.build(*css_palette())
+        name, name_hex, distance = self.name_index.match(r, g, b)
+        self.set_text(self.nearest_label, f"{name}  {name_hex}  (ΔE {distance:.2f})")
+        self.update_delta_e()
+        self.update_gamut()
+        self.update_contrast()
+
+        for slider, value in ((self.hue_slider, h), (self.alpha_slider, self.current_a)):
+            if slider.value() != value:
+                slider.blockSignals(True)
+                slider.setValue(value)
+                slider.blockSignals(False)
+            else:
+                self.scheduler.skipped += 1
+        if (self.picker.hue, self.picker.sat, self.picker.val) != (h, s, v):
+            self.picker.set_hsv(h, s, v)
+        else:
+            self.scheduler.skipped += 1
+
+        self.updating = False
+
+    def set_reference(self, r, g, b):
+        self.reference_swatch.set_color(r, g, b)
+        self.reference_lab = ColorConverter.rgb_to_lab_array((r, g, b))
+
+    def on_reference_changed(self, text):
+        color = parse_color(text)
+        if color is not None:
+            self.set_reference(*color[:3])
+            self.update_delta_e()
+
+    @probe()
+    def update_delta_e(self):
+        from color_delta import delta_e_lab
+        lab = ColorConverter.rgb_to_lab_array((self.current_r, self.current_g, self.current_b))
+        for method, label in self.delta_labels.items():
+            self.set_text(label, f"{float(delta_e_lab(self.reference_lab, lab, method)):.2f}")
+
+    @probe()
+    def update_gamut(self):
+        # The swatch previews the color as printed; the label flags colors
+        # the print gamut cannot hold and gives the mapped replacement.
+        from color_delta import ciede2000
+        if self.gamut is None:
+            from color_gamut import press_gamut
+            self.gamut = press_gamut()
+        lab = ColorConverter.rgb_to_lab_array((self.current_r, self.current_g, self.current_b))
+        out = bool(self.gamut.excess(lab) > 1e-6)
+        mapped = self.gamut.map_lab(lab)
+        r, g, b = ColorConverter.lab_to_rgb_array(mapped).tolist()
+        self.gamut_swatch.set_color(r, g, b)
+        mapped_text = f"{ColorConverter.rgb_to_hex(r, g, b)}  CMYK{ColorConverter.rgb_to_cmyk(r, g, b)}"
+        if out:
+            text = f"<span style='color: #c0392b'>{self.lang_manager.tr('out_of_gamut')} →</span> {mapped_text}"
+        else:
+            text = f"{self.lang_manager.tr('in_gamut')} {mapped_text}"
+        self.set_text(self.gamut_label, text)
+        self.gamut_label.setToolTip(f"{self.gamut.name}  ΔE00 {float(ciede2000(lab, mapped)):.2f}")
+
+    @probe()
+    def update_contrast(self):
+        # WCAG ratio and APCA Lc of the current color as text on white and
+        # on black; the tooltip suggests the nearest color that reaches AA.
+        from color_contrast import contrast, suggest, wcag_level
+        rgba = (self.current_r, self.current_g, self.current_b, self.current_a)
+        backgrounds = ((255, 255, 255), (0, 0, 0))
+        ratios = contrast(rgba, backgrounds).tolist()
+        lcs = contrast(rgba, backgrounds, "apca").tolist()
+        parts = []
+        for key, ratio, lc in zip(("white", "black"), ratios, lcs):
+            level = wcag_level(ratio)
+            if level is None:
+                level = f"<span style='color: #c0392b'>{self.lang_manager.tr('fail')}</span>"
+            parts.append(f"{self.lang_manager.tr(key)} {ratio:.2f}:1 {level} · Lc {lc:.1f}")
+        self.set_text(self.contrast_label, "&nbsp;&nbsp;&nbsp;".join(parts))
+        colors, values, found = suggest(rgba, backgrounds)
+        tips = []
+        for key, color, value, ok in zip(("white", "black"), colors.tolist(), values.tolist(), found.tolist()):
+            if ok:
+                tips.append(f"AA {self.lang_manager.tr(key)}: {Color(*color).hex} ({value:.2f}:1)")
+        self.contrast_label.setToolTip("\n".join(tips))
+
+    def load_gamut(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, self.lang_manager.tr("load_gamut"), "",
+            "Gamut (*.json *.txt *.cgats *.it8 *.csv)"
+        )
+        if not path:
+            return
+        from color_gamut import load_gamut
+        try:
+            self.gamut = load_gamut(path)
+        except (ValueError, OSError, KeyError) as e:
+            QMessageBox.warning(self, self.lang_manager.tr("gamut"), str(e))
+            return
+        self.update_gamut()
+
+    @probe()
+    def show_harmony(self, type_idx):
+        self.harmony_panel.set_scheme(HARMONY_SCHEMES[type_idx])
+        self.harmony_panel.set_color(self.current_r, self.current_g, self.current_b)
+        self.harmony_panel.show()
+        self.harmony_panel.raise_()
+        self.harmony_panel.activateWindow()
+
+    def show_ramp(self):
+        self.ramp_panel.set_color(self.current_r, self.current_g, self.current_b, self.current_a)
+        self.ramp_panel.show()
+        self.ramp_panel.refresh()
+        self.ramp_panel.raise_()
+        self.ramp_panel.activateWindow()
+
+    def show_eyedropper(self):
+        self.eyedropper_panel.show()
+        self.eyedropper_panel.raise_()
+        self.eyedropper_panel.activateWindow()
+
+    def extract_palette(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, self.lang_manager.tr("extract"), "",
+            "Images (*.ppm *.pnm *.npy *.png *.jpg *.jpeg *.bmp *.tif *.tiff)"
+        )
+        if not path:
+            return
+        self.extract_btn.setEnabled(False)
+        self.palette_worker = PaletteWorker(path, parent=self)
+        self.palette_worker.paletteReady.connect(self.show_palette)
+        self.palette_worker.failed.connect(self.palette_failed)
+        self.palette_worker.finished.connect(lambda: self.extract_btn.setEnabled(True))
+        self.palette_worker.start()
+
+    def show_palette(self, swatches):
+        self.palette_panel.set_palette(swatches)
+        self.palette_panel.show()
+        self.palette_panel.raise_()
+
+    def palette_failed(self, message):
+        QMessageBox.warning(self, self.lang_manager.tr("palette"), message)
+
+    def retranslateUi(self):
+        self.setWindowTitle(self.lang_manager.tr("title"))
+        self.harmony_panel.retranslateUi()
+        self.palette_panel.retranslateUi()
+        self.ramp_panel.retranslateUi()
+        self.eyedropper_panel.retranslateUi()
+        self.update_all_outputs()
+        self.update_preview()
+
+def main(argv=None):
+    app = QApplication(sys.argv if argv is None else argv)
+    app.setStyle("Fusion")
+    font = QFont("Segoe UI", 11)
+    app.setFont(font)
+    window = MainWindow()
+    window.show()
+    if PROBES_ENABLED and TRACE_FILE:
+        app.aboutToQuit.connect(lambda: profiler.dump(TRACE_FILE))
+    return app.exec()
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
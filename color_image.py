@@ -0,0 +1,156 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from color_cli import FROM_RGB
+from color_palette import open_image
+
+# Whole-image conversion from RGB to the channels of another color space,
+# with the same batch kernels (and therefore the same rounding) as the scalar
+# ColorConverter methods. Each row stripe maps only its own window of the
+# input and output files and unmaps it when done, so resident memory stays a
+# few stripes per worker no matter how large the image is.
+LAYOUTS = ("interleaved", "planar", "channels")
+CHANNELS = {
+    "hsv": "hsv", "hsl": "hsl", "cmyk": "cmyk", "yuv": "yuv",
+    "xyz": "xyz", "lab": "lab", "lch": "lch", "oklab": "lab",
+}
+# The kernels keep several float64 temporaries per pixel, so stripes are
+# sized by pixel count rather than rows to bound memory on wide images.
+STRIPE_PIXELS = 1 << 18
+DTYPES = {
+    "hsv": np.uint16, "hsl": np.uint16, "cmyk": np.uint8, "yuv": np.int16,
+    "xyz": np.float32, "lab": np.float32, "lch": np.float32, "oklab": np.float32,
+}
+
+def open_input(path, width=None, height=None):
+    # Raw interleaved RGB needs its size; .ppm/.npy carry it in the header.
+    if width and height:
+        return np.memmap(path, dtype=np.uint8, mode="r", shape=(height, width, 3))
+    return open_image(path)
+
+def channel_path(path, channel):
+    if "{channel}" in path:
+        return path.format(channel=channel)
+    root, ext = os.path.splitext(path)
+    return f"{root}.{channel}{ext}"
+
+def output_plan(path, space, layout, height, width):
+    # Returns (final path, shape) per output file, in channel order.
+    names = CHANNELS[space]
+    if layout == "interleaved":
+        return [(path, (height, width, len(names)))]
+    if layout == "planar":
+        return [(path, (len(names), height, width))]
+    return [(channel_path(path, name), (height, width)) for name in names]
+
+def create_output(path, npy, shape, dtype):
+    # Sizes the file (and writes the .npy header); returns (path, data
+    # offset, dtype, shape) for map_rows.
+    if npy:
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    else:
+        out = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+    spec = (path, out.offset, np.dtype(dtype).str, shape)
+    del out
+    return spec
+
+def map_spec(image):
+    if isinstance(image, np.memmap) and image.filename and image.flags.c_contiguous:
+        return (image.filename, image.offset, image.dtype.str, image.shape)
+    return None
+
+def map_rows(spec, start, stop, mode, plane=None):
+    # Maps rows start:stop of an (H, W, ...) file, or of one plane of a
+    # (C, H, W) file, without touching the rest of it.
+    path, offset, dtype, shape = spec
+    dtype = np.dtype(dtype)
+    if plane is not None:
+        row = shape[2] * dtype.itemsize
+        offset += (plane * shape[1] + start) * row
+        window = (stop - start, shape[2])
+    else:
+        row = int(np.prod(shape[1:])) * dtype.itemsize
+        offset += start * row
+        window = (stop - start,) + tuple(shape[1:])
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=window)
+
+def convert_stripe(source, targets, space, layout, start, stop):
+    rgb = map_rows(source, start, stop, "r") if isinstance(source, tuple) else source[start:stop]
+    values = FROM_RGB[space](np.asarray(rgb[..., :3])).astype(DTYPES[space], copy=False)
+    del rgb
+    if layout == "interleaved":
+        windows = [(map_rows(targets[0], start, stop, "r+"), values)]
+    elif layout == "planar":
+        windows = [(map_rows(targets[0], start, stop, "r+", c), values[..., c]) for c in range(values.shape[-1])]
+    else:
+        windows = [(map_rows(target, start, stop, "r+"), values[..., c]) for c, target in enumerate(targets)]
+    for out, data in windows:
+        out[:] = data
+        out.flush()
+
+def convert_image(src, dst, space, layout="interleaved", width=None, height=None, workers=1, stripe_rows=None):
+    if space not in FROM_RGB:
+        raise ValueError(f"unknown target space: {space}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout: {layout}")
+    image = open_input(src, width, height)
+    rows, cols = image.shape[:2]
+    stripe_rows = stripe_rows or max(1, STRIPE_PIXELS // cols)
+    npy = dst.lower().endswith(".npy")
+    plan = output_plan(dst, space, layout, rows, cols)
+    # Every file is written under a temporary name and renamed at the end,
+    # so an interrupted run never leaves a truncated output behind.
+    parts = [f"{path}.part" for path, _ in plan]
+    stripes = [(start, min(start + stripe_rows, rows)) for start in range(0, rows, stripe_rows)]
+    source = map_spec(image)
+    try:
+        targets = [create_output(part, npy, shape, DTYPES[space]) for part, (_, shape) in zip(parts, plan)]
+        if workers > 1 and source is not None:
+            del image
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(convert_stripe, source, targets, space, layout, start, stop)
+                           for start, stop in stripes]
+                for future in futures:
+                    future.result()
+        else:
+            for start, stop in stripes:
+                convert_stripe(source or image, targets, space, layout, start, stop)
+    except BaseException:
+        for part in parts:
+            if os.path.exists(part):
+                os.remove(part)
+        raise
+    for (path, _), part in zip(plan, parts):
+        os.replace(part, path)
+    return [path for path, _ in plan]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_image", description="Convert a whole RGB image to the channels of another color space.")
+    parser.add_argument("input", help="RGB image (.ppm/.npy, raw interleaved RGB with --width/--height, or any Pillow format)")
+    parser.add_argument("output", help="output file; .npy gets a NumPy header, anything else is written raw")
+    parser.add_argument("--to", dest="space", required=True, choices=list(FROM_RGB), help="target color space")
+    parser.add_argument("--layout", choices=LAYOUTS, default="interleaved",
+                        help="interleaved (H, W, C), planar (C, H, W) or one file per channel (default: interleaved)")
+    parser.add_argument("--width", type=int, help="width of a raw RGB input")
+    parser.add_argument("--height", type=int, help="height of a raw RGB input")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per core)")
+    parser.add_argument("--stripe-rows", type=int, help=f"rows per stripe (default: {STRIPE_PIXELS} pixels' worth)")
+    args = parser.parse_args(argv)
+    if bool(args.width) != bool(args.height):
+        parser.error("--width and --height must be given together")
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    try:
+        paths = convert_image(args.input, args.output, args.space, args.layout, args.width, args.height,
+                              workers, args.stripe_rows)
+    except (ValueError, OSError) as e:
+        print(f"color_image: error: {e}", file=sys.stderr)
+        return 1
+    dtype = np.dtype(DTYPES[args.space]).name
+    for path, name in zip(paths, CHANNELS[args.space] if args.layout == "channels" else [CHANNELS[args.space]]):
+        print(f"{path}  {name}  {dtype}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
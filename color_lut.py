@@ -0,0 +1,96 @@
+import os
+import numpy as np
+from color_core import ColorConverter
+
+# Every 24-bit RGB value is precomputed once per color space and stored as a
+# memory-mapped .npy file, so conversions become a single indexed gather and
+# several processes share the same pages through the OS cache.
+LUT_VERSION = 1
+LUT_SIZE = 1 << 24
+BUILD_CHUNK = 1 << 20
+
+# (converter, [(field, dtype), ...]) -- the narrowest dtype that holds the
+# scalar method's output range for each channel.
+LUT_SPACES = {
+    "hsv": (ColorConverter.rgb_to_hsv_array, [("h", "<u2"), ("s", "u1"), ("v", "u1")]),
+    "hsl": (ColorConverter.rgb_to_hsl_array, [("h", "<u2"), ("s", "u1"), ("l", "u1")]),
+    "cmyk": (ColorConverter.rgb_to_cmyk_array, [("c", "u1"), ("m", "u1"), ("y", "u1"), ("k", "u1")]),
+    "yuv": (ColorConverter.rgb_to_yuv_array, [("y", "u1"), ("u", "u1"), ("v", "<i2")]),
+}
+
+def default_lut_dir():
+    return os.environ.get(
+        "COLOR_LUT_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "color_converter", "lut")
+    )
+
+def pack_rgb(rgb):
+    rgb = np.asarray(rgb)
+    if rgb.ndim == 0 or rgb.shape[-1] != 3:
+        raise ValueError(f"expected an array with a trailing axis of 3, got shape {rgb.shape}")
+    if rgb.dtype != np.uint8:
+        rgb = np.clip(rgb, 0, 255).astype(np.uint8)
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+def unpack_rgb(packed):
+    packed = np.asarray(packed, dtype=np.uint32)
+    return np.stack([(packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF], axis=-1).astype(np.uint8)
+
+class ColorLUT:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_lut_dir()
+        self.tables = {}
+
+    def path(self, space):
+        return os.path.join(self.cache_dir, f"{space}-v{LUT_VERSION}.npy")
+
+    def table(self, space):
+        if space not in LUT_SPACES:
+            raise ValueError(f"unknown LUT space: {space}")
+        table = self.tables.get(space)
+        if table is None:
+            path = self.path(space)
+            if not os.path.exists(path):
+                self.build(space)
+            table = np.load(path, mmap_mode="r")
+            self.tables[space] = table
+        return table
+
+    def build(self, space):
+        converter, fields = LUT_SPACES[space]
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(space)
+        # Write to a per-process temp file and rename, so concurrent builders
+        # never expose a half-written table to readers.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.dtype(fields), shape=(LUT_SIZE,))
+        try:
+            for start in range(0, LUT_SIZE, BUILD_CHUNK):
+                idx = np.arange(start, start + BUILD_CHUNK, dtype=np.uint32)
+                values = converter(unpack_rgb(idx))
+                for i, (name, _) in enumerate(fields):
+                    out[name][start:start + BUILD_CHUNK] = values[:, i]
+            out.flush()
+            del out
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.tables.pop(space, None)
+        return path
+
+    def build_all(self):
+        return [self.build(space) for space in LUT_SPACES if not os.path.exists(self.path(space))]
+
+    def convert(self, space, rgb):
+        rgb = np.asarray(rgb)
+        if rgb.dtype.kind == "f" and not np.array_equal(rgb, np.round(rgb)):
+            # Fractional channels are not in the table; use the exact kernel.
+            return LUT_SPACES[space][0](rgb)
+        rows = self.table(space)[pack_rgb(rgb)]
+        return np.stack([rows[name] for name, _ in LUT_SPACES[space][1]], axis=-1).astype(np.int16)
+
+    def lookup(self, space, r, g, b):
+        row = self.table(space)[int(pack_rgb((r, g, b)))]
+        return tuple(int(row[name]) for name, _ in LUT_SPACES[space][1])
@@ -0,0 +1,271 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import numpy as np
+from color_core import ColorConverter
+from color_lut import unpack_rgb
+from color_names import CSS_COLORS
+from color_parse import describe, parse_colors, parse_colors_strict
+
+# Nearest-color lookup against reference palettes. Entries are bucketed into
+# a uniform grid in a perceptual space (CIELAB by default, so distances are
+# CIE76 delta-E) and queries search outward ring by ring until no closer
+# entry can exist. A built index is a directory of .npy files that later
+# startups memory-map instead of rebuilding.
+INDEX_VERSION = 1
+INDEX_SPACES = {
+    "lab": (ColorConverter.rgb_to_lab_array, 1.0),
+    "oklab": (ColorConverter.rgb_to_oklab_array, 100.0),
+}
+# The sRGB gamut fills only a small part of its bounding box in Lab, so a
+# low average keeps the occupied cells down to a few entries each.
+ENTRIES_PER_CELL = 0.1
+MAX_CELLS = 1 << 21
+QUERY_CHUNK = 4096
+
+def load_palette(path):
+    # CSV rows are "name,color" or "name,r,g,b"; JSON is {"name": color} or
+    # a list of {"name": ..., "hex": ...} objects. Colors are CSS color
+    # strings; alpha is dropped.
+    names = []
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        items = data.items() if isinstance(data, dict) else ((d["name"], d["hex"]) for d in data)
+        values = []
+        for name, value in items:
+            names.append(str(name))
+            values.append(str(value))
+        return names, unpack_rgb(parse_colors_strict(values, f"{path}: entry")).reshape(-1, 3)
+    lines, values = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if not row or (len(row) == 1 and row[0].startswith("#")):
+                continue
+            if len(row) == 2:
+                value = row[1].strip()
+            elif len(row) == 4:
+                try:
+                    value = [int(v) for v in row[1:]]
+                except ValueError:
+                    value = None
+                if value is None or not all(0 <= v <= 255 for v in value):
+                    raise ValueError(f"{path}: line {reader.line_num}: expected r,g,b integers in 0-255, got {row[1:]!r}")
+            else:
+                raise ValueError(f"{path}: line {reader.line_num}: expected 'name,color' or 'name,r,g,b', got {row!r}")
+            names.append(row[0].strip())
+            lines.append(reader.line_num)
+            values.append(value)
+    strings = [i for i, value in enumerate(values) if isinstance(value, str)]
+    packed, errors = parse_colors([values[i] for i in strings])
+    bad = np.flatnonzero(errors)
+    if len(bad):
+        i = strings[bad[0]]
+        raise ValueError(f"{path}: line {lines[i]}: {describe(errors[bad[0]])}: {values[i]!r}")
+    for i, rgb in zip(strings, unpack_rgb(packed).tolist()):
+        values[i] = rgb
+    return names, np.array(values, dtype=np.uint8).reshape(-1, 3)
+
+def css_palette():
+    return list(CSS_COLORS), unpack_rgb(parse_colors_strict(list(CSS_COLORS.values())))
+
+def palette_digest(names, rgb, space):
+    h = hashlib.sha1(f"{INDEX_VERSION}:{space}".encode())
+    h.update(np.ascontiguousarray(rgb, dtype=np.uint8).tobytes())
+    h.update("\0".join(names).encode("utf-8"))
+    return h.hexdigest()
+
+def ring_offsets(rho):
+    r = np.arange(-rho, rho + 1)
+    grid = np.stack(np.meshgrid(r, r, r, indexing="ij"), axis=-1).reshape(-1, 3)
+    return grid[np.abs(grid).max(axis=1) == rho]
+
+class NearestColorIndex:
+    def __init__(self, names, rgb, points, cell_start, origin, cell_size, dims, space="lab", digest=None):
+        self.names = names
+        self.rgb = rgb
+        self.points = points
+        self.cell_start = cell_start
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        self.dims = np.asarray(dims, dtype=np.int64)
+        self.space = space
+        self.digest = digest
+
+    def __len__(self):
+        return len(self.points)
+
+    @classmethod
+    def build(cls, names, rgb, space="lab"):
+        if space not in INDEX_SPACES:
+            raise ValueError(f"unknown index space: {space}")
+        rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+        if len(rgb) == 0 or len(names) != len(rgb):
+            raise ValueError("palette must have one name per color and at least one entry")
+        digest = palette_digest(list(names), rgb, space)
+        convert, scale = INDEX_SPACES[space]
+        points = convert(rgb) * scale
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        extent = np.maximum(hi - lo, 1e-6)
+        cell_size = float(np.cbrt(np.prod(extent) * ENTRIES_PER_CELL / len(points)))
+        cell_size = max(cell_size, float(np.cbrt(np.prod(extent) / MAX_CELLS)), 1e-3)
+        dims = np.floor(extent / cell_size).astype(np.int64) + 1
+        cells = cls._cell_ids(cls._cells(points, lo, cell_size, dims), dims)
+        order = np.argsort(cells, kind="stable")
+        cell_start = np.zeros(int(np.prod(dims)) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=int(np.prod(dims))), out=cell_start[1:])
+        names = np.array(names, dtype=str)[order]
+        return cls(names, rgb[order], points[order], cell_start, lo, cell_size, dims, space, digest)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in ("names", "rgb", "points", "cell_start"):
+            np.save(os.path.join(path, f"{name}.npy"), np.asarray(getattr(self, name)))
+        meta = {
+            "version": INDEX_VERSION, "space": self.space, "origin": self.origin.tolist(),
+            "cell_size": self.cell_size, "dims": self.dims.tolist(), "digest": self.digest,
+        }
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path}: index version {meta.get('version')} is not {INDEX_VERSION}")
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+                  for name in ("names", "rgb", "points", "cell_start")}
+        return cls(arrays["names"], arrays["rgb"], arrays["points"], arrays["cell_start"],
+                   meta["origin"], meta["cell_size"], meta["dims"], meta["space"], meta["digest"])
+
+    @classmethod
+    def open(cls, path, names, rgb, space="lab"):
+        # Memory-maps the saved index when it matches the palette; otherwise
+        # rebuilds it once and saves it for the next startup.
+        digest = palette_digest(list(names), np.asarray(rgb, dtype=np.uint8), space)
+        try:
+            index = cls.load(path)
+            if index.digest == digest:
+                return index
+        except (OSError, ValueError, KeyError):
+            pass
+        index = cls.build(names, rgb, space)
+        index.save(path)
+        return index
+
+    @staticmethod
+    def _cells(points, origin, cell_size, dims):
+        cells = np.floor((points - origin) / cell_size).astype(np.int64)
+        return np.clip(cells, 0, dims - 1)
+
+    @staticmethod
+    def _cell_ids(cells, dims):
+        return (cells[..., 0] * dims[1] + cells[..., 1]) * dims[2] + cells[..., 2]
+
+    def to_points(self, rgb):
+        convert, scale = INDEX_SPACES[self.space]
+        return convert(rgb) * scale
+
+    def query(self, rgb, k=1):
+        # Returns (distances, indices), each of shape (..., k), sorted by
+        # distance. Distances are Euclidean in the index space.
+        queries = self.to_points(rgb)
+        shape = queries.shape[:-1]
+        queries = queries.reshape(-1, 3)
+        k = max(1, min(int(k), len(self.points)))
+        dist = np.empty((len(queries), k))
+        idx = np.empty((len(queries), k), dtype=np.int64)
+        for start in range(0, len(queries), QUERY_CHUNK):
+            d, i = self._query_chunk(queries[start:start + QUERY_CHUNK], k)
+            dist[start:start + len(d)] = d
+            idx[start:start + len(d)] = i
+        return dist.reshape(shape + (k,)), idx.reshape(shape + (k,))
+
+    def _query_chunk(self, queries, k):
+        n = len(queries)
+        points = np.asarray(self.points)
+        cell_start = np.asarray(self.cell_start)
+        lo = self.origin
+        hi = lo + self.dims * self.cell_size
+        clamped = np.clip(queries, lo, hi)
+        outside = np.sqrt(((queries - clamped) ** 2).sum(axis=1))
+        qcell = self._cells(clamped, lo, self.cell_size, self.dims)
+        best_d = np.full((n, k), np.inf)
+        best_i = np.full((n, k), -1, dtype=np.int64)
+        active = np.arange(n)
+        for rho in range(int(self.dims.max()) + 1):
+            offsets = ring_offsets(rho)
+            cells = qcell[active][:, None, :] + offsets[None, :, :]
+            valid = ((cells >= 0) & (cells < self.dims)).all(axis=-1)
+            ids = self._cell_ids(np.where(valid[..., None], cells, 0), self.dims)
+            starts = cell_start[ids]
+            counts = np.where(valid, cell_start[ids + 1] - starts, 0).ravel()
+            total = int(counts.sum())
+            if total:
+                slot = np.repeat(np.arange(counts.size), counts)
+                first = np.cumsum(counts) - counts
+                entry = starts.ravel()[slot] + (np.arange(total) - first[slot])
+                owner = slot // len(offsets)
+                d = ((points[entry] - queries[active][owner]) ** 2).sum(axis=1)
+                # Merge the new candidates with the current best k per query.
+                all_owner = np.concatenate([np.repeat(np.arange(len(active)), k), owner])
+                all_d = np.concatenate([best_d[active].ravel(), d])
+                all_i = np.concatenate([best_i[active].ravel(), entry])
+                order = np.lexsort((all_d, all_owner))
+                all_owner, all_d, all_i = all_owner[order], all_d[order], all_i[order]
+                group_start = np.searchsorted(all_owner, np.arange(len(active)))
+                rank = np.arange(len(all_owner)) - group_start[all_owner]
+                keep = rank < k
+                best_d[active] = all_d[keep].reshape(-1, k)
+                best_i[active] = all_i[keep].reshape(-1, k)
+            bound = np.maximum(rho * self.cell_size - outside[active], 0.0)
+            done = best_d[active, k - 1] <= bound ** 2
+            active = active[~done]
+            if not len(active):
+                break
+        return np.sqrt(best_d), best_i
+
+    def nearest(self, rgb, k=1):
+        dist, idx = self.query(rgb, k)
+        names = np.asarray(self.names)[idx]
+        return names, np.asarray(self.rgb)[idx], dist
+
+    def match(self, r, g, b):
+        dist, idx = self.query((r, g, b), 1)
+        i = int(idx[0])
+        cr, cg, cb = (int(v) for v in self.rgb[i])
+        return str(self.names[i]), ColorConverter.rgb_to_hex(cr, cg, cb), float(dist[0])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_match", description="Find the nearest named colors in a reference palette.")
+    parser.add_argument("colors", nargs="*", help="CSS colors to match (default: read from stdin)")
+    parser.add_argument("--palette", help="reference palette (.csv or .json; default: CSS named colors)")
+    parser.add_argument("--index", help="index directory to memory-map, built on first use")
+    parser.add_argument("--space", choices=list(INDEX_SPACES), default="lab", help="matching space (default: lab)")
+    parser.add_argument("-k", type=int, default=1, help="number of matches per color (default: 1)")
+    args = parser.parse_args(argv)
+    try:
+        names, rgb = load_palette(args.palette) if args.palette else css_palette()
+        if args.index:
+            index = NearestColorIndex.open(args.index, names, rgb, args.space)
+        else:
+            index = NearestColorIndex.build(names, rgb, args.space)
+        values = args.colors or [line.strip() for line in sys.stdin if line.strip()]
+        queries = unpack_rgb(parse_colors_strict(values, "color")).reshape(-1, 3)
+    except (ValueError, OSError) as e:
+        print(f"color_match: error: {e}", file=sys.stderr)
+        return 1
+    match_names, match_rgb, dist = index.nearest(queries, args.k)
+    for value, row_names, row_rgb, row_dist in zip(values, match_names, match_rgb, dist):
+        matches = "  ".join(f"{name} {ColorConverter.rgb_to_hex(*map(int, c))} ({d:.2f})"
+                            for name, c, d in zip(row_names, row_rgb, row_dist))
+        print(f"{value}  {matches}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
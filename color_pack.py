@@ -0,0 +1,241 @@
+import numpy as np
+from color_core import ColorConverter
+from color_parse import describe, parse_color, parse_colors, unpack_argb
+
+# Compact color storage. A color is one 32-bit 0xAARRGGBB integer, the same
+# packing color_parse produces (and QImage.Format_ARGB32 uses), so a palette
+# of N colors is a 4N-byte array instead of N tuples. Palettes are stored
+# little-endian, which makes the bytes of each entry B, G, R, A.
+PACKED_DTYPE = np.dtype("<u4")
+SPACE_CHANNELS = {
+    "rgb": "rgb", "hsv": "hsv", "hsl": "hsl", "cmyk": "cmyk", "yuv": "yuv",
+    "xyz": "xyz", "lab": "lab", "lch": "lch", "oklab": "lab",
+}
+
+def pack_argb(r, g, b, a=255):
+    return (a & 0xFF) << 24 | (r & 0xFF) << 16 | (g & 0xFF) << 8 | (b & 0xFF)
+
+def pack_rgba_array(rgba, alpha=255):
+    # (..., 3) or (..., 4) channels -> packed array; values are clamped.
+    rgba = np.asarray(rgba)
+    if rgba.ndim == 0 or rgba.shape[-1] not in (3, 4):
+        raise ValueError(f"expected an array with a trailing axis of 3 or 4, got shape {rgba.shape}")
+    if rgba.dtype != np.uint8:
+        rgba = np.clip(np.round(rgba), 0, 255).astype(np.uint8)
+    rgba = rgba.astype(np.uint32)
+    a = rgba[..., 3] if rgba.shape[-1] == 4 else np.uint32(alpha & 0xFF)
+    return ((a << 24) | (rgba[..., 0] << 16) | (rgba[..., 1] << 8) | rgba[..., 2]).astype(PACKED_DTYPE)
+
+def _channel_index(space, channel):
+    if space not in SPACE_CHANNELS:
+        raise ValueError(f"unknown color space: {space}")
+    if isinstance(channel, str):
+        names = SPACE_CHANNELS[space]
+        if channel not in names:
+            raise ValueError(f"{space} has no channel {channel!r}; expected one of {', '.join(names)}")
+        return names.index(channel)
+    return channel
+
+class Color:
+    __slots__ = ("value",)
+
+    def __init__(self, r=0, g=0, b=0, a=255):
+        self.value = pack_argb(r, g, b, a)
+
+    @classmethod
+    def from_packed(cls, value):
+        color = cls.__new__(cls)
+        color.value = int(value) & 0xFFFFFFFF
+        return color
+
+    @classmethod
+    def from_string(cls, text):
+        rgba = parse_color(text)
+        if rgba is None:
+            raise ValueError(f"not a color: {text!r}")
+        return cls(*rgba)
+
+    @property
+    def r(self):
+        return (self.value >> 16) & 0xFF
+
+    @property
+    def g(self):
+        return (self.value >> 8) & 0xFF
+
+    @property
+    def b(self):
+        return self.value & 0xFF
+
+    @property
+    def a(self):
+        return self.value >> 24
+
+    @property
+    def rgb(self):
+        value = self.value
+        return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
+    @property
+    def rgba(self):
+        return self.rgb + (self.value >> 24,)
+
+    @property
+    def hex(self):
+        return ColorConverter.rgb_to_hex(*self.rgb, None if self.a == 255 else self.a)
+
+    # Unpacks as (r, g, b), so Color works wherever an RGB tuple did.
+    def __iter__(self):
+        return iter(self.rgb)
+
+    def __int__(self):
+        return self.value
+
+    def __index__(self):
+        return self.value
+
+    def __eq__(self, other):
+        if isinstance(other, Color):
+            return self.value == other.value
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        return f"Color({self.r}, {self.g}, {self.b}, {self.a})"
+
+class Palette:
+    # A view over a 1-D packed uint32 array. Slices share memory with the
+    # palette they came from; index arrays and masks copy, as in NumPy.
+    def __init__(self, colors=()):
+        if isinstance(colors, Palette):
+            self.packed = colors.packed.copy()
+        elif isinstance(colors, np.ndarray) and colors.ndim == 1 and colors.dtype.kind == "u":
+            self.packed = colors.astype(PACKED_DTYPE)
+        else:
+            self.packed = np.fromiter((int(c) if isinstance(c, Color) else pack_argb(*c) for c in colors),
+                                      dtype=PACKED_DTYPE)
+
+    @classmethod
+    def wrap(cls, packed):
+        # Adopts a packed array without copying it.
+        palette = cls.__new__(cls)
+        packed = np.asarray(packed)
+        if packed.ndim != 1 or packed.dtype != PACKED_DTYPE:
+            packed = np.ascontiguousarray(packed, dtype=PACKED_DTYPE).reshape(-1)
+        palette.packed = packed
+        return palette
+
+    @classmethod
+    def frombuffer(cls, buffer):
+        return cls.wrap(np.frombuffer(buffer, dtype=PACKED_DTYPE))
+
+    @classmethod
+    def from_rgb(cls, rgb, alpha=255):
+        return cls.wrap(pack_rgba_array(np.asarray(rgb).reshape(-1, np.shape(rgb)[-1]), alpha))
+
+    @classmethod
+    def from_strings(cls, values):
+        packed, errors = parse_colors(values)
+        bad = np.flatnonzero(errors)
+        if len(bad):
+            raise ValueError(f"entry {bad[0]}: {describe(errors[bad[0]])}")
+        return cls.wrap(packed)
+
+    def __len__(self):
+        return len(self.packed)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Color.from_packed(self.packed[index])
+        return Palette.wrap(self.packed[index])
+
+    def __setitem__(self, index, value):
+        if isinstance(value, Palette):
+            value = value.packed
+        elif isinstance(value, Color):
+            value = value.value
+        self.packed[index] = value
+
+    def __iter__(self):
+        return map(Color.from_packed, self.packed.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return self.packed.astype(dtype or PACKED_DTYPE)
+        return self.packed if dtype is None else self.packed.astype(dtype, copy=False)
+
+    # Buffer protocol on Python 3.12+; older versions go through __array__
+    # or memoryview(palette.packed).
+    def __buffer__(self, flags):
+        return memoryview(self.packed)
+
+    def __eq__(self, other):
+        if isinstance(other, Palette):
+            return np.array_equal(self.packed, other.packed)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        shown = ", ".join(c.hex for c in self[:4])
+        more = ", ..." if len(self) > 4 else ""
+        return f"Palette([{shown}{more}], n={len(self)})"
+
+    @property
+    def nbytes(self):
+        return self.packed.nbytes
+
+    @property
+    def bgra(self):
+        # Zero-copy (N, 4) byte view, B, G, R, A per entry.
+        return self.packed.view(np.uint8).reshape(-1, 4)
+
+    @property
+    def rgba(self):
+        return unpack_argb(self.packed)
+
+    @property
+    def rgb(self):
+        return self.bgra[:, 2::-1]
+
+    @property
+    def alpha(self):
+        return self.bgra[:, 3]
+
+    def copy(self):
+        return Palette.wrap(self.packed.copy())
+
+    def channel(self, space, channel=0):
+        # One channel of every entry converted to space, e.g. ("lab", "l").
+        # Each distinct color is converted once.
+        index = _channel_index(space, channel)
+        if space == "rgb":
+            return self.rgb[:, index].copy()
+        colors, inverse = np.unique(self.packed & 0xFFFFFF, return_inverse=True)
+        values = getattr(ColorConverter, f"rgb_to_{space}_array")(Palette.wrap(colors))
+        return values[:, index][inverse]
+
+    def argsort(self, space=None, channel=0, reverse=False):
+        # With no space, orders by the packed value (alpha, then RGB).
+        key = self.packed if space is None else self.channel(space, channel)
+        if reverse:
+            key = -key.astype(np.float64)
+        return np.argsort(key, kind="stable")
+
+    def sort(self, space=None, channel=0, reverse=False):
+        return self[self.argsort(space, channel, reverse)]
+
+    def unique(self, keep_order=False, return_counts=False):
+        # Distinct entries, sorted by packed value, or in order of first
+        # appearance with keep_order.
+        if not keep_order:
+            if return_counts:
+                values, counts = np.unique(self.packed, return_counts=True)
+                return Palette.wrap(values), counts
+            return Palette.wrap(np.unique(self.packed))
+        values, first, counts = np.unique(self.packed, return_index=True, return_counts=True)
+        order = np.argsort(first)
+        palette = Palette.wrap(values[order])
+        return (palette, counts[order]) if return_counts else palette
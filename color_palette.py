@@ -0,0 +1,244 @@
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from color_core import ColorConverter
+
+# Dominant-palette extraction. Images are read in row stripes (memory-mapped
+# where the format allows it) and reduced to a 15-bit color histogram that
+# also keeps the exact mean color of every bin; the quantizers then work on
+# at most 32768 weighted colors instead of the raw pixels.
+HIST_BITS = 5
+HIST_SIZE = 1 << (3 * HIST_BITS)
+STRIPE_ROWS = 256
+METHODS = ("median_cut", "kmeans")
+
+def read_ppm(path):
+    with open(path, "rb") as f:
+        head = f.read(512)
+    tokens = []
+    pos = 0
+    while len(tokens) < 4:
+        while pos < len(head) and head[pos:pos + 1].isspace():
+            pos += 1
+        if head[pos:pos + 1] == b"#":
+            pos = head.index(b"\n", pos) + 1
+            continue
+        end = pos
+        while end < len(head) and not head[end:end + 1].isspace():
+            end += 1
+        if end == pos:
+            raise ValueError(f"{path}: truncated PPM header")
+        tokens.append(head[pos:end])
+        pos = end
+    magic, width, height, maxval = tokens[0], int(tokens[1]), int(tokens[2]), int(tokens[3])
+    if magic != b"P6" or maxval != 255:
+        raise ValueError(f"{path}: only binary 8-bit PPM (P6, maxval 255) is supported")
+    return np.memmap(path, dtype=np.uint8, mode="r", offset=pos + 1, shape=(height, width, 3))
+
+def write_ppm(path, image):
+    image = np.asarray(image, dtype=np.uint8)
+    with open(path, "wb") as f:
+        f.write(f"P6\n{image.shape[1]} {image.shape[0]}\n255\n".encode("ascii"))
+        for start in range(0, image.shape[0], STRIPE_ROWS):
+            f.write(np.ascontiguousarray(image[start:start + STRIPE_ROWS, :, :3]).tobytes())
+
+def is_mappable(path):
+    return os.path.splitext(path)[1].lower() in (".npy", ".ppm", ".pnm")
+
+def open_image(source, max_samples=0):
+    # With max_samples, Pillow formats are decoded near that pixel budget
+    # instead of at full size. Images with transparency keep their alpha.
+    if not isinstance(source, str):
+        image = np.asarray(source) if not isinstance(source, np.ndarray) else source
+    else:
+        ext = os.path.splitext(source)[1].lower()
+        if ext == ".npy":
+            image = np.load(source, mmap_mode="r")
+        elif ext in (".ppm", ".pnm"):
+            image = read_ppm(source)
+        else:
+            try:
+                from PIL import Image
+            except ImportError:
+                raise ValueError(f"{source}: unsupported format {ext!r} (install Pillow to read it)") from None
+            with Image.open(source) as img:
+                mode = "RGBA" if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info else "RGB"
+                stride = sample_stride(img.height, img.width, max_samples)
+                if stride > 1:
+                    # JPEG decodes straight at 1/2, 1/4 or 1/8 scale; the
+                    # rest is shrunk by a whole factor as soon as it is read.
+                    img.draft(mode, (-(-img.width // stride), -(-img.height // stride)))
+                    if img.mode != mode:
+                        img = img.convert(mode)
+                    stride = sample_stride(img.height, img.width, max_samples)
+                    if stride > 1:
+                        img = img.reduce(stride)
+                image = np.asarray(img if img.mode == mode else img.convert(mode))
+    if image.ndim != 3 or image.shape[2] < 3:
+        raise ValueError(f"expected an (H, W, 3) image, got shape {image.shape}")
+    return image
+
+def sample_stride(height, width, max_samples):
+    if not max_samples or height * width <= max_samples:
+        return 1
+    return max(1, math.ceil(math.sqrt(height * width / max_samples)))
+
+def stripe_histogram(image, start, stop, stride):
+    block = np.asarray(image[start:stop:stride, ::stride], dtype=np.uint8)
+    if block.shape[2] > 3:
+        # Fully transparent pixels have no visible color.
+        block = block[block[..., 3] > 0]
+    block = block[..., :3].reshape(-1, 3)
+    shift = 8 - HIST_BITS
+    q = block >> shift
+    bins = (q[:, 0].astype(np.intp) << (2 * HIST_BITS)) | (q[:, 1].astype(np.intp) << HIST_BITS) | q[:, 2]
+    counts = np.bincount(bins, minlength=HIST_SIZE)
+    sums = np.stack([np.bincount(bins, weights=block[:, i], minlength=HIST_SIZE) for i in range(3)], axis=-1)
+    return counts, sums
+
+def _histogram_task(path, start, stop, stride):
+    return stripe_histogram(open_image(path), start, stop, stride)
+
+def image_histogram(source, max_samples=4000000, workers=1):
+    image = open_image(source, max_samples)
+    height, width = image.shape[:2]
+    stride = sample_stride(height, width, max_samples)
+    step = STRIPE_ROWS * stride
+    stripes = [(start, min(start + step, height)) for start in range(0, height, step)]
+    counts = np.zeros(HIST_SIZE, dtype=np.int64)
+    sums = np.zeros((HIST_SIZE, 3), dtype=np.float64)
+    if workers > 1 and isinstance(source, str) and is_mappable(source):
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_histogram_task, source, start, stop, stride) for start, stop in stripes]
+            for future in futures:
+                c, s = future.result()
+                counts += c
+                sums += s
+    else:
+        for start, stop in stripes:
+            c, s = stripe_histogram(image, start, stop, stride)
+            counts += c
+            sums += s
+    used = counts > 0
+    if not used.any():
+        raise ValueError("the image has no pixels to sample (it is empty or fully transparent)")
+    return sums[used] / counts[used, None], counts[used].astype(np.float64)
+
+def box_spread(colors, weights):
+    mean = np.average(colors, axis=0, weights=weights)
+    return (weights[:, None] * (colors - mean) ** 2).sum(axis=0), mean
+
+def median_cut(colors, weights, n):
+    # Variance-driven median cut: the box with the largest weighted squared
+    # error is split along its widest channel at the weighted mean, which
+    # keeps distinct color clusters apart better than a plain median split.
+    boxes = [np.arange(len(colors))]
+    while len(boxes) < n:
+        scores = []
+        for idx in boxes:
+            scores.append(box_spread(colors[idx], weights[idx])[0].sum() if len(idx) > 1 else -1.0)
+        best = int(np.argmax(scores))
+        if scores[best] <= 0:
+            break
+        idx = boxes.pop(best)
+        spread, mean = box_spread(colors[idx], weights[idx])
+        channel = int(np.argmax(spread))
+        order = idx[np.argsort(colors[idx, channel], kind="stable")]
+        cut = int(np.clip(np.searchsorted(colors[order, channel], mean[channel], side="right"), 1, len(order) - 1))
+        boxes += [order[:cut], order[cut:]]
+    palette = np.array([np.average(colors[idx], axis=0, weights=weights[idx]) for idx in boxes])
+    return palette, np.array([weights[idx].sum() for idx in boxes])
+
+def nearest(colors, centers):
+    d = (colors * colors).sum(axis=1)[:, None] - 2.0 * colors @ centers.T + (centers * centers).sum(axis=1)[None, :]
+    return np.argmin(d, axis=1), np.maximum(d.min(axis=1), 0.0)
+
+def kmeans(colors, weights, n, iterations=100, batch_size=2048, seed=0):
+    # Weighted k-means++ seeding followed by mini-batch updates with
+    # per-center learning rates.
+    rng = np.random.default_rng(seed)
+    n = min(n, len(colors))
+    prob = weights / weights.sum()
+    centers = [colors[rng.choice(len(colors), p=prob)]]
+    dist = ((colors - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, n):
+        p = weights * dist
+        if p.sum() <= 0:
+            break
+        centers.append(colors[rng.choice(len(colors), p=p / p.sum())])
+        dist = np.minimum(dist, ((colors - centers[-1]) ** 2).sum(axis=1))
+    centers = np.array(centers, dtype=np.float64)
+    totals = np.zeros(len(centers))
+    for _ in range(iterations):
+        batch = rng.choice(len(colors), size=min(batch_size, len(colors)), p=prob)
+        labels, _ = nearest(colors[batch], centers)
+        w = np.bincount(labels, minlength=len(centers)).astype(np.float64)
+        sums = np.stack([np.bincount(labels, weights=colors[batch, i], minlength=len(centers)) for i in range(3)], axis=-1)
+        hit = w > 0
+        totals[hit] += w[hit]
+        centers[hit] += (w[hit] / totals[hit])[:, None] * (sums[hit] / w[hit, None] - centers[hit])
+    labels, _ = nearest(colors, centers)
+    counts = np.bincount(labels, weights=weights, minlength=len(centers))
+    keep = counts > 0
+    return centers[keep], counts[keep]
+
+def extract_palette(source, n=8, method="median_cut", max_samples=4000000, workers=1, seed=0):
+    if method not in METHODS:
+        raise ValueError(f"unknown palette method: {method}")
+    if n < 1:
+        raise ValueError("palette size must be at least 1")
+    colors, weights = image_histogram(source, max_samples, workers)
+    if method == "kmeans":
+        palette, counts = kmeans(colors, weights, n, seed=seed)
+    else:
+        palette, counts = median_cut(colors, weights, n)
+    order = np.argsort(-counts, kind="stable")
+    rgb = np.clip(np.round(palette[order]), 0, 255).astype(np.uint8)
+    return rgb, counts[order] / counts.sum()
+
+def describe_palette(rgb, fractions):
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    spaces = {
+        "hsv": ColorConverter.rgb_to_hsv_array(rgb).tolist(),
+        "hsl": ColorConverter.rgb_to_hsl_array(rgb).tolist(),
+        "cmyk": ColorConverter.rgb_to_cmyk_array(rgb).tolist(),
+        "yuv": ColorConverter.rgb_to_yuv_array(rgb).tolist(),
+    }
+    swatches = []
+    for i, (r, g, b) in enumerate(rgb.tolist()):
+        swatch = {"hex": ColorConverter.rgb_to_hex(r, g, b), "rgb": [r, g, b], "fraction": float(fractions[i])}
+        for space, values in spaces.items():
+            swatch[space] = values[i]
+        swatches.append(swatch)
+    return swatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_palette", description="Extract a dominant color palette from an image.")
+    parser.add_argument("image", help="image file (.ppm/.npy are memory-mapped; other formats need Pillow)")
+    parser.add_argument("-n", "--colors", type=int, default=8, help="palette size (default: 8)")
+    parser.add_argument("--method", choices=METHODS, default="median_cut", help="quantizer (default: median_cut)")
+    parser.add_argument("--max-samples", type=int, default=4000000, help="pixel budget before downsampling (0 = all pixels)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (0 = one per core)")
+    parser.add_argument("--json", action="store_true", help="print the palette as JSON")
+    args = parser.parse_args(argv)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    try:
+        rgb, fractions = extract_palette(args.image, args.colors, args.method, args.max_samples, workers)
+    except (ValueError, OSError) as e:
+        print(f"color_palette: error: {e}", file=sys.stderr)
+        return 1
+    swatches = describe_palette(rgb, fractions)
+    if args.json:
+        print(json.dumps(swatches, indent=2))
+        return 0
+    for s in swatches:
+        print(f"{s['hex']}  {s['fraction'] * 100:5.1f}%  RGB{tuple(s['rgb'])}  HSV{tuple(s['hsv'])}  "
+              f"HSL{tuple(s['hsl'])}  CMYK{tuple(s['cmyk'])}  YUV{tuple(s['yuv'])}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import numpy as np
+from color_core import ColorConverter
+from color_names import CSS_COLORS
+
+# Bulk parsing of CSS color strings: #RGB, #RGBA, #RRGGBB, #RRGGBBAA (the
+# six and eight digit forms also without '#'), rgb()/rgba(), hsl()/hsla()
+# with comma or space separated arguments and an optional "/ alpha", and
+# CSS named colors. Rows are laid out as a fixed-width byte matrix and every
+# step runs on whole columns of it, so no Python code runs per row. Results
+# are packed as 0xAARRGGBB, whose low 24 bits are color_lut.pack_rgb, and
+# each row gets an error code instead of an exception.
+OK = 0
+EMPTY = 1
+SYNTAX = 2
+HEX_LENGTH = 3
+UNKNOWN_NAME = 4
+ARGUMENTS = 5
+TOO_LONG = 6
+ERRORS = {
+    OK: "ok", EMPTY: "empty value", SYNTAX: "invalid syntax", HEX_LENGTH: "HEX needs 3, 4, 6 or 8 digits",
+    UNKNOWN_NAME: "unknown color name", ARGUMENTS: "expected 3 or 4 arguments", TOO_LONG: "value too long",
+}
+MAX_WIDTH = 64
+TOKEN_WIDTH = 16
+CHUNK_ROWS = 1 << 16
+
+_NIBBLE = np.full(256, 255, dtype=np.uint8)
+_NIBBLE[np.frombuffer(b"0123456789", np.uint8)] = np.arange(10)
+_NIBBLE[np.frombuffer(b"abcdef", np.uint8)] = np.arange(10, 16)
+_NIBBLE[np.frombuffer(b"ABCDEF", np.uint8)] = np.arange(10, 16)
+_SPACE = np.zeros(256, dtype=bool)
+_SPACE[[0, 9, 10, 13, 32]] = True
+_SEPARATOR = np.zeros(256, dtype=bool)
+_SEPARATOR[[32, 44, 47]] = True
+_NUMBER = np.zeros(256, dtype=bool)
+_NUMBER[np.frombuffer(b"0123456789.+-", np.uint8)] = True
+_FUNCTIONS = (b"rgb(", b"rgba(", b"hsl(", b"hsla(")
+# (digit offset, digit count) of the HEX forms: with '#' and bare.
+HEX_FORMS = ((1, 3), (1, 4), (1, 6), (1, 8), (0, 6), (0, 8))
+
+def _name_table():
+    names = dict((name.encode(), int(value[1:], 16) | 0xFF000000) for name, value in CSS_COLORS.items())
+    names[b"transparent"] = 0
+    keys = sorted(names)
+    width = max(len(k) for k in keys)
+    return np.array(keys, dtype=f"S{width}"), np.array([names[k] for k in keys], dtype=np.uint32)
+
+_NAMES, _NAME_VALUES = _name_table()
+
+def _rows_from_buffer(buf):
+    # One row per line; a final newline does not start another row.
+    buf = np.frombuffer(buf, dtype=np.uint8)
+    breaks = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [len(buf)]))
+    if not len(buf) or buf[-1] == 10:
+        starts, ends = starts[:-1], ends[:-1]
+    return buf, starts, ends
+
+def _matrix(buf, starts, ends):
+    lengths = ends - starts
+    width = int(min(max(lengths.max(initial=1), 1), MAX_WIDTH + 1))
+    cols = np.arange(width)
+    idx = np.minimum(starts[:, None] + cols, max(len(buf) - 1, 0))
+    data = buf[idx] if len(buf) else np.zeros(idx.shape, dtype=np.uint8)
+    data[cols >= lengths[:, None]] = 0
+    return data, lengths
+
+def _matrix_from_column(column):
+    arr = np.asarray(column)
+    if arr.dtype.kind not in "SU":
+        arr = arr.astype(str)
+    arr = arr.reshape(-1)
+    if arr.dtype.kind == "S":
+        # Copied, since rows are trimmed in place.
+        mat = arr.view(np.uint8).reshape(len(arr), -1).copy() if arr.itemsize else np.zeros((len(arr), 1), np.uint8)
+    else:
+        codes = arr.view(np.uint32).reshape(len(arr), -1) if arr.itemsize else np.zeros((len(arr), 1), np.uint32)
+        # Anything outside ASCII cannot be part of a CSS color.
+        mat = np.where(codes < 128, codes, 255).astype(np.uint8)
+    lengths = np.count_nonzero(mat, axis=1)
+    return mat[:, :MAX_WIDTH + 1], lengths
+
+def _normalize(mat):
+    # Returns the trimmed length of every row; rows with leading whitespace
+    # are shifted to column 0 (in place).
+    content = ~_SPACE[mat]
+    width = mat.shape[1]
+    filled = content.any(axis=1)
+    size = width - content[:, ::-1].argmax(axis=1)
+    lead_rows = np.flatnonzero(filled & ~content[:, 0])
+    if len(lead_rows):
+        lead = content[lead_rows].argmax(axis=1)
+        idx = np.minimum(lead[:, None] + np.arange(width), width - 1)
+        mat[lead_rows] = np.take_along_axis(mat[lead_rows], idx, axis=1)
+        size[lead_rows] -= lead
+    size[~filled] = 0
+    return size
+
+def _lower(sub, size):
+    # Lowercases and zeroes everything past the trimmed length.
+    sub = np.where((sub >= 65) & (sub <= 90), sub + 32, sub).astype(np.uint8)
+    sub[np.arange(sub.shape[1]) >= size[:, None]] = 0
+    return sub
+
+def _parse_hex(mat, size, sharp):
+    # Every form has a fixed digit offset and count, so each is decoded
+    # from plain column slices.
+    packed = np.zeros(len(mat), dtype=np.uint32)
+    errors = np.full(len(mat), HEX_LENGTH, dtype=np.uint8)
+    digits = size - sharp
+    for first, count in HEX_FORMS:
+        sel = np.flatnonzero((sharp == first) & (digits == count))
+        if not len(sel):
+            continue
+        n = _NIBBLE[mat[sel, first:first + count]].astype(np.uint32)
+        if count <= 4:
+            r, g, b = n[:, 0] * 17, n[:, 1] * 17, n[:, 2] * 17
+            a = n[:, 3] * 17 if count == 4 else np.uint32(255)
+        else:
+            r, g, b = (n[:, 0] << 4) | n[:, 1], (n[:, 2] << 4) | n[:, 3], (n[:, 4] << 4) | n[:, 5]
+            a = (n[:, 6] << 4) | n[:, 7] if count == 8 else np.uint32(255)
+        bad = (n == 255).any(axis=1)
+        packed[sel] = np.where(bad, 0, (a << 24) | (r << 16) | (g << 8) | b)
+        errors[sel] = np.where(bad, SYNTAX, OK)
+    return packed, errors
+
+def _parse_names(mat, size):
+    width = _NAMES.dtype.itemsize
+    keys = np.zeros((len(mat), width), dtype=np.uint8)
+    keys[:, :min(width, mat.shape[1])] = mat[:, :width]
+    keys = keys.view(f"S{width}").reshape(-1)
+    pos = np.minimum(np.searchsorted(_NAMES, keys), len(_NAMES) - 1)
+    found = (size <= width) & (_NAMES[pos] == keys)
+    return np.where(found, _NAME_VALUES[pos], 0).astype(np.uint32), np.where(found, OK, UNKNOWN_NAME).astype(np.uint8)
+
+def _parse_functions(sub, size, kind, prefix):
+    # kind is 0 for rgb() and 1 for hsl(); prefix is the length up to '('.
+    n, width = sub.shape
+    cols = np.arange(width)
+    closed = sub[np.arange(n), np.maximum(size - 1, 0)] == 41
+    inside = (cols >= prefix[:, None]) & (cols < (size - 1)[:, None])
+    token = inside & ~_SEPARATOR[sub]
+    starts = token & ~np.concatenate((np.zeros((n, 1), bool), token[:, :-1]), axis=1)
+    count = starts.sum(axis=1)
+    index = np.cumsum(starts, axis=1) - 1
+    start_col = np.maximum.accumulate(np.where(starts, cols, 0), axis=1)
+    offset = cols - start_col
+    keep = token & (index < 4) & (offset < TOKEN_WIDTH)
+    overflow = (token & (offset >= TOKEN_WIDTH)).any(axis=1)
+    # Every comma sits between two arguments: the nearest non-space column
+    # on each side must belong to a token.
+    significant = inside & ~_SPACE[sub]
+    before = np.maximum.accumulate(np.where(significant, cols, -1), axis=1)
+    before = np.concatenate((np.full((n, 1), -1), before[:, :-1]), axis=1)
+    after = np.minimum.accumulate(np.where(significant, cols, width)[:, ::-1], axis=1)[:, ::-1]
+    after = np.concatenate((after[:, 1:], np.full((n, 1), width)), axis=1)
+    # The padding column answers both -1 and width.
+    padded = np.concatenate((token, np.zeros((n, 1), bool)), axis=1)
+    row = np.arange(n)[:, None]
+    stray = (inside & (sub == 44) & ~(padded[row, before] & padded[row, after])).any(axis=1)
+    tokens = np.zeros((n, 4, TOKEN_WIDTH), dtype=np.uint8)
+    r_idx, c_idx = np.nonzero(keep)
+    tokens[r_idx, index[r_idx, c_idx], offset[r_idx, c_idx]] = sub[r_idx, c_idx]
+    lengths = np.count_nonzero(tokens, axis=2)
+    last = np.take_along_axis(tokens, np.maximum(lengths - 1, 0)[..., None], axis=2)[..., 0]
+    percent = (last == 37) & (lengths > 0)
+    tokens[percent, np.maximum(lengths - 1, 0)[percent]] = 0
+    lengths = lengths - percent
+    # Hue may carry a "deg" unit.
+    tail = np.take_along_axis(tokens[:, 0], np.maximum(lengths[:, 0:1] - 3 + np.arange(3), 0), axis=1)
+    deg = (kind == 1) & (lengths[:, 0] > 3) & (tail == np.frombuffer(b"deg", np.uint8)).all(axis=1)
+    tokens[deg, 0, lengths[deg, 0] - 3] = 0
+    tokens[deg, 0, lengths[deg, 0] - 2] = 0
+    tokens[deg, 0, lengths[deg, 0] - 1] = 0
+    lengths[deg, 0] -= 3
+    present = np.arange(4) < count[:, None]
+    used = np.arange(TOKEN_WIDTH) < lengths[..., None]
+    digit = (tokens >= 48) & (tokens <= 57)
+    sign = (tokens == 43) | (tokens == 45)
+    valid = (~used | _NUMBER[tokens]).all(axis=2) & digit.any(axis=2) & ((tokens == 46).sum(axis=2) <= 1)
+    valid &= ~(sign[..., 1:] & used[..., 1:]).any(axis=2)
+    valid |= ~present
+    # A hue cannot be a percentage.
+    syntax_ok = closed & ~overflow & ~stray & valid.all(axis=1) & ~((kind == 1) & percent[:, 0])
+    arity_ok = (count == 3) | (count == 4)
+    ok = syntax_ok & arity_ok
+    text = np.where((valid & present)[..., None], tokens, 0)
+    text[..., 0] = np.where(text[..., 0] == 0, 48, text[..., 0])
+    values = text.view(f"S{TOKEN_WIDTH}").reshape(n, 4).astype(np.float64)
+    alpha = np.where(count == 4, np.where(percent[:, 3], values[:, 3] / 100.0, values[:, 3]), 1.0)
+    a = np.round(np.clip(alpha, 0.0, 1.0) * 255).astype(np.uint32)
+    channels = values[:, :3]
+    rgb = np.where(percent[:, :3], channels * 2.55, channels)
+    rgb = np.round(np.clip(rgb, 0, 255)).astype(np.uint32)
+    if (kind == 1).any():
+        hsl = ColorConverter.hsl_to_rgb_array(channels).astype(np.uint32)
+        rgb = np.where((kind == 1)[:, None], hsl, rgb)
+    packed = np.where(ok, (a << 24) | (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2], 0).astype(np.uint32)
+    return packed, np.select([~syntax_ok, ~arity_ok], [SYNTAX, ARGUMENTS], OK).astype(np.uint8)
+
+def _parse_matrix(mat, lengths, packed, errors):
+    size = _normalize(mat)
+    packed[:] = 0
+    errors[:] = SYNTAX
+    errors[size == 0] = EMPTY
+    errors[lengths > MAX_WIDTH] = TOO_LONG
+    live = (size > 0) & (lengths <= MAX_WIDTH)
+    sharp = mat[:, 0] == 35
+    rest = np.flatnonzero(live & ~sharp)
+    # Six or eight bare hex digits are HEX too.
+    cand = rest[np.isin(size[rest], (6, 8))]
+    head = mat[cand, :8]
+    bare = cand[((_NIBBLE[head] != 255) | (np.arange(head.shape[1]) >= size[cand, None])).all(axis=1)]
+    rows = np.concatenate((np.flatnonzero(live & sharp), bare))
+    if len(rows):
+        packed[rows], errors[rows] = _parse_hex(mat[rows], size[rows], (mat[rows, 0] == 35).astype(np.int64))
+    rest = np.setdiff1d(rest, bare, assume_unique=True)
+    if not len(rest):
+        return
+    sub = _lower(mat[rest], size[rest])
+    letters = ((sub >= 97) & (sub <= 122)) | (sub == 0)
+    names = letters.all(axis=1)
+    if names.any():
+        packed[rest[names]], errors[rest[names]] = _parse_names(sub[names], size[rest][names])
+    sub, rest = sub[~names], rest[~names]
+    prefix = np.zeros(len(rest), dtype=np.int64)
+    kind = np.zeros(len(rest), dtype=np.int64)
+    for i, name in enumerate(_FUNCTIONS):
+        if sub.shape[1] >= len(name):
+            hit = (prefix == 0) & (sub[:, :len(name)] == np.frombuffer(name, np.uint8)).all(axis=1)
+            prefix[hit] = len(name)
+            kind[hit] = i // 2
+    calls = prefix > 0
+    if calls.any():
+        packed[rest[calls]], errors[rest[calls]] = _parse_functions(sub[calls], size[rest][calls], kind[calls], prefix[calls])
+
+def parse_colors(data, out=None):
+    # data is a bytes-like buffer with one value per line, or a sequence or
+    # array of str/bytes. Returns (packed uint32 0xAARRGGBB, uint8 error
+    # codes); failed rows are 0 with a nonzero code. Pass out=(packed,
+    # errors) to reuse arrays across calls.
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        buf, starts, ends = _rows_from_buffer(data)
+        count = len(starts)
+        source = lambda lo, hi: _matrix(buf, starts[lo:hi], ends[lo:hi])
+    else:
+        # Lists are converted a chunk at a time, so one long string only
+        # widens its own chunk.
+        column = data if isinstance(data, (np.ndarray, list, tuple)) else list(data)
+        count = len(column)
+        source = lambda lo, hi: _matrix_from_column(column[lo:hi])
+    if out is None:
+        out = (np.empty(count, dtype=np.uint32), np.empty(count, dtype=np.uint8))
+    packed, errors = out
+    if len(packed) < count or len(errors) < count:
+        raise ValueError(f"output arrays hold {min(len(packed), len(errors))} rows, need {count}")
+    for lo in range(0, count, CHUNK_ROWS):
+        hi = min(lo + CHUNK_ROWS, count)
+        mat, lengths = source(lo, hi)
+        _parse_matrix(mat, lengths, packed[lo:hi], errors[lo:hi])
+    return packed[:count], errors[:count]
+
+def parse_color(text):
+    # Single value; returns (r, g, b, a) or None.
+    packed, errors = parse_colors([text])
+    if errors[0]:
+        return None
+    value = int(packed[0])
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF, value >> 24
+
+def unpack_argb(packed):
+    packed = np.asarray(packed, dtype=np.uint32)
+    return np.stack([(packed >> 16) & 0xFF, (packed >> 8) & 0xFF, packed & 0xFF, packed >> 24], axis=-1).astype(np.uint8)
+
+def describe(code):
+    return ERRORS.get(int(code), f"error {int(code)}")
+
+def parse_colors_strict(values, label="value", start=1):
+    # parse_colors for a list of strings that must all be valid; the first
+    # bad one raises ValueError with its label and number.
+    packed, errors = parse_colors(values)
+    bad = np.flatnonzero(errors)
+    if len(bad):
+        i = int(bad[0])
+        value = values[i].decode(errors="replace") if isinstance(values[i], bytes) else values[i]
+        raise ValueError(f"{label} {start + i}: {describe(errors[i])}: {value!r}")
+    return packed
@@ -0,0 +1,123 @@
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+# Timing probes for the GUI hot paths. Probes are only installed when the
+# COLOR_PROBES environment variable is set before the GUI is imported;
+# otherwise probe() and probe_class() hand back the original functions, so
+# disabled probes add no calls at all. Durations go into per-name log2
+# histograms (bucket i counts calls shorter than 2**i microseconds) and a
+# bounded trace that dump() writes in the Chrome trace event format. The
+# slowest probe of an interaction is judged by self time, i.e. excluding
+# nested probes, so an outer handler does not hide the one that is slow.
+ENABLED = os.environ.get("COLOR_PROBES", "") not in ("", "0")
+TRACE_FILE = os.environ.get("COLOR_PROBES_TRACE")
+HIST_BUCKETS = 24
+TRACE_EVENTS = 200000
+
+class Profiler:
+    def __init__(self, trace_size=TRACE_EVENTS):
+        self.lock = threading.Lock()
+        self.trace = deque(maxlen=trace_size)
+        self.origin = time.perf_counter_ns()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+            self.trace.clear()
+            self.calls = 0
+            self.slowest = None
+            self.interactions = 0
+
+    def record(self, name, start, end, own=None):
+        duration = end - start
+        own = duration if own is None else own
+        with self.lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = [0, 0, 0, 0, [0] * HIST_BUCKETS]
+            stat[0] += 1
+            stat[1] += duration
+            stat[2] += own
+            stat[3] = max(stat[3], duration)
+            stat[4][min(HIST_BUCKETS - 1, (duration // 1000).bit_length())] += 1
+            self.trace.append((name, start, duration, threading.get_ident()))
+            self.calls += 1
+            if self.slowest is None or own > self.slowest[1]:
+                self.slowest = (name, own)
+
+    def end_interaction(self, frame_ns):
+        # Called once per GUI refresh: returns what happened since the last
+        # one (probe calls, slowest probe) and starts counting afresh.
+        with self.lock:
+            summary = {"frame_ms": frame_ns / 1e6, "calls": self.calls, "slowest": None, "slowest_ms": 0.0}
+            if self.slowest is not None:
+                summary["slowest"], summary["slowest_ms"] = self.slowest[0], self.slowest[1] / 1e6
+            self.calls = 0
+            self.slowest = None
+            self.interactions += 1
+            return summary
+
+    def histograms(self):
+        with self.lock:
+            return {
+                name: {
+                    "count": count, "total_ms": total / 1e6, "self_ms": own / 1e6, "mean_ms": total / count / 1e6,
+                    "max_ms": longest / 1e6, "log2_us_buckets": list(buckets),
+                }
+                for name, (count, total, own, longest, buckets) in sorted(self.stats.items())
+            }
+
+    def dump(self, path):
+        with self.lock:
+            events = [
+                {"name": name, "ph": "X", "ts": (start - self.origin) / 1000.0, "dur": duration / 1000.0,
+                 "pid": os.getpid(), "tid": tid}
+                for name, start, duration, tid in self.trace
+            ]
+        data = {"traceEvents": events, "displayTimeUnit": "ms", "histograms": self.histograms()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+profiler = Profiler()
+_nesting = threading.local()
+
+def probe(name=None):
+    def decorate(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            # Each stack entry accumulates the time spent in nested probes.
+            stack = _nesting.__dict__.setdefault("stack", [])
+            stack.append(0)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter_ns()
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += end - start
+                profiler.record(label, start, end, end - start - nested)
+        return timed
+    return decorate
+
+def probe_class(cls, prefix=None):
+    # Wraps every staticmethod of cls, inherited ones included, by setting
+    # the wrappers on cls itself; base classes are left untouched.
+    if not ENABLED:
+        return cls
+    prefix = prefix or cls.__name__
+    for name in dir(cls):
+        value = inspect.getattr_static(cls, name)
+        if isinstance(value, staticmethod):
+            setattr(cls, name, staticmethod(probe(f"{prefix}.{name}")(value.__func__)))
+    return cls
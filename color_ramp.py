@@ -0,0 +1,219 @@
+import argparse
+import json
+import math
+import os
+import sys
+import numpy as np
+from color_cache import ConversionCache
+from color_core import (
+    ColorConverter, OKLAB_M1_INV, OKLAB_M2_INV, XYZ_TO_RGB, _mat, _np_hls_to_rgb, _np_hsv_to_rgb,
+    _np_lab_to_lch, _np_lab_to_xyz, _np_lch_to_lab, _np_rgb_to_hls, _np_rgb_to_hsv, linear_to_srgb
+)
+from color_pack import Color, Palette
+from color_parse import describe, parse_colors
+
+# Color ramps: stops interpolated piecewise-linearly in one color space, the
+# whole ramp in a single vectorized pass. Hue spaces take the shorter way
+# around the wheel, and a gray stop borrows the hue of its neighbour so a
+# ramp from gray does not swing through red. With uniform=True the samples
+# are respaced to equal OKLab distance along the ramp. Ramps are RGBA in
+# 0-1, cached by their parameters and returned read-only.
+SPACES = ("rgb", "hsl", "hsv", "lab", "lch", "oklab")
+FORMATS = ("cube", "csv", "json")
+# (index, period) of the hue channel in each cylindrical space.
+HUE_CHANNEL = {"hsl": (0, 1.0), "hsv": (0, 1.0), "lch": (2, 360.0)}
+# Chroma-like channel whose zero makes the hue meaningless.
+CHROMA_CHANNEL = {"hsl": 2, "hsv": 1, "lch": 1}
+UNIFORM_SAMPLES = 4096
+MAX_SIZE = 1 << 20
+ramp_cache = ConversionCache(64)
+
+def _to_space(rgb, space):
+    # Float RGB in 0-1 -> (..., 3) channels of space, unrounded.
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    if space == "rgb":
+        return rgb
+    if space == "hsv":
+        return np.stack(_np_rgb_to_hsv(r, g, b), axis=-1)
+    if space == "hsl":
+        return np.stack(_np_rgb_to_hls(r, g, b), axis=-1)
+    lab = ColorConverter.rgb_to_lab_array(rgb * 255.0)
+    if space == "lab":
+        return lab
+    if space == "lch":
+        return np.stack(_np_lab_to_lch(lab[..., 0], lab[..., 1], lab[..., 2]), axis=-1)
+    if space == "oklab":
+        return ColorConverter.rgb_to_oklab_array(rgb * 255.0)
+    raise ValueError(f"unknown ramp space: {space}")
+
+def _from_space(values, space):
+    # Inverse of _to_space, clipped to the sRGB cube but not quantized.
+    a, b, c = values[..., 0], values[..., 1], values[..., 2]
+    if space == "rgb":
+        rgb = (a, b, c)
+    elif space == "hsv":
+        rgb = _np_hsv_to_rgb(np.mod(a, 1.0), np.clip(b, 0, 1), np.clip(c, 0, 1))
+    elif space == "hsl":
+        rgb = _np_hls_to_rgb(np.mod(a, 1.0), np.clip(b, 0, 1), np.clip(c, 0, 1))
+    else:
+        if space == "lch":
+            a, b, c = _np_lch_to_lab(a, b, c)
+        if space in ("lab", "lch"):
+            x, y, z = _np_lab_to_xyz(a, b, c)
+            linear = _mat(XYZ_TO_RGB, x / 100.0, y / 100.0, z / 100.0)
+        else:
+            l, m, s = _mat(OKLAB_M2_INV, a, b, c)
+            linear = _mat(OKLAB_M1_INV, l ** 3, m ** 3, s ** 3)
+        rgb = tuple(linear_to_srgb(channel) for channel in linear)
+    return np.clip(np.stack(rgb, axis=-1), 0.0, 1.0)
+
+def _stop_values(rgba, space):
+    values = _to_space(rgba[:, :3], space)
+    if space in HUE_CHANNEL:
+        hue, period = HUE_CHANNEL[space]
+        chroma = CHROMA_CHANNEL[space]
+        gray = values[:, chroma] < 1e-6
+        if gray.any() and not gray.all():
+            # Each gray stop takes the hue of the nearest colored stop.
+            colored = np.flatnonzero(~gray)
+            nearest = colored[np.abs(np.arange(len(values))[:, None] - colored[None, :]).argmin(axis=1)]
+            values[:, hue] = values[nearest, hue]
+        values[:, hue] = np.unwrap(values[:, hue], period=period)
+    return np.concatenate([values, rgba[:, 3:]], axis=-1)
+
+def _interpolate(values, positions, t):
+    return np.stack([np.interp(t, positions, values[:, i]) for i in range(values.shape[1])], axis=-1)
+
+def _compute(stops, positions, size, space, uniform):
+    rgba = np.array([((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF, v >> 24) for v in stops], dtype=np.float64) / 255.0
+    values = _stop_values(rgba, space)
+    positions = np.asarray(positions, dtype=np.float64)
+    t = np.linspace(positions[0], positions[-1], size)
+    if uniform and size > 2:
+        # Arc length in OKLab over a dense sampling, inverted so the output
+        # samples sit at equal perceptual steps.
+        dense = np.linspace(positions[0], positions[-1], max(UNIFORM_SAMPLES, 4 * size))
+        ok = ColorConverter.rgb_to_oklab_array(_from_space(_interpolate(values, positions, dense)[:, :3], space) * 255.0)
+        length = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(ok, axis=0), axis=1))])
+        if length[-1] > 0:
+            t = np.interp(np.linspace(0.0, length[-1], size), length, dense)
+    sampled = _interpolate(values, positions, t)
+    out = np.concatenate([_from_space(sampled[:, :3], space), np.clip(sampled[:, 3:], 0.0, 1.0)], axis=-1)
+    out.flags.writeable = False
+    return out
+
+def _stop_key(stops):
+    # CSS strings stay as typed, so a cache hit skips parsing them; any
+    # other stops are packed, strings in a mixed list one by one.
+    if isinstance(stops, Palette):
+        return tuple(stops.packed.tolist())
+    if isinstance(stops, (str, bytes)):
+        return (stops,)
+    stops = tuple(stops)
+    if all(isinstance(s, (str, bytes)) for s in stops):
+        return stops
+    try:
+        return tuple(Palette(Color.from_string(s) if isinstance(s, (str, bytes)) else s for s in stops).packed.tolist())
+    except TypeError:
+        raise ValueError(f"stops must be CSS strings, (r, g, b[, a]) tuples or Colors, got {stops!r}") from None
+
+def _packed_stops(stops):
+    if not isinstance(stops[0], (str, bytes)):
+        return stops
+    packed, errors = parse_colors(list(stops))
+    bad = np.flatnonzero(errors)
+    if len(bad):
+        raise ValueError(f"stop {bad[0] + 1}: {describe(errors[bad[0]])}: {stops[bad[0]]!r}")
+    return tuple(packed.tolist())
+
+def ramp(stops, size=256, space="oklab", positions=None, uniform=False):
+    # stops: CSS strings, (r, g, b[, a]) tuples, Colors or a Palette;
+    # positions: one increasing value per stop (default: evenly spaced).
+    # Returns a read-only (size, 4) float64 RGBA array in 0-1.
+    if space not in SPACES:
+        raise ValueError(f"unknown ramp space: {space}")
+    if not 1 <= size <= MAX_SIZE:
+        raise ValueError(f"ramp size must be between 1 and {MAX_SIZE}, got {size}")
+    stops = _stop_key(stops)
+    if len(stops) < 2:
+        raise ValueError("a ramp needs at least two stops")
+    if positions is None:
+        positions = tuple(i / (len(stops) - 1) for i in range(len(stops)))
+    else:
+        positions = tuple(float(p) for p in positions)
+        if len(positions) != len(stops):
+            raise ValueError(f"got {len(positions)} positions for {len(stops)} stops")
+        if not all(math.isfinite(p) for p in positions):
+            raise ValueError(f"stop positions must be finite, got {positions}")
+        if any(b < a for a, b in zip(positions, positions[1:])) or positions[-1] <= positions[0]:
+            raise ValueError("stop positions must be increasing")
+    key = (stops, positions, size, space, bool(uniform))
+    return ramp_cache.get(key, lambda: _compute(_packed_stops(stops), positions, size, space, uniform))
+
+def to_uint8(colors):
+    return np.round(np.asarray(colors) * 255.0).astype(np.uint8)
+
+def ramp_palette(stops, size=256, space="oklab", positions=None, uniform=False):
+    return Palette.from_rgb(to_uint8(ramp(stops, size, space, positions, uniform)))
+
+def hex_values(colors):
+    rgba = to_uint8(colors).tolist()
+    opaque = all(a == 255 for _, _, _, a in rgba)
+    return [ColorConverter.rgb_to_hex(r, g, b, None if opaque else a) for r, g, b, a in rgba]
+
+def write_cube(stream, colors, title="Color ramp"):
+    # Adobe/Resolve 1D LUT; alpha has no place in the format and is dropped.
+    stream.write(f'TITLE "{title}"\nLUT_1D_SIZE {len(colors)}\nDOMAIN_MIN 0.0 0.0 0.0\nDOMAIN_MAX 1.0 1.0 1.0\n')
+    np.savetxt(stream, np.asarray(colors)[:, :3], fmt="%.6f")
+
+def write_csv(stream, colors):
+    stream.write("index,hex,r,g,b,a\n")
+    rows = to_uint8(colors).tolist()
+    stream.write("".join(f"{i},{h},{r},{g},{b},{a}\n" for i, (h, (r, g, b, a)) in enumerate(zip(hex_values(colors), rows))))
+
+def write_json(stream, colors, **meta):
+    json.dump(dict(meta, size=len(colors), colors=hex_values(colors)), stream)
+    stream.write("\n")
+
+def export_ramp(path, colors, fmt=None, **meta):
+    # Format from fmt or the file extension.
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown ramp format: {fmt!r}; expected one of {', '.join(FORMATS)}")
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        if fmt == "cube":
+            write_cube(f, colors)
+        elif fmt == "csv":
+            write_csv(f, colors)
+        else:
+            write_json(f, colors, **meta)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_ramp", description="Interpolate a color ramp between two or more stops.")
+    parser.add_argument("stops", nargs="+", help="CSS colors, at least two")
+    parser.add_argument("-n", "--size", type=int, default=256, help="number of entries (default: 256)")
+    parser.add_argument("--space", choices=SPACES, default="oklab", help="interpolation space (default: oklab)")
+    parser.add_argument("--positions", type=float, nargs="+", help="one increasing position per stop")
+    parser.add_argument("--uniform", action="store_true", help="equal perceptual (OKLab) steps between entries")
+    parser.add_argument("-o", "--output", help="write a .cube, .csv or .json file (default: HEX lines on stdout)")
+    parser.add_argument("--format", choices=FORMATS, help="output format (default: from the file extension)")
+    args = parser.parse_args(argv)
+    try:
+        colors = ramp(args.stops, args.size, args.space, args.positions, args.uniform)
+        if args.output:
+            export_ramp(args.output, colors, args.format, space=args.space, stops=args.stops, uniform=args.uniform)
+        elif args.format == "cube":
+            write_cube(sys.stdout, colors)
+        elif args.format == "csv":
+            write_csv(sys.stdout, colors)
+        elif args.format == "json":
+            write_json(sys.stdout, colors, space=args.space, stops=args.stops, uniform=args.uniform)
+        else:
+            sys.stdout.write("".join(f"{h}\n" for h in hex_values(colors)))
+    except (ValueError, OSError) as e:
+        print(f"color_ramp: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+import argparse
+import asyncio
+import json
+import math
+import sys
+import traceback
+from urllib.parse import parse_qs, urlsplit
+from color_cli import SPACES, convert_chunk, from_rgb, parse_chunk, read_records, to_rgb
+
+# Local HTTP/JSON conversion service for tools that cannot embed the GUI.
+# Small requests for the same pair of spaces are queued for at most
+# `max_delay` seconds and converted together with the batch kernels; /bulk
+# streams NDJSON in and out chunk by chunk. Connections are HTTP/1.1
+# keep-alive, and ColorClient keeps a pool of them open on the client side.
+DEFAULT_PORT = 8765
+MAX_DELAY = 0.002
+MAX_BATCH = 4096
+BULK_CHUNK = 8192
+MAX_BODY = 16 << 20
+READ_BLOCK = 1 << 16
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def to_record(value):
+    # A color string or a list of finite channel values.
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list) and value and all(type(v) in (int, float) for v in value):
+        try:
+            finite = all(math.isfinite(v) for v in value)
+        except OverflowError:
+            # Integers too large for a float.
+            finite = False
+        if not finite:
+            raise HttpError(400, f"channel values must be finite, got {value!r}")
+        return value
+    raise HttpError(400, f"expected a color string or a list of numbers, got {value!r}")
+
+def convert_records(rows, src, dst):
+    values = from_rgb(to_rgb(parse_chunk(rows, src), src), dst)
+    if dst == "hex":
+        return [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in values.tolist()]
+    return values.tolist()
+
+def _bulk_chunk(lines, src, dst, offset, first_line):
+    return convert_chunk(list(read_records(lines, "jsonl", first_line)), src, dst, "jsonl", offset)
+
+def check_spaces(src, dst):
+    for space in (src, dst):
+        if space not in SPACES:
+            raise HttpError(400, f"unknown color space: {space!r} (expected one of {', '.join(SPACES)})")
+
+async def read_head(reader):
+    # Returns (start line, lower-cased headers), or None on a clean EOF.
+    line = await reader.readline()
+    if not line:
+        return None
+    start = line.decode("latin-1").strip()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b"", None)
+        if line in (b"\r\n", b"\n"):
+            return start, headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+async def iter_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return
+            yield await reader.readexactly(size)
+            await reader.readexactly(2)
+    remaining = int(headers.get("content-length", 0))
+    while remaining > 0:
+        block = await reader.read(min(remaining, READ_BLOCK))
+        if not block:
+            raise asyncio.IncompleteReadError(b"", remaining)
+        remaining -= len(block)
+        yield block
+
+async def read_body(reader, headers, limit=MAX_BODY):
+    parts, size = [], 0
+    async for block in iter_body(reader, headers):
+        size += len(block)
+        if size > limit:
+            raise HttpError(413, f"request body exceeds {limit} bytes")
+        parts.append(block)
+    return b"".join(parts)
+
+def response_head(status, content_type, keep_alive, length=None):
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", f"Content-Type: {content_type}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines.append(f"Content-Length: {length}" if length is not None else "Transfer-Encoding: chunked")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+class ConversionBatcher:
+    def __init__(self, max_delay=MAX_DELAY, max_batch=MAX_BATCH):
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self.pending = {}
+        self.sizes = {}
+        self.timers = {}
+        self.batches = 0
+        self.records = 0
+        self.requests = 0
+
+    async def convert(self, src, dst, rows):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (src, dst)
+        self.pending.setdefault(key, []).append((rows, future))
+        self.sizes[key] = self.sizes.get(key, 0) + len(rows)
+        self.requests += 1
+        if self.sizes[key] >= self.max_batch:
+            self.flush(key)
+        elif key not in self.timers:
+            self.timers[key] = loop.call_later(self.max_delay, self.flush, key)
+        return await future
+
+    def flush(self, key):
+        timer = self.timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self.pending.pop(key, [])
+        self.sizes.pop(key, None)
+        if not queue:
+            return
+        rows = [row for request, _ in queue for row in request]
+        self.batches += 1
+        self.records += len(rows)
+        try:
+            results = convert_records(rows, *key)
+        except Exception:
+            # One bad request must not fail its neighbours: retry each alone.
+            for request, future in queue:
+                if future.done():
+                    continue
+                try:
+                    future.set_result(convert_records(request, *key))
+                except (ValueError, TypeError) as e:
+                    future.set_exception(HttpError(400, str(e)))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        pos = 0
+        for request, future in queue:
+            if not future.done():
+                future.set_result(results[pos:pos + len(request)])
+            pos += len(request)
+
+    def stats(self):
+        return {
+            "requests": self.requests, "batches": self.batches, "records": self.records,
+            "records_per_batch": self.records / self.batches if self.batches else 0.0,
+        }
+
+class ColorServer:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, max_delay=MAX_DELAY, max_batch=MAX_BATCH, idle_timeout=30.0):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.batcher = ConversionBatcher(max_delay, max_batch)
+        self.server = None
+        self.connections = {}
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        for writer in list(self.connections):
+            writer.close()
+        await asyncio.gather(*self.connections.values(), return_exceptions=True)
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                head = await asyncio.wait_for(read_head(reader), self.idle_timeout)
+                if head is None:
+                    break
+                start, headers = head
+                keep_alive = headers.get("connection", "").lower() != "close" and start.endswith("HTTP/1.1")
+                try:
+                    method, target, _ = start.split(" ", 2)
+                    keep_alive = await self.dispatch(method, target, headers, reader, writer, keep_alive)
+                except HttpError as e:
+                    # Unread request bodies would corrupt the next request.
+                    keep_alive = keep_alive and e.status != 413
+                    self.send_json(writer, e.status, {"error": str(e)}, keep_alive)
+                except ValueError:
+                    self.send_json(writer, 400, {"error": f"malformed request line: {start!r}"}, False)
+                    keep_alive = False
+                except Exception:
+                    # The client still gets an answer; the connection state
+                    # is unknown, so it is closed.
+                    traceback.print_exc()
+                    self.send_json(writer, 500, {"error": "internal server error"}, False)
+                    keep_alive = False
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+    def send_json(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(response_head(status, "application/json", keep_alive, len(body)) + body)
+
+    async def dispatch(self, method, target, headers, reader, writer, keep_alive):
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/bulk" and method == "POST":
+            return await self.bulk(query, headers, reader, writer, keep_alive)
+        body = await read_body(reader, headers)
+        if url.path == "/spaces" and method == "GET":
+            self.send_json(writer, 200, {"spaces": list(SPACES)}, keep_alive)
+        elif url.path == "/stats" and method == "GET":
+            self.send_json(writer, 200, self.batcher.stats(), keep_alive)
+        elif url.path == "/convert" and method == "GET":
+            src, dst = query.get("from", "rgb"), query.get("to", "hex")
+            check_spaces(src, dst)
+            if "value" not in query:
+                raise HttpError(400, "missing 'value' parameter")
+            if src == "hex":
+                record = to_record(query["value"])
+            else:
+                try:
+                    record = to_record([float(v) for v in query["value"].split(",")])
+                except ValueError:
+                    raise HttpError(400, f"expected comma-separated numbers, got {query['value']!r}") from None
+            result = await self.convert(src, dst, [record])
+            self.send_json(writer, 200, {"result": result[0]}, keep_alive)
+        elif url.path == "/convert" and method == "POST":
+            try:
+                request = json.loads(body)
+                src, dst = request.get("from", "rgb"), request.get("to", "hex")
+            except (ValueError, AttributeError):
+                raise HttpError(400, "expected a JSON object body") from None
+            check_spaces(src, dst)
+            if "values" in request:
+                if not isinstance(request["values"], list):
+                    raise HttpError(400, "'values' must be a list")
+                result = await self.convert(src, dst, [to_record(v) for v in request["values"]])
+                self.send_json(writer, 200, {"results": result}, keep_alive)
+            elif "value" in request:
+                result = await self.convert(src, dst, [to_record(request["value"])])
+                self.send_json(writer, 200, {"result": result[0]}, keep_alive)
+            else:
+                raise HttpError(400, "expected 'value' or 'values'")
+        elif url.path in ("/spaces", "/stats", "/convert", "/bulk"):
+            raise HttpError(405, f"{method} is not supported for {url.path}")
+        else:
+            raise HttpError(404, f"no such endpoint: {url.path}")
+        return keep_alive
+
+    async def convert(self, src, dst, rows):
+        if not rows:
+            return []
+        return await self.batcher.convert(src, dst, rows)
+
+    async def bulk(self, query, headers, reader, writer, keep_alive):
+        # Request and response are both NDJSON, one color per line. Output is
+        # sent with chunked encoding as soon as each chunk is converted; an
+        # invalid record ends the stream with an {"error": ...} line.
+        src, dst = query.get("from", "rgb"), query.get("to", "hex")
+        try:
+            check_spaces(src, dst)
+        except HttpError:
+            async for _ in iter_body(reader, headers):
+                pass
+            raise
+        loop = asyncio.get_running_loop()
+        writer.write(response_head(200, "application/x-ndjson", keep_alive))
+        lines, tail, offset, first_line = [], b"", 0, 1
+        body = iter_body(reader, headers)
+        try:
+            async for block in body:
+                parts = (tail + block).split(b"\n")
+                tail = parts.pop()
+                lines.extend(part.decode("utf-8") for part in parts)
+                if len(lines) >= BULK_CHUNK:
+                    text = await loop.run_in_executor(None, _bulk_chunk, lines, src, dst, offset, first_line)
+                    offset += sum(1 for line in lines if line.strip())
+                    first_line += len(lines)
+                    lines = []
+                    writer.write(f"{len(text.encode('utf-8')):X}\r\n{text}\r\n".encode("utf-8"))
+                    await writer.drain()
+            if tail:
+                lines.append(tail.decode("utf-8"))
+            if lines:
+                text = await loop.run_in_executor(None, _bulk_chunk, lines, src, dst, offset, first_line)
+                writer.write(f"{len(text.encode('utf-8')):X}\r\n{text}\r\n".encode("utf-8"))
+        except (ValueError, TypeError) as e:
+            text = json.dumps({"error": str(e)}) + "\n"
+            writer.write(f"{len(text.encode('utf-8')):X}\r\n{text}\r\n0\r\n\r\n".encode("utf-8"))
+            async for _ in body:
+                pass
+            return keep_alive
+        writer.write(b"0\r\n\r\n")
+        return keep_alive
+
+class ColorClient:
+    # asyncio client holding up to `size` keep-alive connections to a
+    # ColorServer; concurrent callers beyond that wait for a free connection.
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, size=8):
+        self.host = host
+        self.port = port
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def request(self, method, path, body=b"", content_type="application/json"):
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+        async with self.slots:
+            while True:
+                reused = bool(self.idle)
+                if reused:
+                    reader, writer = self.idle.pop()
+                else:
+                    reader, writer = await asyncio.open_connection(self.host, self.port)
+                    self.opened += 1
+                try:
+                    writer.write(head)
+                    await writer.drain()
+                    response = await read_head(reader)
+                    if response is None:
+                        raise ConnectionError("server closed the connection")
+                    start, headers = response
+                    payload = b"".join([block async for block in iter_body(reader, headers)])
+                except ConnectionError:
+                    writer.close()
+                    # The server may have dropped an idle connection; retry
+                    # once it is clear the failure was not a fresh connection.
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                break
+            if headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self.idle.append((reader, writer))
+            return int(start.split(" ", 2)[1]), payload
+
+    async def convert(self, src, dst, value):
+        body = json.dumps({"from": src, "to": dst, "value": value}).encode("utf-8")
+        status, payload = await self.request("POST", "/convert", body)
+        data = json.loads(payload)
+        if status != 200:
+            raise ValueError(data.get("error", f"HTTP {status}"))
+        return data["result"]
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
+
+async def serve(args):
+    server = await ColorServer(args.host, args.port, args.batch_delay / 1000.0, args.max_batch, args.idle_timeout).start()
+    print(f"color_server: listening on http://{server.host}:{server.port}", flush=True)
+    await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="color_server", description="Serve color conversions over local HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT}, 0 = any free port)")
+    parser.add_argument("--batch-delay", type=float, default=MAX_DELAY * 1000, help="max milliseconds a request waits for its batch (default: 2)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH, help=f"records that flush a batch early (default: {MAX_BATCH})")
+    parser.add_argument("--idle-timeout", type=float, default=30.0, help="seconds before an idle keep-alive connection closes")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"color_server: error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
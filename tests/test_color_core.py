@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from color_cache import cached_converter
+from color_core import ColorConverter
+from color_pack import Color
+
+def test_rgb_methods_take_keywords():
+    assert ColorConverter.rgb_to_hsv(r=1, g=2, b=3) == ColorConverter.rgb_to_hsv(1, 2, 3)
+    assert ColorConverter.rgb_to_hex(r=255, g=0, b=16) == "#FF0010"
+    assert ColorConverter.rgb_to_hex(1, 2, 3, a=4) == "#01020304"
+    assert ColorConverter.rgb_to_hex(1, 2, 3, 4) == "#01020304"
+
+def test_rgb_methods_take_a_color():
+    color = Color(10, 20, 30)
+    assert ColorConverter.rgb_to_hsv(color) == ColorConverter.rgb_to_hsv(10, 20, 30)
+    assert ColorConverter.rgb_to_hex(color) == "#0A141E"
+    assert ColorConverter.rgb_to_hex.__name__ == "rgb_to_hex"
+
+def test_cached_converter_keywords():
+    converter = cached_converter(16)
+    assert converter.rgb_to_lab(r=10, g=20, b=30) == ColorConverter.rgb_to_lab(10, 20, 30)
+    assert converter.rgb_to_hex(1, 2, 3, a=4) == "#01020304"
@@ -0,0 +1,64 @@
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+QtGui = pytest.importorskip("PyQt6.QtGui")
+from PyQt6.QtWidgets import QApplication
+from color_gui import EyedropperSampler, ImageSource, RegionCache
+
+app = QApplication.instance() or QApplication([])
+
+def gradient(size):
+    # Red grows with x and green with y, so every average is predictable.
+    image = QtGui.QImage(size, size, QtGui.QImage.Format.Format_RGB32)
+    for y in range(size):
+        for x in range(size):
+            image.setPixelColor(x, y, QtGui.QColor(x * 10, y * 10, 0))
+    return image
+
+def filled(r, g, b, size=16):
+    image = QtGui.QImage(size, size, QtGui.QImage.Format.Format_RGB32)
+    image.fill(QtGui.QColor(r, g, b))
+    return image
+
+def sample(source, x, y, n):
+    cache = RegionCache(EyedropperSampler.REGION, EyedropperSampler.LOUPE_PIXELS // 2)
+    return EyedropperSampler.average_color(cache.get(source, x, y), x, y, n)
+
+def test_single_pixel():
+    source = ImageSource(gradient(9))
+    assert sample(source, 4, 4, 1) == (40, 40, 0)
+    assert sample(source, 0, 8, 1) == (0, 80, 0)
+
+def test_area_average_center():
+    source = ImageSource(gradient(9))
+    assert sample(source, 4, 4, 3) == (40, 40, 0)
+    assert sample(source, 4, 4, 5) == (40, 40, 0)
+
+def test_area_average_edges():
+    # Only pixels inside the image are averaged.
+    source = ImageSource(gradient(9))
+    assert sample(source, 0, 0, 3) == (5, 5, 0)
+    assert sample(source, 8, 4, 3) == (75, 40, 0)
+    assert sample(source, 8, 8, 5) == (70, 70, 0)
+
+def test_loupe_size():
+    source = ImageSource(gradient(9))
+    cache = RegionCache(EyedropperSampler.REGION, EyedropperSampler.LOUPE_PIXELS // 2)
+    loupe = EyedropperSampler.loupe(cache.get(source, 4, 4), 4, 4, 3)
+    size = EyedropperSampler.LOUPE_PIXELS * EyedropperSampler.LOUPE_ZOOM
+    assert (loupe.width(), loupe.height()) == (size, size)
+
+def test_source_switch():
+    red, blue = ImageSource(filled(255, 0, 0)), ImageSource(filled(0, 0, 255))
+    cache = RegionCache(EyedropperSampler.REGION, EyedropperSampler.LOUPE_PIXELS // 2)
+    assert EyedropperSampler.average_color(cache.get(red, 8, 8), 8, 8, 1) == (255, 0, 0)
+    assert EyedropperSampler.average_color(cache.get(blue, 8, 8), 8, 8, 1) == (0, 0, 255)
+    # A job still queued for the old image, then the new one again.
+    cache.get(red, 8, 8)
+    assert EyedropperSampler.average_color(cache.get(blue, 9, 9), 9, 9, 1) == (0, 0, 255)
+    assert cache.grabs == 4